@@ -0,0 +1,65 @@
+"""
+X events per second through `WM._xevent_cb`, needs an X server (Xvfb is fine)::
+
+    DISPLAY=:99 python benchmarks/bench_event_dispatch.py --events 20000
+
+Every event is a PropertyNotify of a property changed on the root window, they're dispatched
+without handlers for the property and then with one handler
+"""
+
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orcsome3.orcsome import ev, xlib  # noqa: E402
+from orcsome3.orcsome.wm import WM  # noqa: E402
+
+PROPERTY: str = "_ORCSOME_BENCH_EVENT"
+
+
+def dispatch(wm: WM, events: int) -> float:
+    """Generates `events` PropertyNotify and returns the events dispatched per second"""
+    atom: xlib.Atom = wm.atom[PROPERTY]
+    cardinal: xlib.Atom = wm.atom["CARDINAL"]
+    for index in range(events):
+        xlib.set_window_property(
+            display=wm.dpy, window=wm.root, property=atom, type=cardinal, format=32, values=[index]
+        )
+    xlib.lib.XSync(wm.dpy, False)  # Every event is in the queue of Xlib now
+
+    started: float = time.perf_counter()
+    while xlib.lib.XPending(wm.dpy):
+        wm._xevent_cb(None, None, 0)
+    return events / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000, help="Events per run (%(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case, the best one is reported (%(default)s)")
+    args: Namespace = parser.parse_args()
+
+    wm: WM = WM(loop=ev.Loop())
+    xlib.lib.XSelectInput(wm.dpy, wm.root, xlib.lib.PropertyChangeMask)
+    calls: List[int] = [0]
+
+    print(f"{'case':<12} {'events/s':>12}")
+    print(f"{'no handler':<12} {max(dispatch(wm=wm, events=args.events) for _ in range(args.runs)):>12.0f}")
+
+    @wm.on_property_change(properties=[PROPERTY])
+    def changed() -> None:
+        calls[0] += 1
+
+    print(f"{'handler':<12} {max(dispatch(wm=wm, events=args.events) for _ in range(args.runs)):>12.0f}")
+    assert calls[0] == args.events * args.runs, "Every event reaches the handler"
+
+    xlib.lib.XDeleteProperty(wm.dpy, wm.root, wm.atom[PROPERTY])
+    xlib.lib.XCloseDisplay(wm.dpy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Wakeup latency of the libev backends while many watchers are active::
+
+    python benchmarks/bench_loop_backends.py --watchers 400 --wakeups 2000
+
+A thread writes to a pipe and the time until the loop calls the watcher of the pipe is measured,
+`--watchers` other pipes and timers are watched meanwhile without ever becoming ready
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Any, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orcsome3.orcsome import ev  # noqa: E402
+
+
+def measure(backend: str, watchers: int, wakeups: int) -> List[float]:
+    """Returns the latency (in seconds) of every wakeup"""
+    loop: ev.Loop = ev.Loop(backend=backend)
+    pipes: List[Tuple[int, int]] = [os.pipe() for _ in range(watchers)]
+    idle: List[Any] = []
+    for read_end, _ in pipes:
+        io_watcher: ev.IOWatcher = ev.IOWatcher(
+            callback=lambda *args: None, file_descriptor=read_end, flags=ev.lib.EV_READ
+        )
+        io_watcher.start(loop=loop)
+        idle.append(io_watcher)
+    for index in range(watchers):
+        timer: ev.TimerWatcher = ev.TimerWatcher(callback=lambda *args: None, after=3600.0 + index)
+        timer.start(loop=loop)
+        idle.append(timer)
+
+    read_end, write_end = os.pipe()
+    latencies: List[float] = []
+    sent: List[float] = [0.0]
+    ready: threading.Event = threading.Event()
+    ready.set()
+
+    def on_readable(loop_: Any, watcher: Any, events: int) -> None:
+        os.read(read_end, 1)
+        latencies.append(time.perf_counter() - sent[0])
+        if len(latencies) >= wakeups:
+            loop.break_()
+        ready.set()
+
+    def writer() -> None:
+        for _ in range(wakeups):
+            ready.wait()
+            ready.clear()
+            time.sleep(0.0005)  # Lets the loop block again
+            sent[0] = time.perf_counter()
+            os.write(write_end, b"x")
+
+    watcher: ev.IOWatcher = ev.IOWatcher(callback=on_readable, file_descriptor=read_end, flags=ev.lib.EV_READ)
+    watcher.start(loop=loop)
+    thread: threading.Thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    loop.run()
+    thread.join()
+
+    watcher.stop(loop=loop)
+    for idle_watcher in idle:
+        idle_watcher.stop(loop=loop)
+    loop.destroy()
+    for fd in (read_end, write_end, *(fd for pipe in pipes for fd in pipe)):
+        os.close(fd)
+    return latencies
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--watchers", type=int, default=400, help="Idle pipes and timers (%(default)s each)")
+    parser.add_argument("--wakeups", type=int, default=2000, help="Wakeups measured per backend (%(default)s)")
+    args: Namespace = parser.parse_args()
+
+    print(f"{'backend':<8} {'median µs':>10} {'p99 µs':>10} {'max µs':>10}")
+    for backend in ["auto"] + ev.supported_backends():
+        latencies: List[float] = sorted(measure(backend=backend, watchers=args.watchers, wakeups=args.wakeups))
+        p99: float = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{backend:<8} {statistics.median(latencies) * 1e6:>10.1f} {p99 * 1e6:>10.1f} {latencies[-1] * 1e6:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+`Window.matches` over a large synthetic window set, no X server is needed::
+
+    python benchmarks/bench_matches.py --windows 5000
+
+The windows return fixed names, classes, roles and titles. Every matcher set is checked against
+every window with `Window.matches` and with a `re.search` reference, then through a `MatcherIndex`
+holding all the sets
+"""
+
+import random
+import re
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orcsome3.orcsome import matchers, wrappers  # noqa: E402
+
+CLASSES: List[str] = ["URxvt", "Firefox", "Chromium", "Emacs", "mpv", "Thunar", "Gimp-2.10", "TelegramDesktop"]
+ROLES: List[str] = ["", "browser", "pop-up", "gimp-toolbox", "GtkFileChooserDialog"]
+MATCHER_SETS: List[Dict[str, Any]] = [
+    {"cls": "URxvt"},
+    {"cls": "^Firefox$", "role": "browser"},
+    {"name": "emacs"},
+    {"title": "mail"},
+    {"cls": "Gimp", "role": "^gimp-"},
+    {"cls": "Chrom(e|ium)"},
+    {"title": r"\.pdf$"},
+    {"cls": "mpv", "desktop": 2},
+]
+
+
+class SyntheticWindow(wrappers.Window):
+    """`Window` with fixed properties, nothing is read from the X server"""
+
+    def __new__(cls, window_id: int, rng: random.Random) -> "SyntheticWindow":
+        window: SyntheticWindow = int.__new__(cls, window_id)
+        window_cls: str = rng.choice(CLASSES)
+        window._values = {
+            "cls": window_cls,
+            "name": window_cls.lower(),
+            "role": rng.choice(ROLES),
+            "title": f"{rng.choice(['mail', 'notes', 'report.pdf', 'index.html', '~/src'])} - {window_cls}",
+            "desktop": rng.randrange(4),
+        }
+        return window
+
+    name = property(lambda self: self._values["name"])  # type: ignore
+    cls = property(lambda self: self._values["cls"])  # type: ignore
+    role = property(lambda self: self._values["role"])  # type: ignore
+    title = property(lambda self: self._values["title"])  # type: ignore
+    desktop = property(lambda self: self._values["desktop"])  # type: ignore
+
+
+def reference_matches(window: SyntheticWindow, **matchers_: Any) -> bool:
+    """`Window.matches` with a `re.search` for every pattern"""
+    for field in ("name", "cls", "role", "title"):
+        pattern: Optional[str] = matchers_.get(field)
+        if pattern and not re.search(pattern, getattr(window, field) or ""):
+            return False
+    desktop: Optional[int] = matchers_.get("desktop")
+    return desktop is None or desktop == window.desktop
+
+
+def timed(function: Callable[[], int], runs: int) -> float:
+    best: float = float("inf")
+    for _ in range(runs):
+        started: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=int, default=5000, help="Synthetic windows (%(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case, the best one is reported (%(default)s)")
+    args: Namespace = parser.parse_args()
+
+    rng: random.Random = random.Random(0)
+    windows: List[SyntheticWindow] = [SyntheticWindow(0x1000000 + index, rng) for index in range(args.windows)]
+
+    index: matchers.MatcherIndex = matchers.MatcherIndex()
+    for matcher_set in MATCHER_SETS:
+        index.add(callback=lambda: None, matchers=matcher_set)
+
+    def with_matches() -> int:
+        return sum(window.matches(**matcher_set) for window in windows for matcher_set in MATCHER_SETS)
+
+    def with_re_search() -> int:
+        return sum(reference_matches(window, **matcher_set) for window in windows for matcher_set in MATCHER_SETS)
+
+    def with_index() -> int:
+        return sum(len(list(index.match(window=window))) for window in windows)
+
+    assert with_matches() == with_re_search() == with_index(), "Every implementation finds the same matches"
+    checks: int = args.windows * len(MATCHER_SETS)
+    print(f"{'case':<20} {'checks/s':>12}")
+    for name, function in (
+        ("re.search", with_re_search),
+        ("Window.matches", with_matches),
+        ("MatcherIndex.match", with_index),
+    ):
+        print(f"{name:<20} {checks / timed(function=function, runs=args.runs):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Reads of large window properties with `xlib.get_window_property`, needs an X server (Xvfb is fine)::
+
+    DISPLAY=:99 python benchmarks/bench_window_property.py --icon-size 256 --clients 500
+
+Synthetic properties shaped like `_NET_WM_ICON` (CARDINAL, width, height and the ARGB pixels) and
+`_NET_CLIENT_LIST` (WINDOW ids) are set on the root window, read repeatedly and deleted
+"""
+
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orcsome3.orcsome import xlib  # noqa: E402
+
+
+def read(display: xlib.Display, window: xlib.Window, property: xlib.Atom, type: xlib.Atom, reads: int) -> float:
+    """Returns the seconds per read"""
+    started: float = time.perf_counter()
+    for _ in range(reads):
+        xlib.get_window_property(display=display, window=window, property=property, type=type)
+    return (time.perf_counter() - started) / reads
+
+
+def bench(display: xlib.Display, name: str, type_name: str, values: Sequence[int], reads: int, runs: int) -> None:
+    window: xlib.Window = xlib.lib.DefaultRootWindow(display)
+    property: xlib.Atom = xlib.lib.XInternAtom(display, name.encode(), False)
+    type: xlib.Atom = xlib.lib.XInternAtom(display, type_name.encode(), False)
+    xlib.set_window_property(display=display, window=window, property=property, type=type, format=32, values=values)
+    xlib.lib.XSync(display, False)
+
+    value = xlib.get_window_property(display=display, window=window, property=property, type=type)
+    assert value is not None and list(value) == list(values), "The property is read back unchanged"
+    try:
+        seconds: float = min(
+            read(display=display, window=window, property=property, type=type, reads=reads) for _ in range(runs)
+        )
+    finally:
+        xlib.lib.XDeleteProperty(display, window, property)
+        xlib.lib.XSync(display, False)
+    megabytes: float = len(values) * 4 / 1e6
+    print(f"{name:<24} {len(values):>10} {seconds * 1e3:>10.3f} {megabytes / seconds:>10.1f}")
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument("--icon-size", type=int, default=256, help="Width and height of the icon (%(default)s)")
+    parser.add_argument("--clients", type=int, default=500, help="Windows in the client list (%(default)s)")
+    parser.add_argument("--reads", type=int, default=200, help="Reads per run (%(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per property, the best one is reported (%(default)s)")
+    args: Namespace = parser.parse_args()
+
+    display: xlib.Display = xlib.lib.XOpenDisplay(xlib.ffi.NULL)
+    if display == xlib.ffi.NULL:
+        raise SystemExit("Can't open display")
+
+    icon: List[int] = [args.icon_size, args.icon_size] + [0xFF336699] * (args.icon_size * args.icon_size)
+    clients: List[int] = list(range(0x1200001, 0x1200001 + args.clients))
+    print(f"{'property':<24} {'items':>10} {'ms/read':>10} {'MB/s':>10}")
+    bench(
+        display=display, name="_ORCSOME_BENCH_ICON", type_name="CARDINAL", values=icon, reads=args.reads, runs=args.runs
+    )
+    bench(
+        display=display,
+        name="_ORCSOME_BENCH_CLIENT_LIST",
+        type_name="WINDOW",
+        values=clients,
+        reads=args.reads,
+        runs=args.runs,
+    )
+    xlib.lib.XCloseDisplay(display)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from . import wm as wm, xlib as xlib
+from typing import Any, Callable, List, Optional, Sequence
+
+logger: logging.Logger
+
+class IOWatcher:
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], file_descriptor: int) -> None: ...
+    def start(self, loop: Any = ...) -> None: ...
+    def stop(self, loop: Any = ...) -> None: ...
+
+class SignalWatcher:
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], signum: int) -> None: ...
+    def start(self, loop: Any = ...) -> None: ...
+    def stop(self, loop: Any = ...) -> None: ...
+
+class SoonWatcher:
+    active: bool
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any]) -> None: ...
+    def start(self, loop: Any = ...) -> None: ...
+    def stop(self, loop: Any = ...) -> None: ...
+
+class ThreadsafeWatcher:
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any]) -> None: ...
+    def start(self, loop: Any = ...) -> None: ...
+    def stop(self, loop: Any = ...) -> None: ...
+    def send(self, loop: Any = ...) -> None: ...
+
+class Timer:
+    after: float
+    repeat: float
+    next_stop: float
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[[], Any], after: float, repeat: float = ...) -> None: ...
+    @property
+    def active(self) -> bool: ...
+    def start(self, after: Optional[float] = ..., repeat: Optional[float] = ...) -> None: ...
+    def stop(self) -> None: ...
+    def again(self) -> None: ...
+    def remaining(self) -> float: ...
+    def overdue(self, timeout: float) -> bool: ...
+
+class Process:
+    argv: List[str]
+    pid: Optional[int]
+    returncode: Optional[int]
+    stdout: Optional[bytes]
+    stderr: Optional[bytes]
+    def __init__(self, loop: asyncio.AbstractEventLoop, argv: Sequence[str], on_exit: Callable[[Process], Any], capture: bool = ...) -> None: ...
+    @property
+    def running(self) -> bool: ...
+    def send_signal(self, signum: int) -> None: ...
+
+class AsyncioWM(wm.WM):
+    def __init__(self, loop: asyncio.AbstractEventLoop, timer_slack: float = ...) -> None: ...
+    def stop(self, is_exit: bool = ...) -> None: ...
@@ -0,0 +1,23 @@
+from . import xlib as xlib
+from typing import List, Optional, Sequence, Tuple
+
+class ClientList:
+    clients: List[xlib.Window]
+    stacking: List[xlib.Window]
+    valid: bool
+    def __init__(self) -> None: ...
+    def update_clients(self, clients: Sequence[int]) -> Tuple[List[xlib.Window], List[xlib.Window]]: ...
+    def update_stacking(self, stacking: Sequence[int]) -> None: ...
+    def invalidate(self) -> None: ...
+    def __contains__(self, window: object) -> bool: ...
+
+class DesktopRings:
+    valid: bool
+    def __init__(self) -> None: ...
+    def add(self, window: xlib.Window, desktop: Optional[int]) -> None: ...
+    def discard(self, window: xlib.Window) -> None: ...
+    def move(self, window: xlib.Window, desktop: Optional[int]) -> None: ...
+    def step(self, window: xlib.Window, direction: int) -> Optional[xlib.Window]: ...
+    def desktop(self, desktop: Optional[int]) -> List[xlib.Window]: ...
+    def clear(self) -> None: ...
+    def __contains__(self, window: object) -> bool: ...
@@ -1,9 +1,17 @@
 from . import ev_build as ev_build
 from ._ev import ffi as ffi, lib as lib
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
+
+BACKENDS: Dict[str, int]
+
+def supported_backends() -> List[str]: ...
+def recommended_backends() -> List[str]: ...
 
 class Loop:
-    def __init__(self) -> None: ...
+    def __init__(self, backend: str = ...) -> None: ...
+    @property
+    def backend(self) -> str: ...
+    def now(self) -> float: ...
     def destroy(self) -> None: ...
     def run(self, flags: int = ...) -> None: ...
     def break_(self, flags: int = ...) -> None: ...
@@ -22,8 +30,42 @@ class TimerWatcher:
     next_stop: int
     def __init__(self, callback: Callable[..., Any], after: float, repeat: float = ...) -> None: ...
     def start(self, loop: Loop, after: Optional[float] = ..., repeat: Optional[float] = ...) -> None: ...
+    def set(self, after: float, repeat: float = ...) -> None: ...
     def stop(self, loop: Loop) -> None: ...
     def again(self, loop: Loop) -> None: ...
     def remaining(self, loop: Loop) -> float: ...
     def update_next_stop(self) -> None: ...
     def overdue(self, timeout: float) -> bool: ...
+
+class PrepareWatcher:
+    active: bool
+    def __init__(self, callback: Callable[..., Any]) -> None: ...
+    def start(self, loop: Loop) -> None: ...
+    def stop(self, loop: Loop) -> None: ...
+
+class CheckWatcher:
+    active: bool
+    def __init__(self, callback: Callable[..., Any]) -> None: ...
+    def start(self, loop: Loop) -> None: ...
+    def stop(self, loop: Loop) -> None: ...
+
+class IdleWatcher:
+    active: bool
+    def __init__(self, callback: Callable[..., Any]) -> None: ...
+    def start(self, loop: Loop) -> None: ...
+    def stop(self, loop: Loop) -> None: ...
+
+class AsyncWatcher:
+    def __init__(self, callback: Callable[..., Any]) -> None: ...
+    def start(self, loop: Loop) -> None: ...
+    def stop(self, loop: Loop) -> None: ...
+    def send(self, loop: Loop) -> None: ...
+
+class ChildWatcher:
+    def __init__(self, callback: Callable[..., Any], pid: int) -> None: ...
+    @property
+    def pid(self) -> int: ...
+    @property
+    def status(self) -> int: ...
+    def start(self, loop: Loop) -> None: ...
+    def stop(self, loop: Loop) -> None: ...
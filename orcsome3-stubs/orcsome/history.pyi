@@ -0,0 +1,18 @@
+from . import xlib as xlib
+from typing import Iterator, List, Optional
+
+STICKY_DESKTOP: int
+
+class FocusHistory:
+    def __init__(self) -> None: ...
+    def touch(self, window: xlib.Window, desktop: Optional[int]) -> None: ...
+    def move(self, window: xlib.Window, desktop: Optional[int]) -> None: ...
+    def discard(self, window: xlib.Window) -> None: ...
+    def clear(self) -> None: ...
+    def mru(self, desktop: Optional[int] = ...) -> List[xlib.Window]: ...
+    def desktop_of(self, window: xlib.Window) -> Optional[int]: ...
+    def __iter__(self) -> Iterator[xlib.Window]: ...
+    def __reversed__(self) -> Iterator[xlib.Window]: ...
+    def __len__(self) -> int: ...
+    def __contains__(self, window: object) -> bool: ...
+    def __getitem__(self, index: int) -> xlib.Window: ...
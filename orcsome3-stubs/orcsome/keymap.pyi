@@ -0,0 +1,35 @@
+from . import xlib as xlib
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+IGNORED_MOD_MASKS: Tuple[int, int, int, int]
+Key = Tuple[int, int]
+Binding = Union[Callable[[], None], KeyNode]
+
+def normalize_state(state: int) -> int: ...
+
+class Keymap:
+    def __init__(self, display: xlib.Display) -> None: ...
+    def load(self) -> None: ...
+    def keysym(self, name: str) -> Optional[int]: ...
+    def keycode(self, keysym: int) -> Optional[int]: ...
+
+class KeyNode:
+    children: Dict[Tuple[int, int], Binding]
+    def __init__(self) -> None: ...
+    def resolve(self, keymap: Keymap) -> Dict[Key, Binding]: ...
+
+class KeyBindings:
+    keymap: Keymap
+    handlers: Dict[xlib.Window, Dict[Key, Binding]]
+    dirty: bool
+    def __init__(self, keymap: Keymap) -> None: ...
+    def add(self, window: xlib.Window, sequence: Sequence[Tuple[int, int]], handler: Callable[[], None]) -> bool: ...
+    def remove(self, window: xlib.Window, sequence: Sequence[Tuple[int, int]], handler: Callable[[], None]) -> None: ...
+    def lookup(self, window: xlib.Window, state: int, keycode: int) -> Optional[Binding]: ...
+    def refresh(self) -> None: ...
+    def forget_window(self, window: xlib.Window) -> None: ...
+    def clear(self) -> None: ...
+    def sync(self, display: xlib.Display, wait: bool = ...) -> Tuple[int, int]: ...
+    def grab_level(self, display: xlib.Display, window: xlib.Window, keys: Iterable[Key]) -> List[Key]: ...
+    def ungrab_level(self, display: xlib.Display, window: xlib.Window, keys: Iterable[Key]) -> None: ...
+    def windows(self) -> List[xlib.Window]: ...
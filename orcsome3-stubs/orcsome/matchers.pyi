@@ -0,0 +1,43 @@
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple
+
+STRING_FIELDS: Tuple[str, ...]
+FIELDS: Tuple[str, ...]
+MEMO_SIZE: int
+
+def exact_literal(pattern: str) -> Optional[str]: ...
+
+class FieldIndex:
+    def __init__(self, patterns: Sequence[str]) -> None: ...
+    def hits(self, value: str) -> FrozenSet[str]: ...
+
+class Rule:
+    callback: Callable[[], None]
+    matchers: Dict[str, Any]
+    ignore_startup: bool
+    order: int
+    primary: Optional[str]
+    prefetch: Tuple[str, ...]
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        matchers: Dict[str, Any],
+        ignore_startup: bool,
+        order: int,
+        prefetch: Sequence[str] = ...,
+    ) -> None: ...
+
+class MatcherIndex:
+    def __init__(self) -> None: ...
+    def add(
+        self,
+        callback: Callable[[], None],
+        matchers: Dict[str, Any],
+        ignore_startup: bool = ...,
+        prefetch: Sequence[str] = ...,
+    ) -> Rule: ...
+    def remove(self, rule: Rule) -> None: ...
+    def clear(self) -> None: ...
+    def __len__(self) -> int: ...
+    def fields(self) -> List[str]: ...
+    def prefetch(self) -> List[str]: ...
+    def match(self, window: Any, startup: bool = ...) -> Iterator[Callable[[], None]]: ...
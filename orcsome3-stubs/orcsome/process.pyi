@@ -0,0 +1,18 @@
+import logging
+from . import ev as ev
+from typing import Any, Callable, List, Optional, Sequence
+
+logger: logging.Logger
+
+def returncode(status: int) -> int: ...
+
+class Process:
+    argv: List[str]
+    returncode: Optional[int]
+    stdout: Optional[bytes]
+    stderr: Optional[bytes]
+    pid: Optional[int]
+    def __init__(self, loop: ev.Loop, argv: Sequence[str], on_exit: Callable[[Process], Any], capture: bool = ...) -> None: ...
+    @property
+    def running(self) -> bool: ...
+    def send_signal(self, signum: int) -> None: ...
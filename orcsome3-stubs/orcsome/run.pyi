@@ -1,5 +1,5 @@
 import logging
-from . import ev as ev, update_wm as update_wm
+from . import aio as aio, ev as ev, update_wm as update_wm
 from ..version import VERSION as VERSION
 from .wm import WM as WM
 from pathlib import Path
@@ -0,0 +1,32 @@
+from . import xlib as xlib
+from typing import Any, Callable, Dict
+
+SAMPLES: int
+
+class Histogram:
+    count: int
+    max: float
+    def __init__(self, size: int = ...) -> None: ...
+    def add(self, value: float) -> None: ...
+    def percentile(self, percent: float) -> float: ...
+    def summary(self) -> Dict[str, float]: ...
+
+class HandlerStats:
+    calls: int
+    wall: Histogram
+    cpu: Histogram
+    def __init__(self) -> None: ...
+
+class Stats:
+    handlers: Dict[str, HandlerStats]
+    events: Dict[int, int]
+    iterations: Histogram
+    event_budget: int
+    budget_yields: int
+    sources: Dict[str, Callable[[], Dict[str, int]]]
+    def __init__(self) -> None: ...
+    def call(self, kind: str, handler: Callable[[], Any]) -> Any: ...
+    def count_event(self, type: int) -> None: ...
+    def add_iteration(self, duration: float) -> None: ...
+    def summary(self) -> Dict[str, Any]: ...
+    def format(self) -> str: ...
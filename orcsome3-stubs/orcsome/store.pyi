@@ -0,0 +1,19 @@
+from . import xlib as xlib
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+MISSING: Any
+
+class PropertyStore:
+    hits: int
+    misses: int
+    def __init__(self) -> None: ...
+    def track(self, window: xlib.Window) -> None: ...
+    def tracked(self, window: xlib.Window) -> bool: ...
+    def get(self, window: xlib.Window, atom: xlib.Atom, fetch: Callable[[], T], variant: Hashable = ...) -> T: ...
+    def lookup(self, window: xlib.Window, atom: xlib.Atom, variant: Hashable = ...) -> Any: ...
+    def put(self, window: xlib.Window, atom: xlib.Atom, value: Any, variant: Hashable = ...) -> None: ...
+    def invalidate(self, window: xlib.Window, atom: xlib.Atom) -> None: ...
+    def forget(self, window: xlib.Window) -> None: ...
+    def clear(self) -> None: ...
+    def counters(self) -> Dict[str, int]: ...
@@ -0,0 +1,27 @@
+import logging
+from . import ev as ev
+from typing import Any, Callable, Optional
+
+logger: logging.Logger
+
+class Timer:
+    after: float
+    repeat: float
+    next_stop: float
+    def __init__(self, wheel: TimerWheel, callback: Callable[[], Any], after: float, repeat: float = ...) -> None: ...
+    @property
+    def active(self) -> bool: ...
+    def start(self, after: Optional[float] = ..., repeat: Optional[float] = ...) -> None: ...
+    def stop(self) -> None: ...
+    def again(self) -> None: ...
+    def remaining(self) -> float: ...
+    def overdue(self, timeout: float) -> bool: ...
+
+class TimerWheel:
+    slack: float
+    def __init__(self, loop: ev.Loop, slack: float = ...) -> None: ...
+    def now(self) -> float: ...
+    def timer(self, callback: Callable[[], Any], after: float, repeat: float = ...) -> Timer: ...
+    def add(self, timer: Timer, delay: float) -> None: ...
+    def add_at(self, timer: Timer, deadline: float) -> None: ...
+    def remove(self, timer: Timer) -> None: ...
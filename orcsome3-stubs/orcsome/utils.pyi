@@ -1,4 +1,7 @@
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 
+MATCHER_CACHE_SIZE: int
+
+def compile_matcher(pattern: str) -> Callable[[str], bool]: ...
 def match_string(pattern: str, data: str) -> bool: ...
 def get_compiler_args(*libraries: str) -> Tuple[List[str], List[str]]: ...
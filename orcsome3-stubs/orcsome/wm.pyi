@@ -1,11 +1,13 @@
 import abc
 import logging
-from . import ev as ev, wrappers as wrappers, xlib as xlib
+from . import clients as clients, ev as ev, history as history, keymap as keymap, matchers as matchers, process as process, stats as stats, store as store, timers as timers, wrappers as wrappers, xlib as xlib
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 logger: logging.Logger
 ignore_logger: bool
+ignored_errors_serial: int
 MODIFICATORS: Dict[str, int]
 IGNORED_MOD_MASKS: Tuple[int, int, int, int]
 
@@ -21,32 +23,57 @@ class Actions(ABC, metaclass=abc.ABCMeta):
     @abstractmethod
     def activate_window_desktop(self, window: wrappers.Window) -> Optional[bool]: ...
 
+ROOT_PROPERTIES: Tuple[str, ...]
+WINDOW_CACHE_SIZE: int
+WindowHandlers = Dict[Optional[xlib.Window], Dict[int, Callable[[], None]]]
+PropertySpec = Tuple[str, xlib.Atom, Tuple[Optional[str], bool], xlib.Atom, Optional[xlib.PropertyDecoder]]
+
 class WM:
-    focus_history: List[xlib.Window]
+    focus_history: history.FocusHistory
     dpy: xlib.Display
     root: xlib.Window
     atom: xlib.AtomCache
+    store: store.PropertyStore
     track_kbd_layout: bool
+    prefetch_hints: Set[str]
+    key_sequence_timeout: float
     actions: Actions
-    def __init__(self, loop: ev.Loop) -> None: ...
+    executor_workers: int
+    def __init__(self, loop: ev.Loop, timer_slack: float = ...) -> None: ...
     def init(self) -> None: ...
     def stop(self, is_exit: bool = ...) -> None: ...
+    def enable_stats(self) -> None: ...
+    def stats(self) -> Dict[str, Any]: ...
+    @property
+    def event_budget(self) -> int: ...
+    @event_budget.setter
+    def event_budget(self, budget: int) -> None: ...
+    def defer(self, function: Callable[..., Any], *args: Any) -> None: ...
+    def on_idle(self, func: Callable[[], Any]) -> Callable[[], Any]: ...
+    def spawn(self, argv: Sequence[str], on_exit: Optional[Callable[[int, Optional[bytes], Optional[bytes]], Any]] = ..., capture: bool = ...) -> process.Process: ...
+    def run_in_executor(self, function: Callable[..., Any], *args: Any, callback: Optional[Callable[[Any], Any]] = ...) -> Future: ...
     def create_window(self, window_id: int) -> wrappers.Window: ...
+    def fetch_properties(self, windows: Sequence[xlib.Window], properties: Sequence[str]) -> Dict[xlib.Window, Dict[str, Optional[xlib.PropertyValue]]]: ...
     def get_keycode_from_string(self, key: str) -> Optional[int]: ...
     def parse_keydef(self, keydef: str) -> Optional[List[Tuple[int, int]]]: ...
     def on_key(self, keydef: str, window: Optional[wrappers.Window] = ...) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
-    def on_create(self, **matchers: Any) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
-    def on_manage(self, **matchers: Any) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
+    def on_create(self, prefetch: Sequence[str] = ..., **matchers: Any) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
+    def on_manage(self, prefetch: Sequence[str] = ..., **matchers: Any) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
     def on_destroy(self, window: Optional[wrappers.Window] = ...) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
-    def on_property_change(self, properties: List[str], window: Optional[wrappers.Window] = ...) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
-    def on_timer(self, timeout: float, start: bool = ..., first_timeout: Optional[float] = ...) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
+    def on_property_change(self, properties: List[str], window: Optional[wrappers.Window] = ..., coalesce: bool = ...) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
+    def on_timer(self, timeout: float, start: bool = ..., first_timeout: Optional[float] = ..., window: Optional[wrappers.Window] = ...) -> Callable[[Callable[[], None]], Callable[[], None]]: ...
+    def on_clients_changed(self, func: Callable[[List[wrappers.Window], List[wrappers.Window]], None]) -> Callable[[List[wrappers.Window], List[wrappers.Window]], None]: ...
     def get_clients(self) -> List[wrappers.Window]: ...
     def get_stacked_clients(self) -> List[wrappers.Window]: ...
+    def next_client(self, window: xlib.Window, direction: int = ...) -> Optional[wrappers.Window]: ...
+    def mru(self, desktop: Optional[int] = ...) -> List[wrappers.Window]: ...
     @property
     def current_window(self) -> Optional[wrappers.Window]: ...
     @property
     def current_desktop(self) -> int: ...
     @property
+    def number_of_desktops(self) -> int: ...
+    @property
     def wm_name(self) -> Optional[str]: ...
     @property
     def event_window(self) -> wrappers.Window: ...
@@ -79,6 +106,7 @@ class ImmediateWM(WM):
     dpy: xlib.Display
     root: xlib.Window
     atom: xlib.AtomCache
+    store: store.PropertyStore
     def __init__(self) -> None: ...
 
 def error_handler(_display: xlib.Display, error: xlib.XErrorEvent) -> int: ...
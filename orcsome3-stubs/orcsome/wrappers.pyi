@@ -1,8 +1,12 @@
 from . import utils as utils, wm as wm, xlib as xlib
 from enum import Enum
-from functools import cached_property as cached_property
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+PROPERTIES: Dict[str, Tuple[Optional[str], bool]]
+MATCHER_PROPERTIES: Dict[str, str]
+
+def decode_desktop(value: Optional[xlib.PropertyValue]) -> Optional[int]: ...
 
 class WindowTree:
     window: Window
@@ -46,36 +50,36 @@ class XScreenSaverInfo:
 
 class Window(int):
     wm: wm.WM
-    @cached_property
+    @property
     def desktop(self) -> Optional[int]: ...
-    @cached_property
+    @property
     def role(self) -> Optional[str]: ...
-    @cached_property
+    @property
     def cls(self) -> Optional[str]: ...
-    @cached_property
+    @property
     def name(self) -> Optional[str]: ...
-    @cached_property
+    @property
     def title(self) -> Optional[str]: ...
     def get_name_and_class(self) -> Tuple[Optional[str], Optional[str]]: ...
     def matches(self, name: Optional[str] = ..., cls: Optional[str] = ..., role: Optional[str] = ..., desktop: Optional[int] = ..., title: Optional[str] = ...) -> bool: ...
-    def get_property(self, property: str, type: Optional[str] = ..., split: bool = ...) -> Optional[Union[List[int], List[str]]]: ...
+    def get_property(self, property: str, type: Optional[str] = ..., split: bool = ...) -> Optional[xlib.PropertyValue]: ...
     def set_property(self, property: str, format: int, data: Union[List[int], List[str]], type: Optional[str] = ...) -> None: ...
     def get_windows_same_pid(self) -> List[Window]: ...
     def get_window_tree(self) -> Optional[WindowTree]: ...
     def set_window_icon(self, icon: Union[Path, str]) -> None: ...
-    @cached_property
+    @property
     def attributes(self) -> XWindowAttributes: ...
-    @cached_property
+    @property
     def state(self) -> List[str]: ...
-    @cached_property
+    @property
     def maximized_vert(self) -> bool: ...
-    @cached_property
+    @property
     def maximized_horz(self) -> bool: ...
-    @cached_property
+    @property
     def decorated(self) -> bool: ...
-    @cached_property
+    @property
     def urgent(self) -> bool: ...
-    @cached_property
+    @property
     def fullscreen(self) -> bool: ...
-    @cached_property
+    @property
     def pid(self) -> Optional[int]: ...
@@ -1,7 +1,8 @@
 from . import xlib_build as xlib_build
 from ._xlib import ffi as ffi, lib as lib
+from array import array
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 Atom = int
 Window = int
@@ -27,13 +28,18 @@ class EVENTS(Enum):
     FocusIn: Any
     FocusOut: Any
     PropertyNotify: Any
+    MappingNotify: Any
     MapNotify: Any
     UnmapNotify: Any
 
+KNOWN_ATOMS: Tuple[str, ...]
+
 class AtomCache:
     dpy: Display
-    def __init__(self, dpy: Display) -> None: ...
+    def __init__(self, dpy: Display, preload: Sequence[str] = ...) -> None: ...
     def __getitem__(self, name: str) -> Atom: ...
+    def intern_all(self, names: Sequence[str]) -> None: ...
+    def name(self, atom: Atom) -> str: ...
 
 class XEvent_:
     class Type(Enum):
@@ -50,6 +56,7 @@ class XEvent_:
         ReparentNotify: Any
         MapNotify: Any
         UnmapNotify: Any
+        MappingNotify: Any
     type: XEvent_.Type
     def __init__(self, xevent: XEvent, specific_event: Any) -> None: ...
 
@@ -113,6 +120,54 @@ class XFocusChangeEvent(XEvent_):
     detail: XFocusChangeEvent.Detail
     def __init__(self, event: XEvent) -> None: ...
 
+class XMappingEvent(XEvent_):
+    request: int
+    first_keycode: int
+    count: int
+    def __init__(self, event: XEvent) -> None: ...
+
+class XEventView:
+    def __init__(self, event: XEvent) -> None: ...
+    @property
+    def type(self) -> int: ...
+    def detach(self) -> XEventView: ...
+    def materialize(self) -> XEvent_: ...
+
+class XKeyEventView(XEventView):
+    @property
+    def window(self) -> Window: ...
+    @property
+    def state(self) -> int: ...
+    @property
+    def keycode(self) -> int: ...
+
+class XCreateWindowEventView(XEventView):
+    @property
+    def window(self) -> Window: ...
+
+class XDestroyWindowEventView(XEventView):
+    @property
+    def window(self) -> Window: ...
+
+class XPropertyEventView(XEventView):
+    @property
+    def window(self) -> Window: ...
+    @property
+    def atom(self) -> Atom: ...
+    @property
+    def state(self) -> int: ...
+
+class XFocusChangeEventView(XEventView):
+    @property
+    def window(self) -> Window: ...
+    @property
+    def mode(self) -> int: ...
+
+class XMappingEventView(XEventView):
+    @property
+    def request(self) -> int: ...
+    def refresh(self) -> None: ...
+
 class XErrorEvent_:
     type: XEvent_.Type
     display: Display
@@ -124,10 +179,25 @@ class XErrorEvent_:
     def __init__(self, error: XErrorEvent) -> None: ...
     def get_message(self, size: int = ...) -> str: ...
 
-def get_window_property(display: Display, window: Window, property: Atom, type: Atom = ..., split: bool = ...) -> Optional[Union[List[int], List[str]]]: ...
+PROPERTY_TYPECODES: Dict[int, str]
+DEFAULT_PROPERTY_LENGTH: int
+PropertyValue = Union[List[str], array[int]]
+PropertyDecoder = Callable[[array[int], int, bool], PropertyValue]
+
+def decode_text(encoding: str) -> PropertyDecoder: ...
+def decode_numbers(data: array[int], format: int, split: bool) -> array[int]: ...
+
+DECODERS: Dict[str, PropertyDecoder]
+
+def get_window_property(display: Display, window: Window, property: Atom, type: Atom = ..., split: bool = ..., decoder: Optional[PropertyDecoder] = ...) -> Optional[PropertyValue]: ...
 def get_window_attributes(display: Display, window: Window) -> Optional[XWindowAttributes]: ...
 def get_screen_saver_info(display: Display, drawable: Window) -> Optional[ScreenSaverInfo]: ...
-def set_window_property(display: Display, window: Window, property: Atom, type: Atom, format: int, values: Union[List[int], List[str]]) -> None: ...
+PropertyRequest = Tuple[Window, Atom, Atom, Optional[PropertyDecoder], bool]
+
+def fetch_properties(display: Display, requests: Sequence[PropertyRequest]) -> List[Optional[PropertyValue]]: ...
+def fetch_window_properties(display: Display, window: Window, requests: Sequence[PropertyRequest]) -> Optional[List[Optional[PropertyValue]]]: ...
+def set_window_property(display: Display, window: Window, property: Atom, type: Atom, format: int, values: Union[Sequence[int], List[str]]) -> None: ...
+def get_keyboard_mapping(display: Display) -> Tuple[int, int, List[int]]: ...
 def get_kbd_group(display: Display) -> str: ...
 def set_kbd_group(display: Display, group: int) -> None: ...
 def get_atom_name(display: Display, atom: Atom) -> str: ...
@@ -8,9 +8,12 @@ class Actions(wm.Actions):
         self._wm: wm.WM = window_manager
 
     def _focus(self, window: wrappers.Window, direction: int) -> None:
-        clients = self._wm.find_clients(clients=self._wm.get_clients(), desktop=window.desktop)
-        idx = clients.index(window)
-        newc = clients[(idx + direction) % len(clients)]
+        newc: Optional[wrappers.Window] = self._wm.next_client(window=window, direction=direction)
+        if newc is None:
+            # Not in the rings of the clients (e.g. `ImmediateWM`), asks the server
+            clients = self._wm.find_clients(clients=self._wm.get_clients(), desktop=window.desktop)
+            idx = clients.index(window)
+            newc = clients[(idx + direction) % len(clients)]
         self._wm.focus_and_raise(window=newc)
 
     def focus_next(self, window: Optional[wrappers.Window] = None) -> None:
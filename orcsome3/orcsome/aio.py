@@ -0,0 +1,261 @@
+"""
+asyncio integration, `AsyncioWM` runs orcsome on an asyncio event loop instead of libev::
+
+    import asyncio
+    from orcsome3.orcsome.aio import AsyncioWM
+
+    loop = asyncio.new_event_loop()
+    wm = AsyncioWM(loop=loop)
+
+With `AsyncioWM` the handlers registered with `on_key`, `on_create`, `on_manage`, `on_destroy`,
+`on_property_change` and `on_timer` can be coroutines, they are scheduled as tasks so a slow
+handler doesn't hold up the dispatching of X events::
+
+    @wm.on_key(keydef='Mod+m')
+    async def check_mail() -> None:
+        window = wm.event_window  # read before the first await, it changes with every event
+        proc = await asyncio.create_subprocess_exec('fetchmail')
+        await proc.wait()
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Coroutine, List, Optional, Sequence, Set
+
+from . import wm, xlib
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+
+class IOWatcher(object):
+    """`ev.IOWatcher` counterpart, calls `callback` when `file_descriptor` is readable"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], file_descriptor: int) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._callback: Callable[..., Any] = callback
+        self._file_descriptor: int = file_descriptor
+
+    def start(self, loop: Any = None) -> None:
+        self._loop.add_reader(self._file_descriptor, self._callback, self._loop, self, 0)
+
+    def stop(self, loop: Any = None) -> None:
+        self._loop.remove_reader(self._file_descriptor)
+
+
+class SignalWatcher(object):
+    """`ev.SignalWatcher` counterpart"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any], signum: int) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._callback: Callable[..., Any] = callback
+        self._signum: int = signum
+
+    def start(self, loop: Any = None) -> None:
+        self._loop.add_signal_handler(self._signum, self._callback, self._loop, self, 0)
+
+    def stop(self, loop: Any = None) -> None:
+        self._loop.remove_signal_handler(self._signum)
+
+
+class SoonWatcher(object):
+    """
+    `ev.PrepareWatcher`/`ev.IdleWatcher` counterpart, while active `callback` is called once per
+    iteration of the asyncio loop with `call_soon`
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any]) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._callback: Callable[..., Any] = callback
+        self._handle: Optional[asyncio.Handle] = None
+        self.active: bool = False
+
+    def start(self, loop: Any = None) -> None:
+        self.active = True
+        if self._handle is None:
+            self._handle = self._loop.call_soon(self._run)
+
+    def stop(self, loop: Any = None) -> None:
+        self.active = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _run(self) -> None:
+        self._handle = None
+        self._callback(self._loop, self, 0)
+        if self.active and self._handle is None:
+            self._handle = self._loop.call_soon(self._run)
+
+
+class ThreadsafeWatcher(object):
+    """`ev.AsyncWatcher` counterpart, `send` can be called from any thread"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[..., Any]) -> None:
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._callback: Callable[..., Any] = callback
+
+    def start(self, loop: Any = None) -> None:
+        pass
+
+    def stop(self, loop: Any = None) -> None:
+        pass
+
+    def send(self, loop: Any = None) -> None:
+        self._loop.call_soon_threadsafe(self._callback, self._loop, self, 0)
+
+
+class Timer(object):
+    """`timers.Timer` counterpart based on `call_at`, deadlines use the loop's monotonic clock"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, callback: Callable[[], Any], after: float, repeat: float = 0.0):
+        self._loop: asyncio.AbstractEventLoop = loop
+        self._callback: Callable[[], Any] = callback
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.after: float = after
+        self.repeat: float = repeat
+        self.next_stop: float = 0.0
+
+    @property
+    def active(self) -> bool:
+        return self._handle is not None
+
+    def start(self, after: Optional[float] = None, repeat: Optional[float] = None) -> None:
+        if after is not None:
+            self.after = after
+        if repeat is not None:
+            self.repeat = repeat
+        self._schedule(delay=self.after)
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def again(self) -> None:
+        """Restarts the timer with the `repeat` delay, stops it if `repeat` is 0"""
+        self.stop()
+        if self.repeat:
+            self._schedule(delay=self.repeat)
+
+    def remaining(self) -> float:
+        if not self.active:
+            return 0.0
+        return max(0.0, self.next_stop - self._loop.time())
+
+    def overdue(self, timeout: float) -> bool:
+        return self._loop.time() > self.next_stop + timeout
+
+    def _schedule(self, delay: float) -> None:
+        self._schedule_at(deadline=self._loop.time() + delay)
+
+    def _schedule_at(self, deadline: float) -> None:
+        self.stop()
+        self.next_stop = deadline
+        self._handle = self._loop.call_at(self.next_stop, self._expire)
+
+    def _expire(self) -> None:
+        self._handle = None
+        if self.repeat:
+            # From the previous deadline like `timers.Timer`, so the period doesn't drift with the wakeups
+            self._schedule_at(deadline=max(self.next_stop + self.repeat, self._loop.time()))
+        try:
+            self._callback()
+        except Exception as e:
+            logger.exception(msg=e)
+
+
+class Process(object):
+    """
+    `process.Process` counterpart based on `asyncio.create_subprocess_exec`, `pid` is `None` until
+    the process is started. If it can't be started the error is logged and `returncode` is 127
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        argv: Sequence[str],
+        on_exit: Callable[["Process"], Any],
+        capture: bool = False,
+    ) -> None:
+        self.argv: List[str] = list(argv)
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.stdout: Optional[bytes] = None
+        self.stderr: Optional[bytes] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._task: asyncio.Task = loop.create_task(self._run(on_exit=on_exit, capture=capture))
+
+    @property
+    def running(self) -> bool:
+        return self.returncode is None
+
+    def send_signal(self, signum: int) -> None:
+        if self.running and self._process is not None:
+            self._process.send_signal(signum)
+
+    async def _run(self, on_exit: Callable[["Process"], Any], capture: bool) -> None:
+        pipe: Optional[int] = asyncio.subprocess.PIPE if capture else None
+        try:
+            self._process = await asyncio.create_subprocess_exec(*self.argv, stdout=pipe, stderr=pipe)
+        except Exception as e:
+            logger.exception(msg=e)
+            self.returncode = 127
+        else:
+            self.pid = self._process.pid
+            self.stdout, self.stderr = await self._process.communicate()
+            self.returncode = self._process.returncode
+        on_exit(self)
+
+
+class AsyncioWM(wm.WM):
+    """`WM` running on an asyncio event loop, handlers can be coroutines"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, timer_slack: float = 0.01) -> None:
+        self._aio_loop: asyncio.AbstractEventLoop = loop
+        # Tasks of the coroutine handlers, a reference is kept until they're done
+        self._tasks: Set[asyncio.Task] = set()
+        super().__init__(loop=loop, timer_slack=timer_slack)  # type: ignore
+
+    def _init_loop(self, timer_slack: float) -> None:
+        # `call_later` already orders the timers, `timer_slack` is not needed
+        self._xevent_watcher = IOWatcher(  # type: ignore
+            loop=self._aio_loop, callback=self._xevent_cb, file_descriptor=xlib.lib.ConnectionNumber(self.dpy)
+        )
+        self._xevent_watcher.start(loop=self._loop)
+        self._xevent_resume_watcher = SoonWatcher(loop=self._aio_loop, callback=self._xevent_cb)  # type: ignore
+        self._deferred_watcher = SoonWatcher(loop=self._aio_loop, callback=self._deferred_cb)  # type: ignore
+        self._idle_watcher = SoonWatcher(loop=self._aio_loop, callback=self._idle_cb)  # type: ignore
+        self._executor_watcher = ThreadsafeWatcher(loop=self._aio_loop, callback=self._executor_cb)  # type: ignore
+
+    def _new_timer(self, callback: Callable[[], Any], after: float, repeat: float = 0.0) -> Timer:  # type: ignore
+        return Timer(loop=self._aio_loop, callback=callback, after=after, repeat=repeat)
+
+    def _new_signal_watcher(self, callback: Callable[..., Any], signum: int) -> SignalWatcher:  # type: ignore
+        return SignalWatcher(loop=self._aio_loop, callback=callback, signum=signum)
+
+    def _new_process(  # type: ignore
+        self, argv: Sequence[str], on_exit: Callable[[Any], Any], capture: bool
+    ) -> Process:
+        return Process(loop=self._aio_loop, argv=argv, on_exit=on_exit, capture=capture)
+
+    def _run_coroutine(self, coroutine: Coroutine[Any, Any, Any]) -> None:
+        task: asyncio.Task = self._aio_loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+
+    def _task_done(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if task.cancelled():
+            return
+        error: Optional[BaseException] = task.exception()
+        if isinstance(error, wm.RestartException):
+            if self._restart_handler:
+                self._restart_handler()
+        elif error is not None:
+            logger.exception(msg=error, exc_info=error)
+
+    def stop(self, is_exit: bool = False) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        super().stop(is_exit=is_exit)
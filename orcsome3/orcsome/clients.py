@@ -0,0 +1,146 @@
+from itertools import count
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from . import xlib
+
+
+class ClientList(object):
+    """
+    In-memory copy of the `_NET_CLIENT_LIST` (mapping order) and `_NET_CLIENT_LIST_STACKING`
+    (bottom to top) properties of the root window. It's filled by `WM.init` and updated by the
+    PropertyNotify events of the root window, reading it costs no round trip
+    """
+
+    def __init__(self) -> None:
+        self.clients: List[xlib.Window] = []
+        self.stacking: List[xlib.Window] = []
+        self._members: Set[xlib.Window] = set()
+        self.valid: bool = False  # False until the lists were read from the root window
+
+    def update_clients(self, clients: Sequence[int]) -> Tuple[List[xlib.Window], List[xlib.Window]]:
+        """Replaces the client list, returns the added and the removed windows"""
+        members: Set[xlib.Window] = set(clients)
+        added: List[xlib.Window] = [window for window in clients if window not in self._members]
+        removed: List[xlib.Window] = [window for window in self.clients if window not in members]
+        self.clients = list(clients)
+        self._members = members
+        return added, removed
+
+    def update_stacking(self, stacking: Sequence[int]) -> None:
+        self.stacking = list(stacking)
+
+    def invalidate(self) -> None:
+        self.clients = []
+        self.stacking = []
+        self._members = set()
+        self.valid = False
+
+    def __contains__(self, window: object) -> bool:
+        return window in self._members
+
+
+class DesktopRings(object):
+    """
+    Clients of every desktop linked in a ring, in the order of the client list (the order they were
+    added). Finding the next or previous client of a desktop costs O(1), `WM` keeps the rings up to
+    date from the client list and `_NET_WM_DESKTOP` changes
+    """
+
+    def __init__(self) -> None:
+        self._desktops: Dict[xlib.Window, Optional[int]] = {}
+        # Previous and next window of every window, per desktop
+        self._rings: Dict[Optional[int], Dict[xlib.Window, List[xlib.Window]]] = {}
+        self._last: Dict[Optional[int], xlib.Window] = {}  # Window inserted at the end of every ring
+        self._order: Dict[xlib.Window, int] = {}  # Position of every window in the client list
+        self._counter: Iterator[int] = count()
+        self.valid: bool = False
+
+    def add(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        """Adds `window` after the windows already added, a window added again keeps its position"""
+        if window in self._desktops:
+            self._unlink(window=window)
+        else:
+            self._order[window] = next(self._counter)
+        self._link(window=window, desktop=desktop)
+
+    def discard(self, window: xlib.Window) -> None:
+        if window in self._desktops:
+            self._unlink(window=window)
+            del self._order[window]
+
+    def move(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        """`window` was moved to `desktop`, it's inserted at its client list position in the ring"""
+        if window in self._desktops and self._desktops[window] != desktop:
+            self._unlink(window=window)
+            self._link(window=window, desktop=desktop)
+
+    def _link(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        self._desktops[window] = desktop
+        ring: Dict[xlib.Window, List[xlib.Window]] = self._rings.setdefault(desktop, {})
+        last: Optional[xlib.Window] = self._last.get(desktop)
+        if last is None:
+            ring[window] = [window, window]
+            self._last[desktop] = window
+            return
+        order: int = self._order[window]
+        previous: Optional[xlib.Window] = last
+        if order < self._order[last]:
+            # Moved from another desktop, it goes after the windows added before it (first if there's none)
+            previous = max(
+                (window_ for window_ in ring if self._order[window_] < order), key=self._order.__getitem__, default=None
+            )
+        if previous is None:
+            previous = last
+        elif previous == last:
+            self._last[desktop] = window
+        following: xlib.Window = ring[previous][1]
+        ring[window] = [previous, following]
+        ring[previous][1] = window
+        ring[following][0] = window
+
+    def _unlink(self, window: xlib.Window) -> None:
+        desktop: Optional[int] = self._desktops.pop(window)
+        ring: Dict[xlib.Window, List[xlib.Window]] = self._rings[desktop]
+        previous, following = ring.pop(window)
+        if not ring:
+            del self._rings[desktop]
+            del self._last[desktop]
+            return
+        ring[previous][1] = following
+        ring[following][0] = previous
+        if self._last[desktop] == window:
+            self._last[desktop] = previous
+
+    def step(self, window: xlib.Window, direction: int) -> Optional[xlib.Window]:
+        """Returns the client `direction` places after `window` in the ring of its desktop, None if it isn't a client"""
+        if not self.valid or window not in self._desktops:
+            return None
+        ring: Dict[xlib.Window, List[xlib.Window]] = self._rings[self._desktops[window]]
+        link: int = 1 if direction > 0 else 0
+        for _ in range(abs(direction) % len(ring)):
+            window = ring[window][link]
+        return window
+
+    def desktop(self, desktop: Optional[int]) -> List[xlib.Window]:
+        """Returns the clients of `desktop` in ring order"""
+        last: Optional[xlib.Window] = self._last.get(desktop)
+        if last is None:
+            return []
+        ring: Dict[xlib.Window, List[xlib.Window]] = self._rings[desktop]
+        windows: List[xlib.Window] = []
+        window: xlib.Window = ring[last][1]
+        while True:
+            windows.append(window)
+            if window == last:
+                return windows
+            window = ring[window][1]
+
+    def clear(self) -> None:
+        self._desktops.clear()
+        self._rings.clear()
+        self._last.clear()
+        self._order.clear()
+        self.valid = False
+
+    def __contains__(self, window: object) -> bool:
+        return window in self._desktops
@@ -1,5 +1,7 @@
+import os
+import signal
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 try:
     from ._ev import ffi, lib  # type: ignore
@@ -11,9 +13,56 @@ finally:
     from ._ev import ffi, lib  # type: ignore
 
 
+# Backends that can be requested by name, "auto" lets libev pick the best one available
+BACKENDS: Dict[str, int] = {
+    "auto": int(lib.EVFLAG_AUTO),
+    "epoll": int(lib.EVBACKEND_EPOLL),
+    "poll": int(lib.EVBACKEND_POLL),
+    "select": int(lib.EVBACKEND_SELECT),
+}
+
+
+def supported_backends() -> List[str]:
+    """Return the names of the backends compiled into libev and usable on this system"""
+    supported: int = lib.ev_supported_backends()
+    return [name for name, flag in BACKENDS.items() if flag and supported & flag]
+
+
+def recommended_backends() -> List[str]:
+    """Return the names of the backends libev recommends for this system"""
+    recommended: int = lib.ev_recommended_backends()
+    return [name for name, flag in BACKENDS.items() if flag and recommended & flag]
+
+
 class Loop(object):
-    def __init__(self) -> None:
-        self._loop = lib.ev_loop_new(lib.EVBACKEND_SELECT)
+    def __init__(self, backend: str = "auto") -> None:
+        try:
+            flags: int = BACKENDS[backend]
+        except KeyError:
+            raise ValueError(f"Unknown loop backend: {backend}")
+        if flags and not lib.ev_supported_backends() & flags:
+            raise ValueError(f"Loop backend not supported on this system: {backend}")
+
+        self._loop = lib.ev_loop_new(flags)
+        if self._loop == ffi.NULL:
+            raise Exception(f"Can't create event loop with backend: {backend}")
+
+        # Children watched by a `ChildWatcher` and the SIGCHLD watcher reaping them, started on first use
+        self._children: Dict[int, "ChildWatcher"] = {}
+        self._child_signal_watcher: Optional[SignalWatcher] = None
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend in use by the loop"""
+        flags: int = lib.ev_backend(self._loop)
+        for name, flag in BACKENDS.items():
+            if flag == flags:
+                return name
+        return str(flags)
+
+    def now(self) -> float:
+        """Time (in seconds since the epoch) of the current loop iteration, it follows the wall clock"""
+        return float(lib.ev_now(self._loop))
 
     def destroy(self) -> None:
         lib.ev_loop_destroy(self._loop)
@@ -24,6 +73,18 @@ class Loop(object):
     def break_(self, flags: int = lib.EVBREAK_ALL) -> None:
         lib.ev_break(self._loop, flags)
 
+    def _watch_child(self, watcher: "ChildWatcher") -> None:
+        self._children[watcher.pid] = watcher
+        if self._child_signal_watcher is None:
+            self._child_signal_watcher = SignalWatcher(callback=self._child_signal_cb, signum=signal.SIGCHLD)
+            self._child_signal_watcher.start(loop=self)
+            # The child may have exited before SIGCHLD was watched
+            lib.ev_feed_signal_event(self._loop, signal.SIGCHLD)
+
+    def _child_signal_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        for watcher_ in list(self._children.values()):
+            watcher_._poll()
+
 
 class IOWatcher(object):
     def __init__(self, callback: Callable[..., Any], file_descriptor: int, flags: int) -> None:
@@ -69,6 +130,12 @@ class TimerWatcher(object):
         self.next_stop = time.time() + self._after
         lib.ev_timer_start(loop._loop, self._watcher)
 
+    def set(self, after: float, repeat: float = 0.0) -> None:
+        """Changes `after` and `repeat` (even to 0), the watcher must be stopped"""
+        self._after = after
+        self._repeat = repeat
+        lib.ev_timer_set(self._watcher, after, repeat)
+
     def stop(self, loop: Loop) -> None:
         lib.ev_timer_stop(loop._loop, self._watcher)
 
@@ -84,3 +151,121 @@ class TimerWatcher(object):
 
     def overdue(self, timeout: float) -> bool:
         return time.time() > self.next_stop + timeout
+
+
+class PrepareWatcher(object):
+    """Calls `callback` on every loop iteration just before the loop blocks waiting for events"""
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self._watcher = ffi.new("ev_prepare*")
+        self._callback = ffi.callback("prepare_cb", callback)
+        self.active: bool = False
+        lib.ev_prepare_init(self._watcher, self._callback)
+
+    def start(self, loop: Loop) -> None:
+        lib.ev_prepare_start(loop._loop, self._watcher)
+        self.active = True
+
+    def stop(self, loop: Loop) -> None:
+        lib.ev_prepare_stop(loop._loop, self._watcher)
+        self.active = False
+
+
+class CheckWatcher(object):
+    """Calls `callback` on every loop iteration just after the loop has gathered new events"""
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self._watcher = ffi.new("ev_check*")
+        self._callback = ffi.callback("check_cb", callback)
+        self.active: bool = False
+        lib.ev_check_init(self._watcher, self._callback)
+
+    def start(self, loop: Loop) -> None:
+        lib.ev_check_start(loop._loop, self._watcher)
+        self.active = True
+
+    def stop(self, loop: Loop) -> None:
+        lib.ev_check_stop(loop._loop, self._watcher)
+        self.active = False
+
+
+class IdleWatcher(object):
+    """
+    Calls `callback` when there are no other pending events, while active the loop doesn't block
+    so it must be stopped as soon as there is no more work to do
+    """
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self._watcher = ffi.new("ev_idle*")
+        self._callback = ffi.callback("idle_cb", callback)
+        self.active: bool = False
+        lib.ev_idle_init(self._watcher, self._callback)
+
+    def start(self, loop: Loop) -> None:
+        lib.ev_idle_start(loop._loop, self._watcher)
+        self.active = True
+
+    def stop(self, loop: Loop) -> None:
+        lib.ev_idle_stop(loop._loop, self._watcher)
+        self.active = False
+
+
+class AsyncWatcher(object):
+    """Calls `callback` on the loop thread after `send` was called, `send` can be called from any thread"""
+
+    def __init__(self, callback: Callable[..., Any]) -> None:
+        self._watcher = ffi.new("ev_async*")
+        self._callback = ffi.callback("async_cb", callback)
+        lib.ev_async_init(self._watcher, self._callback)
+
+    def start(self, loop: Loop) -> None:
+        lib.ev_async_start(loop._loop, self._watcher)
+
+    def stop(self, loop: Loop) -> None:
+        lib.ev_async_stop(loop._loop, self._watcher)
+
+    def send(self, loop: Loop) -> None:
+        lib.ev_async_send(loop._loop, self._watcher)
+
+
+class ChildWatcher(object):
+    """
+    Calls `callback` when the child process `pid` exits. The loop reaps it with `waitpid` on
+    SIGCHLD, only the processes with a started watcher are reaped: the other children of the
+    process are left to whoever started them (`subprocess`, `os.waitpid`...)
+    """
+
+    def __init__(self, callback: Callable[..., Any], pid: int) -> None:
+        self._callback: Callable[..., Any] = callback
+        self._pid: int = pid
+        self._status: int = 0
+        self._loop: Optional[Loop] = None
+
+    @property
+    def pid(self) -> int:
+        return self._pid
+
+    @property
+    def status(self) -> int:
+        """Wait status of the process as returned by `waitpid`"""
+        return self._status
+
+    def start(self, loop: Loop) -> None:
+        self._loop = loop
+        loop._watch_child(watcher=self)
+
+    def stop(self, loop: Loop) -> None:
+        if loop._children.get(self._pid) is self:
+            del loop._children[self._pid]
+        self._loop = None
+
+    def _poll(self) -> None:
+        try:
+            pid, status = os.waitpid(self._pid, os.WNOHANG)
+        except ChildProcessError:
+            pid, status = self._pid, 0  # Reaped by someone else, the status is lost
+        if pid and self._loop is not None:
+            loop: Loop = self._loop
+            self.stop(loop=loop)
+            self._status = status
+            self._callback(loop, self, 0)
@@ -6,7 +6,10 @@ source: str = """
 """
 
 export_source: str = """
+#define EVFLAG_AUTO ...
 #define EVBACKEND_SELECT ...
+#define EVBACKEND_POLL ...
+#define EVBACKEND_EPOLL ...
 #define EV_READ ...
 #define EV_WRITE ...
 #define EVBREAK_ALL ...
@@ -14,6 +17,9 @@ export_source: str = """
 typedef ... ev_loop;
 
 struct ev_loop *ev_loop_new (unsigned int flags);
+unsigned int ev_supported_backends (void);
+unsigned int ev_recommended_backends (void);
+unsigned int ev_backend (struct ev_loop*);
 void ev_loop_destroy (struct ev_loop*);
 void ev_break (struct ev_loop*, int);
 int ev_run (struct ev_loop*, int);
@@ -29,8 +35,10 @@ typedef void (*signal_cb) (struct ev_loop*, ev_signal*, int);
 void ev_signal_init(ev_signal*, signal_cb, int);
 void ev_signal_start(struct ev_loop*, ev_signal*);
 void ev_signal_stop(struct ev_loop*, ev_signal*);
+void ev_feed_signal_event(struct ev_loop*, int);
 
 typedef double ev_tstamp;
+ev_tstamp ev_now(struct ev_loop*);
 typedef struct { ...; } ev_timer;
 typedef void (*timer_cb) (struct ev_loop*, ev_timer*, int);
 void ev_timer_init(ev_timer*, timer_cb, ev_tstamp, ev_tstamp);
@@ -39,6 +47,31 @@ void ev_timer_start(struct ev_loop*, ev_timer*);
 void ev_timer_again(struct ev_loop*, ev_timer*);
 void ev_timer_stop(struct ev_loop*, ev_timer*);
 ev_tstamp ev_timer_remaining(struct ev_loop*, ev_timer*);
+
+typedef struct { ...; } ev_prepare;
+typedef void (*prepare_cb) (struct ev_loop*, ev_prepare*, int);
+void ev_prepare_init(ev_prepare*, prepare_cb);
+void ev_prepare_start(struct ev_loop*, ev_prepare*);
+void ev_prepare_stop(struct ev_loop*, ev_prepare*);
+
+typedef struct { ...; } ev_check;
+typedef void (*check_cb) (struct ev_loop*, ev_check*, int);
+void ev_check_init(ev_check*, check_cb);
+void ev_check_start(struct ev_loop*, ev_check*);
+void ev_check_stop(struct ev_loop*, ev_check*);
+
+typedef struct { ...; } ev_idle;
+typedef void (*idle_cb) (struct ev_loop*, ev_idle*, int);
+void ev_idle_init(ev_idle*, idle_cb);
+void ev_idle_start(struct ev_loop*, ev_idle*);
+void ev_idle_stop(struct ev_loop*, ev_idle*);
+
+typedef struct { ...; } ev_async;
+typedef void (*async_cb) (struct ev_loop*, ev_async*, int);
+void ev_async_init(ev_async*, async_cb);
+void ev_async_start(struct ev_loop*, ev_async*);
+void ev_async_stop(struct ev_loop*, ev_async*);
+void ev_async_send(struct ev_loop*, ev_async*);
 """
 
 ffibuilder: FFI = cffi.FFI()
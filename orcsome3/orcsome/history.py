@@ -0,0 +1,99 @@
+import heapq
+from collections import OrderedDict
+from itertools import count, islice
+from typing import Dict, Iterator, List, Optional
+
+from . import xlib
+
+# Desktop of the sticky windows (see `wrappers.decode_desktop`), they're shown on every desktop
+STICKY_DESKTOP: int = -1
+
+
+class FocusHistory(object):
+    """
+    Windows in the order they got the focus, the last one is the focused window. Focusing and
+    removing a window costs O(1), the windows of every desktop are also kept in their own order so
+    `mru` doesn't filter the whole history. Sticky windows are part of the view of every desktop.
+
+    It's iterated from the oldest to the most recent window like the list it replaces.
+    """
+
+    def __init__(self) -> None:
+        self._windows: "OrderedDict[xlib.Window, Optional[int]]" = OrderedDict()  # Window -> desktop
+        self._desktops: Dict[Optional[int], "OrderedDict[xlib.Window, None]"] = {}
+        # When every window entered the view of its desktop, to merge the sticky windows in recency order
+        self._stamps: Dict[xlib.Window, int] = {}
+        self._counter: Iterator[int] = count()
+
+    def touch(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        """Moves `window` to the end (most recent)"""
+        self.discard(window=window)
+        self._windows[window] = desktop
+        self._add_to_desktop(window=window, desktop=desktop)
+
+    def move(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        """`window` was moved to `desktop`, it becomes its most recent window"""
+        if window not in self._windows or self._windows[window] == desktop:
+            return
+        self._remove_from_desktop(window=window, desktop=self._windows[window])
+        self._windows[window] = desktop
+        self._add_to_desktop(window=window, desktop=desktop)
+
+    def discard(self, window: xlib.Window) -> None:
+        if window in self._windows:
+            self._remove_from_desktop(window=window, desktop=self._windows.pop(window))
+
+    def clear(self) -> None:
+        self._windows.clear()
+        self._desktops.clear()
+        self._stamps.clear()
+
+    def mru(self, desktop: Optional[int] = None) -> List[xlib.Window]:
+        """
+        Returns the windows from the most to the least recent, only the ones of `desktop` (and the
+        sticky windows) if given
+        """
+        if desktop is None:
+            return list(reversed(self._windows))
+        windows: "OrderedDict[xlib.Window, None]" = self._desktops.get(desktop, OrderedDict())
+        sticky: "OrderedDict[xlib.Window, None]" = self._desktops.get(STICKY_DESKTOP, OrderedDict())
+        if desktop == STICKY_DESKTOP or not sticky:
+            return list(reversed(windows))
+        if not windows:
+            return list(reversed(sticky))
+        return list(heapq.merge(reversed(windows), reversed(sticky), key=lambda window: -self._stamps[window]))
+
+    def desktop_of(self, window: xlib.Window) -> Optional[int]:
+        return self._windows.get(window)
+
+    def _add_to_desktop(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        self._desktops.setdefault(desktop, OrderedDict())[window] = None
+        self._stamps[window] = next(self._counter)
+
+    def _remove_from_desktop(self, window: xlib.Window, desktop: Optional[int]) -> None:
+        windows: "OrderedDict[xlib.Window, None]" = self._desktops[desktop]
+        del windows[window]
+        del self._stamps[window]
+        if not windows:
+            del self._desktops[desktop]
+
+    def __iter__(self) -> Iterator[xlib.Window]:
+        return iter(self._windows)
+
+    def __reversed__(self) -> Iterator[xlib.Window]:
+        return reversed(self._windows)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def __contains__(self, window: object) -> bool:
+        return window in self._windows
+
+    def __getitem__(self, index: int) -> xlib.Window:
+        """Indexing like a list, the most recent windows (negative indexes) are reached without a copy"""
+        size: int = len(self._windows)
+        if not -size <= index < size:
+            raise IndexError("focus history index out of range")
+        if index < 0:
+            return next(islice(reversed(self._windows), -index - 1, None))
+        return next(islice(self._windows, index, None))
@@ -0,0 +1,253 @@
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union, cast
+
+from . import xlib
+from .aliases import KEYS as KEY_ALIASES
+
+# Lock modifiers (CapsLock, NumLock) grabbed along with every key so they don't disable the bindings
+IGNORED_MOD_MASKS: Tuple[int, int, int, int] = (
+    0,
+    int(xlib.MASKS.LockMask.value),
+    int(xlib.MASKS.Mod2Mask.value),
+    int(xlib.MASKS.LockMask.value | xlib.MASKS.Mod2Mask.value),
+)
+
+# Bits of a key event state compared with the bindings: the core modifiers but the lock ones
+_BINDING_MASK: int = 0xFF & ~IGNORED_MOD_MASKS[3]
+
+# (modifier mask, keycode) of a key, as grabbed and as found in the key events
+Key = Tuple[int, int]
+
+# Handler of a key, or the keys that can follow it if it starts key sequences
+Binding = Union[Callable[[], None], "KeyNode"]
+
+
+def normalize_state(state: int) -> int:
+    """Drops the lock modifiers, the pointer buttons and the keyboard group from a key event state"""
+    return state & _BINDING_MASK
+
+
+class Keymap(object):
+    """
+    Keysym to keycode table read with a single `XGetKeyboardMapping` request, resolving a key
+    costs no request. It's read on first use and again by `load` when the mapping changes
+    """
+
+    def __init__(self, display: xlib.Display) -> None:
+        self._display: xlib.Display = display
+        self._keycodes: Optional[Dict[int, int]] = None
+        self._keysyms: Dict[str, Optional[int]] = {}  # Keysyms by name, they don't depend on the mapping
+
+    def load(self) -> None:
+        first_keycode, keysyms_per_keycode, keysyms = xlib.get_keyboard_mapping(display=self._display)
+        keycodes: Dict[int, int] = {}
+        count: int = len(keysyms) // keysyms_per_keycode if keysyms_per_keycode else 0
+        # Same lookup order as `XKeysymToKeycode`: the first keysym of every keycode, then the second...
+        for column in range(keysyms_per_keycode):
+            for index in range(count):
+                keysym: int = keysyms[index * keysyms_per_keycode + column]
+                if keysym != xlib.lib.NoSymbol and keysym not in keycodes:
+                    keycodes[keysym] = first_keycode + index
+        self._keycodes = keycodes
+
+    def keysym(self, name: str) -> Optional[int]:
+        try:
+            return self._keysyms[name]
+        except KeyError:
+            pass
+        keysym: int = int(xlib.lib.XStringToKeysym(str.encode(KEY_ALIASES.get(name, name))))
+        result: Optional[int] = None if keysym == xlib.lib.NoSymbol else keysym
+        self._keysyms[name] = result
+        return result
+
+    def keycode(self, keysym: int) -> Optional[int]:
+        if self._keycodes is None:
+            self.load()
+        return cast(Dict[int, int], self._keycodes).get(keysym)
+
+
+class KeyNode(object):
+    """Prefix of key sequences: the (modmask, keysym) that can follow it and their bindings"""
+
+    __slots__ = ("children",)
+
+    def __init__(self) -> None:
+        self.children: Dict[Tuple[int, int], Binding] = {}
+
+    def resolve(self, keymap: Keymap) -> Dict[Key, Binding]:
+        """Returns the bindings that can follow by (modmask, keycode), without the keys missing in the mapping"""
+        return _resolve(bindings=self.children, keymap=keymap)
+
+
+def _resolve(bindings: Dict[Tuple[int, int], Binding], keymap: Keymap) -> Dict[Key, Binding]:
+    result: Dict[Key, Binding] = {}
+    for (modmask, keysym), binding in bindings.items():
+        keycode: Optional[int] = keymap.keycode(keysym=keysym)
+        if keycode is not None:
+            result[(modmask, keycode)] = binding
+    return result
+
+
+class KeyBindings(object):
+    """
+    Key bindings per window. They are kept by keysym and resolved with the `Keymap` in memory,
+    `refresh` resolves them again after a MappingNotify. Key sequences are stored in a trie of
+    `KeyNode`, only their first keys are grabbed (see `grab_level`).
+
+    The keys to grab are the keys of the bindings, `sync` sends the difference with the keys
+    already grabbed as a single batch of requests. `clear` keeps the grabs so reloading the
+    config only grabs and ungrabs the keys that changed.
+    """
+
+    def __init__(self, keymap: Keymap) -> None:
+        self.keymap: Keymap = keymap
+        self._bindings: Dict[xlib.Window, Dict[Tuple[int, int], Binding]] = {}  # By (modmask, keysym)
+        self.handlers: Dict[xlib.Window, Dict[Key, Binding]] = {}
+        self._grabbed: Dict[xlib.Window, Set[Key]] = {}
+        self.dirty: bool = False  # True when `handlers` changed since the latest `sync`
+
+    def add(self, window: xlib.Window, sequence: Sequence[Tuple[int, int]], handler: Callable[[], None]) -> bool:
+        """
+        Binds the sequence of (modmask, keysym), returns False if no key of the keyboard produces
+        its first keysym (the binding is kept, a later mapping may have it). Raises ValueError
+        if a key of the sequence is bound to a handler or if the sequence is a prefix of others
+        """
+        level: Dict[Tuple[int, int], Binding] = self._bindings.get(window, {})
+        for index, key in enumerate(sequence):
+            binding: Optional[Binding] = level.get(key)
+            if binding is None:
+                break
+            if index == len(sequence) - 1:
+                if isinstance(binding, KeyNode):
+                    raise ValueError("it's the beginning of other key sequences")
+            elif not isinstance(binding, KeyNode):
+                raise ValueError("a key of the sequence is already bound")
+            else:
+                level = binding.children
+
+        level = self._bindings.setdefault(window, {})
+        for key in sequence[:-1]:
+            level = cast(KeyNode, level.setdefault(key, KeyNode())).children
+        level[sequence[-1]] = handler
+
+        modmask, keysym = sequence[0]
+        keycode: Optional[int] = self.keymap.keycode(keysym=keysym)
+        if keycode is None:
+            return False
+        self.handlers.setdefault(window, {})[(modmask, keycode)] = self._bindings[window][sequence[0]]
+        self.dirty = True
+        return True
+
+    def remove(self, window: xlib.Window, sequence: Sequence[Tuple[int, int]], handler: Callable[[], None]) -> None:
+        level: Optional[Dict[Tuple[int, int], Binding]] = self._bindings.get(window)
+        if level is None:
+            return
+        path: List[Tuple[Dict[Tuple[int, int], Binding], Tuple[int, int]]] = []
+        for key in sequence[:-1]:
+            node: Optional[Binding] = level.get(key)
+            if not isinstance(node, KeyNode):
+                return
+            path.append((level, key))
+            level = node.children
+        if level.get(sequence[-1]) is not handler:
+            return  # Replaced by another binding of the same keys
+        del level[sequence[-1]]
+        # Drops the prefixes left without sequences
+        while path and not level:
+            level, key = path.pop()
+            del level[key]
+        if not self._bindings[window]:
+            del self._bindings[window]
+        self._compile(window=window)
+
+    def lookup(self, window: xlib.Window, state: int, keycode: int) -> Optional[Binding]:
+        handlers: Optional[Dict[Key, Binding]] = self.handlers.get(window)
+        if handlers is None:
+            return None
+        return handlers.get((normalize_state(state=state), keycode))
+
+    def refresh(self) -> None:
+        """Reads the keyboard mapping again and resolves every binding with it"""
+        self.keymap.load()
+        for window in list(self.handlers) + list(self._bindings):
+            self._compile(window=window)
+
+    def forget_window(self, window: xlib.Window) -> None:
+        """The window was destroyed, its grabs went with it"""
+        self._bindings.pop(window, None)
+        self.handlers.pop(window, None)
+        self._grabbed.pop(window, None)
+
+    def clear(self) -> None:
+        self._bindings.clear()
+        self.handlers.clear()
+        self.dirty = True
+
+    def sync(self, display: xlib.Display, wait: bool = False) -> Tuple[int, int]:
+        """
+        Grabs the keys bound since the latest call and ungrabs the ones no longer bound, the
+        requests are sent together followed by a single `XFlush` (`XSync` if `wait`). Returns
+        the number of keys grabbed and ungrabbed
+        """
+        if not self.dirty:
+            return 0, 0
+        self.dirty = False
+        grabbed: int = 0
+        ungrabbed: int = 0
+        for window in set(self.handlers) | set(self._grabbed):
+            wanted: Set[Key] = set(self.handlers.get(window, ()))
+            current: Set[Key] = self._grabbed.get(window, set())
+            for modmask, keycode in current - wanted:
+                for mask in IGNORED_MOD_MASKS:
+                    xlib.lib.XUngrabKey(display, keycode, modmask | mask, window)
+                ungrabbed += 1
+            for modmask, keycode in wanted - current:
+                for mask in IGNORED_MOD_MASKS:
+                    xlib.lib.XGrabKey(
+                        display, keycode, modmask | mask, window, False, xlib.lib.GrabModeAsync, xlib.lib.GrabModeAsync
+                    )
+                grabbed += 1
+            if wanted:
+                self._grabbed[window] = wanted
+            else:
+                self._grabbed.pop(window, None)
+        if grabbed or ungrabbed:
+            # `XSync` would queue the events it reads without waking up the loop, only the event handlers can wait
+            if wait:
+                xlib.lib.XSync(display, False)
+            else:
+                xlib.lib.XFlush(display)
+        return grabbed, ungrabbed
+
+    def grab_level(self, display: xlib.Display, window: xlib.Window, keys: Iterable[Key]) -> List[Key]:
+        """
+        Grabs the keys that can follow a key sequence prefix until `ungrab_level`, returns the
+        ones that weren't grabbed already (those stay grabbed)
+        """
+        grabbed: Set[Key] = self._grabbed.get(window, set())
+        new: List[Key] = [key for key in keys if key not in grabbed]
+        for modmask, keycode in new:
+            for mask in IGNORED_MOD_MASKS:
+                xlib.lib.XGrabKey(
+                    display, keycode, modmask | mask, window, False, xlib.lib.GrabModeAsync, xlib.lib.GrabModeAsync
+                )
+        xlib.lib.XFlush(display)
+        return new
+
+    def ungrab_level(self, display: xlib.Display, window: xlib.Window, keys: Iterable[Key]) -> None:
+        grabbed: Set[Key] = self._grabbed.get(window, set())
+        for modmask, keycode in keys:
+            if (modmask, keycode) not in grabbed:  # Bound meanwhile
+                for mask in IGNORED_MOD_MASKS:
+                    xlib.lib.XUngrabKey(display, keycode, modmask | mask, window)
+        xlib.lib.XFlush(display)
+
+    def _compile(self, window: xlib.Window) -> None:
+        handlers: Dict[Key, Binding] = _resolve(bindings=self._bindings.get(window, {}), keymap=self.keymap)
+        if handlers:
+            self.handlers[window] = handlers
+        else:
+            self.handlers.pop(window, None)
+        self.dirty = True
+
+    def windows(self) -> List[xlib.Window]:
+        return list(self._bindings)
@@ -0,0 +1,237 @@
+import re
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from . import utils
+
+# Matchers compared as regular expressions searched in the value, in order of preference to index a rule
+STRING_FIELDS: Tuple[str, ...] = ("cls", "name", "role", "title")
+FIELDS: Tuple[str, ...] = STRING_FIELDS + ("desktop",)
+
+# Number of values remembered by every field with the patterns they match
+MEMO_SIZE: int = 512
+
+_METACHARACTERS: Pattern[str] = re.compile(r"[.^$*+?{}\[\]\\|()]")
+
+
+def exact_literal(pattern: str) -> Optional[str]:
+    """Returns the text matched by a pattern like ``^Firefox$``, None for any other pattern"""
+    if len(pattern) > 1 and pattern[0] == "^" and pattern[-1] == "$":
+        text: str = pattern[1:-1]
+        if not _METACHARACTERS.search(text):
+            return text
+    return None
+
+
+class FieldIndex(object):
+    """
+    Patterns of a field: exact literals are looked up in a dict and the other patterns are merged
+    into a single regular expression made of optional lookaheads, one pass over the value tells
+    every pattern found in it. Patterns with groups or inline flags can't be merged, they are
+    searched one by one. The result is remembered per value
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self._exact: Dict[str, List[str]] = {}
+        self._separate: List[Tuple[str, Pattern[str]]] = []
+        self._merged: List[str] = []
+        self._combined: Optional[Pattern[str]] = None
+        self._memo: Dict[str, FrozenSet[str]] = {}
+
+        for pattern in dict.fromkeys(patterns):
+            text: Optional[str] = exact_literal(pattern=pattern)
+            if text is not None:
+                self._exact.setdefault(text, []).append(pattern)
+                continue
+            try:
+                if re.compile(f"(?:{pattern})").groups:
+                    raise re.error("groups")
+            except re.error:
+                self._separate.append((pattern, re.compile(pattern)))
+            else:
+                self._merged.append(pattern)
+
+        if self._merged:
+            try:
+                self._combined = re.compile(
+                    "".join(f"(?=(?P<p{i}>(?s:.*?)(?:{pattern})))?" for i, pattern in enumerate(self._merged))
+                )
+            except re.error:
+                self._separate.extend((pattern, re.compile(pattern)) for pattern in self._merged)
+                self._merged = []
+
+    def hits(self, value: str) -> FrozenSet[str]:
+        """Returns the patterns found in `value`"""
+        try:
+            return self._memo[value]
+        except KeyError:
+            pass
+
+        found: List[str] = list(self._exact.get(value, ()))
+        if value.endswith("\n"):  # `$` also matches before a newline at the end
+            found.extend(self._exact.get(value[:-1], ()))
+        if self._combined is not None:
+            match = self._combined.match(value)
+            if match is not None:
+                found.extend(self._merged[int(name[1:])] for name, hit in match.groupdict().items() if hit is not None)
+        found.extend(pattern for pattern, compiled in self._separate if compiled.search(value))
+
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        hits: FrozenSet[str] = frozenset(found)
+        self._memo[value] = hits
+        return hits
+
+
+class Rule(object):
+    __slots__ = ("callback", "matchers", "ignore_startup", "order", "primary", "prefetch")
+
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        matchers: Dict[str, Any],
+        ignore_startup: bool,
+        order: int,
+        prefetch: Sequence[str] = (),
+    ):
+        self.callback: Callable[[], None] = callback
+        self.matchers: Dict[str, Any] = matchers
+        self.ignore_startup: bool = ignore_startup
+        self.order: int = order
+        self.prefetch: Tuple[str, ...] = tuple(prefetch)  # Properties read by the handler
+        # Field used to find the rule in the index, None if the rule has no string matcher
+        self.primary: Optional[str] = next((field for field in STRING_FIELDS if field in matchers), None)
+
+
+class MatcherIndex(object):
+    """
+    Handlers of `on_create`/`on_manage` indexed by their matchers (see `wrappers.Window.matches`).
+
+    Every rule is indexed by one of its string matchers, only the rules whose pattern is found in
+    the window are checked, in registration order. The index is compiled again after a change
+    """
+
+    def __init__(self) -> None:
+        self._rules: List[Rule] = []
+        self._order: int = 0
+        self._compiled: bool = False
+        self._fields: Dict[str, FieldIndex] = {}
+        self._buckets: Dict[str, Dict[str, List[Rule]]] = {}  # Rules per primary field and pattern
+        self._unconditional: List[Rule] = []
+        self._used_fields: List[str] = []
+        self._prefetch: List[str] = []
+
+    def add(
+        self,
+        callback: Callable[[], None],
+        matchers: Dict[str, Any],
+        ignore_startup: bool = False,
+        prefetch: Sequence[str] = (),
+    ) -> Rule:
+        unknown: List[str] = [matcher for matcher in matchers if matcher not in FIELDS]
+        if unknown:
+            raise TypeError(f"Unknown matchers: {', '.join(unknown)}")
+        used: Dict[str, Any] = {}
+        for field, value in matchers.items():
+            if field == "desktop":
+                if value is not None:
+                    used[field] = value
+            elif value:
+                utils.compile_matcher(pattern=value)  # Invalid patterns are reported when the handler is registered
+                used[field] = value
+
+        rule: Rule = Rule(
+            callback=callback, matchers=used, ignore_startup=ignore_startup, order=self._order, prefetch=prefetch
+        )
+        self._order += 1
+        self._rules.append(rule)
+        self._compiled = False
+        return rule
+
+    def remove(self, rule: Rule) -> None:
+        self._rules.remove(rule)
+        self._compiled = False
+
+    def clear(self) -> None:
+        self._rules[:] = []
+        self._compiled = False
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def fields(self) -> List[str]:
+        """Returns the fields compared by the rules"""
+        if not self._compiled:
+            self._compile()
+        return self._used_fields
+
+    def prefetch(self) -> List[str]:
+        """Returns the properties the handlers declared to read"""
+        if not self._compiled:
+            self._compile()
+        return self._prefetch
+
+    def _compile(self) -> None:
+        patterns: Dict[str, List[str]] = {}
+        self._buckets = {}
+        self._unconditional = []
+        for rule in self._rules:
+            for field in STRING_FIELDS:
+                if field in rule.matchers:
+                    patterns.setdefault(field, []).append(rule.matchers[field])
+            if rule.primary is None:
+                self._unconditional.append(rule)
+            else:
+                self._buckets.setdefault(rule.primary, {}).setdefault(rule.matchers[rule.primary], []).append(rule)
+        self._fields = {field: FieldIndex(patterns=field_patterns) for field, field_patterns in patterns.items()}
+        self._used_fields = [field for field in FIELDS if any(field in rule.matchers for rule in self._rules)]
+        self._prefetch = list(dict.fromkeys(name for rule in self._rules for name in rule.prefetch))
+        self._compiled = True
+
+    def match(self, window: Any, startup: bool = False) -> Iterator[Callable[[], None]]:
+        """
+        Yields the callbacks of the rules matching `window` in registration order, the rules of
+        `on_manage` are skipped on startup. Every property is read once per window
+        """
+        if not self._compiled:
+            self._compile()
+
+        values: Dict[str, Any] = {}
+        hits: Dict[str, FrozenSet[str]] = {}
+
+        def value_of(field: str) -> Any:
+            try:
+                return values[field]
+            except KeyError:
+                value: Any = getattr(window, field)
+                values[field] = value if field == "desktop" else value or ""
+                return values[field]
+
+        def hits_of(field: str) -> FrozenSet[str]:
+            try:
+                return hits[field]
+            except KeyError:
+                hits[field] = self._fields[field].hits(value=value_of(field=field))
+                return hits[field]
+
+        candidates: List[Rule] = list(self._unconditional)
+        for field, buckets in self._buckets.items():
+            for pattern in hits_of(field=field):
+                # Patterns that are only secondary conditions of the rules have no bucket
+                candidates.extend(buckets.get(pattern, ()))
+        candidates.sort(key=lambda rule: rule.order)
+
+        for rule in candidates:
+            if rule.ignore_startup and startup:
+                continue
+            matched: bool = True
+            for field, pattern in rule.matchers.items():
+                if field == rule.primary:
+                    continue
+                if field == "desktop":
+                    matched = value_of(field=field) == pattern
+                else:
+                    matched = pattern in hits_of(field=field)
+                if not matched:
+                    break
+            if matched:
+                yield rule.callback
@@ -0,0 +1,121 @@
+import logging
+import os
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import ev
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+
+def returncode(status: int) -> int:
+    """Decodes a wait status like `subprocess`, a negative number is the signal that killed the process"""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+    return status
+
+
+class Process(object):
+    """
+    Child process started with `posix_spawnp` by `WM.spawn`, the loop reaps it with an
+    `ev.ChildWatcher` and reads its captured stdout/stderr with `ev.IOWatcher` so nothing blocks.
+
+    `on_exit` is called with the process once it has exited and the captured output was read,
+    `returncode`, `stdout` and `stderr` are set by then (`stdout`/`stderr` are `None` without `capture`).
+    If the process can't be started the error is logged, `pid` is `None` and `returncode` is 127 (like
+    `aio.Process`), `on_exit` is still called from the loop.
+    """
+
+    def __init__(
+        self, loop: ev.Loop, argv: Sequence[str], on_exit: Callable[["Process"], Any], capture: bool = False
+    ) -> None:
+        self._loop: ev.Loop = loop
+        self._on_exit: Callable[[Process], Any] = on_exit
+        self.argv: List[str] = list(argv)
+        self.pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.stdout: Optional[bytes] = None
+        self.stderr: Optional[bytes] = None
+
+        # Watchers of the pipes still open and chunks read from every pipe, keyed by read end
+        self._pipes: Dict[int, ev.IOWatcher] = {}
+        self._output: Dict[int, List[bytes]] = {}
+
+        pipes: List[Tuple[int, int]] = []
+        file_actions: List[Tuple[Any, ...]] = []
+        if capture:
+            for target in (1, 2):
+                read_end, write_end = os.pipe()  # Not inherited, only the duplicated descriptor is
+                pipes.append((read_end, write_end))
+                file_actions.append((os.POSIX_SPAWN_DUP2, write_end, target))
+
+        try:
+            pid: int = os.posix_spawnp(self.argv[0], self.argv, os.environ, file_actions=file_actions)
+        except Exception as e:
+            logger.exception(msg=e)
+            for read_end, _ in pipes:
+                os.close(read_end)
+            self.returncode = 127
+            # `on_exit` isn't called before the caller gets the process
+            self._failure_watcher: ev.TimerWatcher = ev.TimerWatcher(callback=self._failure_cb, after=0.0)
+            self._failure_watcher.start(loop=self._loop)
+            return
+        finally:
+            for _, write_end in pipes:
+                os.close(write_end)
+
+        self.pid = pid
+        self._child_watcher: ev.ChildWatcher = ev.ChildWatcher(callback=self._child_cb, pid=pid)
+        self._child_watcher.start(loop=self._loop)
+
+        for read_end, _ in pipes:
+            os.set_blocking(read_end, False)
+            watcher: ev.IOWatcher = ev.IOWatcher(
+                callback=partial(self._read_cb, read_end), file_descriptor=read_end, flags=ev.lib.EV_READ
+            )
+            watcher.start(loop=self._loop)
+            self._pipes[read_end] = watcher
+            self._output[read_end] = []
+
+    @property
+    def running(self) -> bool:
+        return self.returncode is None
+
+    def send_signal(self, signum: int) -> None:
+        if self.running and self.pid is not None:
+            os.kill(self.pid, signum)
+
+    def _failure_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        self._finish()
+
+    def _child_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        self._child_watcher.stop(loop=self._loop)
+        self.returncode = returncode(status=self._child_watcher.status)
+        self._finish()
+
+    def _read_cb(self, file_descriptor: int, loop: Any, watcher: Any, events: int) -> None:
+        try:
+            data: bytes = os.read(file_descriptor, 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+
+        if data:
+            self._output[file_descriptor].append(data)
+            return
+
+        # End of file, the process closed its side of the pipe
+        self._pipes.pop(file_descriptor).stop(loop=self._loop)
+        os.close(file_descriptor)
+        self._finish()
+
+    def _finish(self) -> None:
+        if self.returncode is None or self._pipes:
+            return
+        if self._output:
+            self.stdout, self.stderr = (b"".join(chunks) for chunks in self._output.values())
+            self._output.clear()
+        self._on_exit(self)
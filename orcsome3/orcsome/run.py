@@ -1,13 +1,14 @@
+import asyncio
 import logging
 import os
 import signal
 import sys
 from argparse import ArgumentParser, Namespace
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 from ..version import VERSION
-from . import ev, update_wm
+from . import aio, ev, update_wm
 from .wm import WM
 
 logger: logging.Logger = logging.getLogger(name=__name__)
@@ -52,6 +53,27 @@ def run() -> None:
     parser.add_argument("--version", action="version", version="%(prog)s " + VERSION)
     parser.add_argument("-l", "--log", dest="log", metavar="FILE", help="Path to log file (log to stdout by default)")
     parser.add_argument("--log-level", metavar="LOGLEVEL", default="INFO", help="log level, default is INFO")
+    parser.add_argument(
+        "--loop-backend",
+        dest="loop_backend",
+        choices=list(ev.BACKENDS.keys()) + ["asyncio"],
+        default="auto",
+        help="libev backend used by the event loop, or asyncio to run on an asyncio loop (%(default)s)",
+    )
+    parser.add_argument(
+        "--timer-slack",
+        dest="timer_slack",
+        metavar="SECONDS",
+        type=float,
+        default=0.01,
+        help="Timers expiring within this interval are fired together (%(default)s)",
+    )
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        action="store_true",
+        help="Record event loop stats, they are written to the log on SIGUSR1",
+    )
 
     config_dir: str = os.getenv(key="XDG_CONFIG_HOME", default=str(Path("~/.config").expanduser()))
     default_rcfile: str = str(Path(config_dir).joinpath("orcsome3", "rc.py"))
@@ -80,15 +102,30 @@ def run() -> None:
         logger.info(msg="There is no config file available, exiting...")
         return
 
-    loop: ev.Loop = ev.Loop()
-    wm: WM = WM(loop=loop)
+    wm: WM
+    run_loop: Callable[[], Any]
+    break_loop: Callable[[], Any]
+    if args.loop_backend == "asyncio":
+        aio_loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        wm = aio.AsyncioWM(loop=aio_loop, timer_slack=args.timer_slack)
+        run_loop, break_loop = aio_loop.run_forever, aio_loop.stop
+        logger.info(msg="Using asyncio loop")
+    else:
+        try:
+            loop: ev.Loop = ev.Loop(backend=args.loop_backend)
+        except ValueError as e:
+            logger.error(msg=f"{e}, supported backends: {', '.join(ev.supported_backends())}")
+            return
+        wm = WM(loop=loop, timer_slack=args.timer_slack)
+        run_loop, break_loop = loop.run, loop.break_
+        logger.info(msg=f"Using {loop.backend} loop backend")
 
     def stop(loop_: Any, watcher: Any, events: int) -> None:
         wm.stop(is_exit=True)
-        loop.break_()
+        break_loop()
 
-    signal_watcher = ev.SignalWatcher(callback=stop, signum=signal.SIGINT)
-    signal_watcher.start(loop=loop)
+    signal_watcher = wm._new_signal_watcher(callback=stop, signum=signal.SIGINT)
+    signal_watcher.start(loop=wm._loop)
 
     def on_restart() -> None:
         wm.stop()
@@ -99,6 +136,9 @@ def run() -> None:
 
     wm._restart_handler = on_restart
 
+    if args.stats:
+        wm.enable_stats()
+
     load_config(wm=wm, config=Path(args.config))
     wm.init()
-    loop.run()
+    run_loop()
@@ -0,0 +1,119 @@
+import time
+from collections import deque
+from functools import partial
+from typing import Any, Callable, Deque, Dict, List
+
+from . import xlib
+
+# Number of measures kept by every histogram to compute the percentiles
+SAMPLES: int = 1024
+
+
+class Histogram(object):
+    """Latency histogram (in seconds) over the last `SAMPLES` measures, `max` and `count` cover every measure"""
+
+    def __init__(self, size: int = SAMPLES) -> None:
+        self._samples: Deque[float] = deque(maxlen=size)
+        self.count: int = 0
+        self.max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent: float) -> float:
+        if not self._samples:
+            return 0.0
+        samples: List[float] = sorted(self._samples)
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def summary(self) -> Dict[str, float]:
+        return {"p50": self.percentile(percent=50), "p99": self.percentile(percent=99), "max": self.max}
+
+
+class HandlerStats(object):
+    __slots__ = ("calls", "wall", "cpu")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.wall: Histogram = Histogram()
+        self.cpu: Histogram = Histogram()
+
+
+class Stats(object):
+    """
+    Event loop statistics: calls and wall/cpu latency per handler, dispatched X events per type,
+    duration of every drain of the X event queue and how often the event budget cut it short
+    """
+
+    def __init__(self) -> None:
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.events: Dict[int, int] = {}
+        self.iterations: Histogram = Histogram()
+        self.event_budget: int = 0
+        self.budget_yields: int = 0
+        # Counters of other components (caches...) included in the summary under their name
+        self.sources: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+    def call(self, kind: str, handler: Callable[[], Any]) -> Any:
+        wall: float = time.perf_counter()
+        cpu: float = time.process_time()
+        try:
+            return handler()
+        finally:
+            function: Any = handler.func if isinstance(handler, partial) else handler
+            name: str = f"{kind}:{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', function)}"
+            try:
+                handler_stats = self.handlers[name]
+            except KeyError:
+                handler_stats = self.handlers[name] = HandlerStats()
+            handler_stats.calls += 1
+            handler_stats.wall.add(value=time.perf_counter() - wall)
+            handler_stats.cpu.add(value=time.process_time() - cpu)
+
+    def count_event(self, type: int) -> None:
+        self.events[type] = self.events.get(type, 0) + 1
+
+    def add_iteration(self, duration: float) -> None:
+        self.iterations.add(value=duration)
+
+    def summary(self) -> Dict[str, Any]:
+        events: Dict[str, int] = {}
+        for type, count in self.events.items():
+            try:
+                events[xlib.XEvent_.Type(type).name] = count
+            except ValueError:
+                events[str(type)] = count
+
+        summary: Dict[str, Any] = {
+            "handlers": {
+                name: {"calls": stats.calls, "wall": stats.wall.summary(), "cpu": stats.cpu.summary()}
+                for name, stats in self.handlers.items()
+            },
+            "events": events,
+            "iterations": dict(count=self.iterations.count, **self.iterations.summary()),
+            "budget": {"limit": self.event_budget, "yields": self.budget_yields},
+        }
+        for name, source in self.sources.items():
+            summary[name] = source()
+        return summary
+
+    def format(self) -> str:
+        """Returns the summary as a human readable text (times in milliseconds)"""
+
+        def ms(histogram: Dict[str, float]) -> str:
+            return " ".join(f"{key}={value * 1000:.3f}" for key, value in histogram.items())
+
+        summary: Dict[str, Any] = self.summary()
+        lines: List[str] = ["Event loop stats:"]
+        iterations: Dict[str, Any] = summary["iterations"]
+        lines.append(f"  iterations: {iterations.pop('count')} {ms(histogram=iterations)}")
+        lines.append(f"  budget: limit={summary['budget']['limit']} yields={summary['budget']['yields']}")
+        lines.append(f"  events: {' '.join(f'{name}={count}' for name, count in summary['events'].items())}")
+        for source in self.sources:
+            lines.append(f"  {source}: {' '.join(f'{name}={count}' for name, count in summary[source].items())}")
+        for name, handler in sorted(summary["handlers"].items(), key=lambda item: -item[1]["wall"]["max"]):
+            lines.append(f"  {name}: calls={handler['calls']} wall[{ms(handler['wall'])}] cpu[{ms(handler['cpu'])}]")
+        return "\n".join(lines)
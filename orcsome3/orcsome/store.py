@@ -0,0 +1,78 @@
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from . import xlib
+
+T = TypeVar("T")
+
+# Returned by `PropertyStore.lookup` when the value is not stored, None is a valid value (missing property)
+MISSING: Any = object()
+
+
+class PropertyStore(object):
+    """
+    Property values shared by every `wrappers.Window` of the same window id.
+
+    Only the properties of tracked windows are kept: orcsome selects `PropertyChangeMask` on them
+    so every change is reported by a PropertyNotify event, which invalidates the value. Properties
+    of other windows are read from the server every time.
+
+    Values are keyed by window and atom, `variant` tells apart reads of the same property decoded
+    in different ways (type and split flag).
+    """
+
+    def __init__(self) -> None:
+        self._windows: Dict[xlib.Window, Dict[xlib.Atom, Dict[Hashable, Any]]] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def track(self, window: xlib.Window) -> None:
+        self._windows.setdefault(window, {})
+
+    def tracked(self, window: xlib.Window) -> bool:
+        return window in self._windows
+
+    def get(self, window: xlib.Window, atom: xlib.Atom, fetch: Callable[[], T], variant: Hashable = None) -> T:
+        """Returns the stored value or the one returned by `fetch`, which is stored if the window is tracked"""
+        properties: Optional[Dict[xlib.Atom, Dict[Hashable, Any]]] = self._windows.get(window)
+        if properties is None:
+            self.misses += 1
+            return fetch()
+
+        variants: Optional[Dict[Hashable, Any]] = properties.get(atom)
+        if variants is not None and variant in variants:
+            self.hits += 1
+            return variants[variant]
+
+        self.misses += 1
+        value: T = fetch()
+        properties.setdefault(atom, {})[variant] = value
+        return value
+
+    def lookup(self, window: xlib.Window, atom: xlib.Atom, variant: Hashable = None) -> Any:
+        """Returns the stored value or `MISSING`"""
+        properties: Optional[Dict[xlib.Atom, Dict[Hashable, Any]]] = self._windows.get(window)
+        if properties is not None:
+            variants: Optional[Dict[Hashable, Any]] = properties.get(atom)
+            if variants is not None and variant in variants:
+                self.hits += 1
+                return variants[variant]
+        return MISSING
+
+    def put(self, window: xlib.Window, atom: xlib.Atom, value: Any, variant: Hashable = None) -> None:
+        properties: Optional[Dict[xlib.Atom, Dict[Hashable, Any]]] = self._windows.get(window)
+        if properties is not None:
+            properties.setdefault(atom, {})[variant] = value
+
+    def invalidate(self, window: xlib.Window, atom: xlib.Atom) -> None:
+        properties: Optional[Dict[xlib.Atom, Dict[Hashable, Any]]] = self._windows.get(window)
+        if properties is not None:
+            properties.pop(atom, None)
+
+    def forget(self, window: xlib.Window) -> None:
+        self._windows.pop(window, None)
+
+    def clear(self) -> None:
+        self._windows.clear()
+
+    def counters(self) -> Dict[str, int]:
+        return {"windows": len(self._windows), "hits": self.hits, "misses": self.misses}
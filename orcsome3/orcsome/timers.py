@@ -0,0 +1,166 @@
+import heapq
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from . import ev
+
+logger: logging.Logger = logging.getLogger(name=__name__)
+
+
+class Timer(object):
+    """
+    Timer scheduled by a `TimerWheel`, `callback` is called without arguments every time the timer
+    expires. Deadlines are taken from `time.monotonic`, wall clock changes don't move them.
+    """
+
+    __slots__ = ("_wheel", "_callback", "_tick", "after", "repeat", "next_stop")
+
+    def __init__(self, wheel: "TimerWheel", callback: Callable[[], Any], after: float, repeat: float = 0.0) -> None:
+        self._wheel: TimerWheel = wheel
+        self._callback: Callable[[], Any] = callback
+        self._tick: Optional[int] = None  # Slot of the wheel the timer is in, None if the timer is stopped
+        self.after: float = after
+        self.repeat: float = repeat
+        self.next_stop: float = 0.0  # Deadline of the timer
+
+    @property
+    def active(self) -> bool:
+        return self._tick is not None
+
+    def start(self, after: Optional[float] = None, repeat: Optional[float] = None) -> None:
+        if after is not None:
+            self.after = after
+        if repeat is not None:
+            self.repeat = repeat
+        self._wheel.remove(timer=self)
+        self._wheel.add(timer=self, delay=self.after)
+
+    def stop(self) -> None:
+        self._wheel.remove(timer=self)
+
+    def again(self) -> None:
+        """Restarts the timer with the `repeat` delay, stops it if `repeat` is 0"""
+        self._wheel.remove(timer=self)
+        if self.repeat:
+            self._wheel.add(timer=self, delay=self.repeat)
+
+    def remaining(self) -> float:
+        if not self.active:
+            return 0.0
+        return max(0.0, self.next_stop - self._wheel.now())
+
+    def overdue(self, timeout: float) -> bool:
+        return self._wheel.now() > self.next_stop + timeout
+
+    def _expire(self) -> None:
+        if self.repeat:
+            # From the previous deadline like a libev repeat timer, so the period doesn't drift with the wakeups
+            self._wheel.add_at(timer=self, deadline=max(self.next_stop + self.repeat, self._wheel.now()))
+        self._callback()
+
+
+class TimerWheel(object):
+    """
+    Schedules any number of `Timer` on a single libev timer.
+
+    Deadlines are rounded up to multiples of `slack` seconds and every timer falling in the same
+    slot expires on the same wakeup. Starting or stopping a timer in an existing slot is O(1),
+    a heap is only updated when a slot is created. The heap is compacted when the slots removed
+    before their deadline outnumber the live ones.
+    """
+
+    def __init__(self, loop: ev.Loop, slack: float = 0.01) -> None:
+        if slack <= 0:
+            raise ValueError("Timer slack must be greater than 0")
+        self._loop: ev.Loop = loop
+        self.slack: float = slack
+        self._slots: Dict[int, Dict[Timer, None]] = {}  # Ordered sets of timers per slot
+        self._ticks: List[int] = []  # Heap of slots, slots removed in the meantime are skipped when popped
+        self._armed: Optional[int] = None  # Slot the libev timer is waiting for
+        self._expiring: Optional[int] = None  # Slot being expired, new timers go to later slots
+        self._watcher: ev.TimerWatcher = ev.TimerWatcher(callback=self._expire_cb, after=0.0)
+
+    def now(self) -> float:
+        # `ev_now` follows the wall clock, the deadlines are turned into libev delays by `_arm`
+        return time.monotonic()
+
+    def timer(self, callback: Callable[[], Any], after: float, repeat: float = 0.0) -> Timer:
+        """Returns a new stopped timer"""
+        return Timer(wheel=self, callback=callback, after=after, repeat=repeat)
+
+    def add(self, timer: Timer, delay: float) -> None:
+        self.add_at(timer=timer, deadline=self.now() + delay)
+
+    def add_at(self, timer: Timer, deadline: float) -> None:
+        timer.next_stop = deadline
+        tick: int = math.ceil(timer.next_stop / self.slack)
+        if self._expiring is not None and tick <= self._expiring:
+            tick = self._expiring + 1
+
+        slot: Optional[Dict[Timer, None]] = self._slots.get(tick)
+        if slot is None:
+            slot = self._slots[tick] = {}
+            heapq.heappush(self._ticks, tick)
+            if self._expiring is None and (self._armed is None or tick < self._armed):
+                self._arm(tick=tick)
+        slot[timer] = None
+        timer._tick = tick
+
+    def remove(self, timer: Timer) -> None:
+        if timer._tick is None:
+            return
+        tick: int = timer._tick
+        timer._tick = None
+        slot: Optional[Dict[Timer, None]] = self._slots.get(tick)
+        if slot is None:
+            return
+        slot.pop(timer, None)
+        if slot:
+            return
+        del self._slots[tick]
+        if len(self._ticks) > 2 * len(self._slots):
+            # A sorted list is a heap, every live slot keeps a single entry
+            self._ticks[:] = sorted(set(tick_ for tick_ in self._ticks if tick_ in self._slots))
+        if tick == self._armed and self._expiring is None:
+            self._arm_next()
+
+    def _arm_next(self) -> None:
+        """Arms the libev timer for the first live slot, stops it if there's none"""
+        while self._ticks and self._ticks[0] not in self._slots:
+            heapq.heappop(self._ticks)
+        if self._ticks:
+            self._arm(tick=self._ticks[0])
+        else:
+            self._armed = None
+            self._watcher.stop(loop=self._loop)
+
+    def _arm(self, tick: int) -> None:
+        self._armed = tick
+        self._watcher.stop(loop=self._loop)
+        self._watcher.set(after=max(0.0, tick * self.slack - self.now()))
+        self._watcher.start(loop=self._loop)
+
+    def _expire_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        self._armed = None
+        # Half a slot of margin for the rounding of the deadlines
+        limit: float = self.now() + self.slack / 2
+        try:
+            while self._ticks and self._ticks[0] * self.slack <= limit:
+                tick: int = heapq.heappop(self._ticks)
+                slot: Optional[Dict[Timer, None]] = self._slots.pop(tick, None)
+                if not slot:
+                    continue
+                self._expiring = tick
+                for timer in list(slot):
+                    if timer._tick != tick:  # Stopped or restarted by a previous callback
+                        continue
+                    timer._tick = None
+                    try:
+                        timer._expire()
+                    except Exception as e:
+                        logger.exception(msg=e)
+        finally:
+            self._expiring = None
+            self._arm_next()
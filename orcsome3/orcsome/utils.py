@@ -1,16 +1,38 @@
 import re
 import subprocess
-from typing import Dict, List, Pattern, Tuple
+from functools import lru_cache
+from typing import Callable, List, Pattern, Tuple
 
-_re_cache: Dict[str, Pattern[str]] = {}
+# Number of compiled patterns kept by `compile_matcher`
+MATCHER_CACHE_SIZE: int = 512
 
+_METACHARACTERS: Pattern[str] = re.compile(r"[.^$*+?{}\[\]\\|()]")
 
-def match_string(pattern: str, data: str) -> bool:
-    if not pattern in _re_cache.keys():
-        _re_cache[pattern] = re.compile(pattern=pattern)
-    pattern_ = _re_cache[pattern]
 
-    return bool(re.search(pattern=pattern_, string=data))
+@lru_cache(maxsize=MATCHER_CACHE_SIZE)
+def compile_matcher(pattern: str) -> Callable[[str], bool]:
+    """
+    Returns a function telling if `pattern` is found in a string, like `re.search`. Literal patterns,
+    optionally anchored with ``^`` and/or ``$``, are checked with string methods instead of a regex
+    """
+    anchored_start: bool = pattern.startswith("^")
+    anchored_end: bool = pattern.endswith("$")
+    text: str = pattern[int(anchored_start) : len(pattern) - int(anchored_end)]
+    if _METACHARACTERS.search(text):
+        return re.compile(pattern=pattern).search  # type: ignore[return-value]
+
+    # `$` also matches before a newline at the end of the string
+    if anchored_start and anchored_end:
+        return lambda data: data == text or data == text + "\n"
+    if anchored_start:
+        return lambda data: data.startswith(text)
+    if anchored_end:
+        return lambda data: data.endswith(text) or data.endswith(text + "\n")
+    return lambda data: text in data
+
+
+def match_string(pattern: str, data: str) -> bool:
+    return bool(compile_matcher(pattern=pattern)(data))
 
 
 def get_compiler_args(*libraries: str) -> Tuple[List[str], List[str]]:
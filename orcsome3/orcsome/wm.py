@@ -1,13 +1,21 @@
+import inspect
+import itertools
 import logging
+import re
+import signal
+import time
 from abc import ABC, abstractmethod
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Any, Callable, Coroutine, Deque, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union, cast
 
-from . import ev, wrappers, xlib
-from .aliases import KEYS as KEY_ALIASES
+from . import clients, ev, history, keymap, matchers, process, stats, store, timers, wrappers, xlib
 
 logger: logging.Logger = logging.getLogger(name=__name__)
 ignore_logger: bool = False
+# Errors of the requests up to this serial number aren't logged, they may be read after `ignore_logger` is reset
+ignored_errors_serial: int = 0
 
 MODIFICATORS: Dict[str, int] = {
     "Alt": xlib.MASKS.Mod1Mask.value,
@@ -20,13 +28,26 @@ MODIFICATORS: Dict[str, int] = {
     "Super": xlib.MASKS.Mod4Mask.value,
 }
 
-IGNORED_MOD_MASKS: Tuple[int, int, int, int] = (
-    0,
-    int(xlib.MASKS.LockMask.value),
-    int(xlib.MASKS.Mod2Mask.value),
-    int(xlib.MASKS.LockMask.value | xlib.MASKS.Mod2Mask.value),
+# Properties of the root window read by `WM.init`, they are kept in the property store afterwards
+ROOT_PROPERTIES: Tuple[str, ...] = (
+    "_NET_CURRENT_DESKTOP",
+    "_NET_NUMBER_OF_DESKTOPS",
+    "_NET_ACTIVE_WINDOW",
+    "_NET_WORKAREA",
+    "_NET_SUPPORTING_WM_CHECK",
 )
 
+# Number of `Window` objects kept for the windows orcsome doesn't listen to
+WINDOW_CACHE_SIZE: int = 256
+
+# Handlers per window (None for every window) keyed by their registration handle, removing one costs O(1)
+WindowHandlers = Dict[Optional[xlib.Window], Dict[int, Callable[[], None]]]
+
+# Property name, atom, store variant, type atom and decoder of a property read by `WM.fetch_properties`
+PropertySpec = Tuple[str, xlib.Atom, Tuple[Optional[str], bool], xlib.Atom, Optional[xlib.PropertyDecoder]]
+
+IGNORED_MOD_MASKS: Tuple[int, int, int, int] = keymap.IGNORED_MOD_MASKS
+
 
 class RestartException(Exception):
     # Exception raised by method `wm.actions.restart()`
@@ -79,37 +100,58 @@ class WM:
         wm: WM = get_wm()
     """
 
-    def __init__(self, loop: ev.Loop) -> None:
-        self._handlers: Dict[int, Callable[[xlib.XEvent], None]] = {
-            xlib.EVENTS.KeyPress.value: self._handle_keypress,
-            xlib.EVENTS.KeyRelease.value: self._handle_keyrelease,
-            xlib.EVENTS.CreateNotify.value: self._handle_create,
-            xlib.EVENTS.DestroyNotify.value: self._handle_destroy,
-            xlib.EVENTS.FocusIn.value: self._handle_focus,
-            xlib.EVENTS.FocusOut.value: self._handle_focus,
-            xlib.EVENTS.PropertyNotify.value: self._handle_property,
-        }
+    def __init__(self, loop: ev.Loop, timer_slack: float = 0.01) -> None:
         # This is filled every time a new event comes by the function `_xevent_cb`
         self._native_event: Any = xlib.ffi.new("XEvent *")
 
-        # Event associated with the callback
-        self._event: Optional[
-            Union[xlib.XKeyEvent, xlib.XCreateWindowEvent, xlib.XDestroyWindowEvent, xlib.XPropertyEvent]
-        ] = None
+        # Handlers receive a view over `_native_event`, the views are created once and reused for every event
+        key_view: xlib.XKeyEventView = xlib.XKeyEventView(event=self._native_event)
+        focus_view: xlib.XFocusChangeEventView = xlib.XFocusChangeEventView(event=self._native_event)
+        self._handlers: Dict[int, Tuple[Callable[[Any], None], xlib.XEventView]] = {
+            xlib.EVENTS.KeyPress.value: (self._handle_keypress, key_view),
+            xlib.EVENTS.KeyRelease.value: (self._handle_keyrelease, key_view),
+            xlib.EVENTS.CreateNotify.value: (
+                self._handle_create,
+                xlib.XCreateWindowEventView(event=self._native_event),
+            ),
+            xlib.EVENTS.DestroyNotify.value: (
+                self._handle_destroy,
+                xlib.XDestroyWindowEventView(event=self._native_event),
+            ),
+            xlib.EVENTS.FocusIn.value: (self._handle_focus, focus_view),
+            xlib.EVENTS.FocusOut.value: (self._handle_focus, focus_view),
+            xlib.EVENTS.PropertyNotify.value: (
+                self._handle_property,
+                xlib.XPropertyEventView(event=self._native_event),
+            ),
+            xlib.EVENTS.MappingNotify.value: (
+                self._handle_mapping,
+                xlib.XMappingEventView(event=self._native_event),
+            ),
+        }
+
+        # Event associated with the callback, detached from `_native_event` and only materialized by `event`
+        self._event: Optional[xlib.XEventView] = None
         self._event_window: Optional[wrappers.Window] = None
 
         # Handlers
-        self._key_handlers: Dict[xlib.Window, Dict[Tuple[int, int], Callable[[], None]]] = {}
-        self._property_handlers: Dict[xlib.Atom, Dict[Optional[xlib.Window], List[Callable[[], None]]]] = {}
-        self._create_handlers: List[Callable[[], None]] = []
-        self._destroy_handlers: Dict[Optional[xlib.Window], List[Callable[[], None]]] = {}
+        self._property_handlers: Dict[xlib.Atom, WindowHandlers] = {}
+        self._coalesced_property_handlers: Dict[xlib.Atom, WindowHandlers] = {}
+        self._create_index: matchers.MatcherIndex = matchers.MatcherIndex()  # on_create/on_manage handlers
+        self._destroy_handlers: WindowHandlers = {}
         self._init_handlers: List[Callable[[], None]] = []
         self._deinit_handlers: List[Callable[[], None]] = []
-        self._timer_handlers: List[Callable[[], None]] = []
+        self._timer_handlers: Dict[int, Callable[[], None]] = {}
         self._restart_handler: Optional[Callable[[], None]] = None
+        self._handles: Iterator[int] = itertools.count()
+        # Removal functions of the registrations tied to a window, run when it's destroyed
+        self._window_cleanups: Dict[xlib.Window, Dict[int, Callable[[], None]]] = {}
 
         # History
-        self.focus_history: List[xlib.Window] = []
+        self.focus_history: history.FocusHistory = history.FocusHistory()
+
+        # Latest PropertyNotify per (window, atom) waiting for the end of the current `_xevent_cb` drain
+        self._pending_properties: Dict[Tuple[xlib.Window, xlib.Atom], xlib.XPropertyEventView] = {}
 
         # Auxiliar vars to avoid callbacks being called twice
         self._recently_destroyed_window: Optional[xlib.Window] = None
@@ -121,31 +163,137 @@ class WM:
 
         self.root: xlib.Window = xlib.lib.DefaultRootWindow(self.dpy)  # Root window
         self.atom: xlib.AtomCache = xlib.AtomCache(dpy=self.dpy)
+        # Properties of the windows orcsome listens to, kept up to date by the PropertyNotify events
+        self.store: store.PropertyStore = store.PropertyStore()
+        # Canonical `Window` per window id: the windows orcsome listens to until they're destroyed and the
+        # last `WINDOW_CACHE_SIZE` other windows (int subclasses can't be referenced weakly)
+        self._windows: Dict[int, wrappers.Window] = {}
+        self._recent_windows: "OrderedDict[int, wrappers.Window]" = OrderedDict()
+
+        # Key bindings resolved with the keyboard mapping kept in memory, grabbed in batches by `_sync_keys`
+        self._keys: keymap.KeyBindings = keymap.KeyBindings(keymap=keymap.Keymap(display=self.dpy))
+        self._key_sync_pending: bool = False
+        # Seconds to press the next key of a key sequence
+        self.key_sequence_timeout: float = 2.0
+        # Window, bindings that can follow and keys grabbed for them while a key sequence is being typed
+        self._key_sequence: Optional[Tuple[xlib.Window, Dict[keymap.Key, keymap.Binding], List[keymap.Key]]] = None
+        self._key_sequence_timer: Optional[timers.Timer] = None
+
+        # Client lists of the root window, kept up to date by its PropertyNotify events
+        self._client_list: clients.ClientList = clients.ClientList()
+        self._desktop_rings: clients.DesktopRings = clients.DesktopRings()
+        self._clients_changed_handlers: List[Callable[[List[wrappers.Window], List[wrappers.Window]], None]] = []
+        # Functions called on the PropertyNotify events of the root window per atom, set by `init`
+        self._root_property_hooks: Dict[xlib.Atom, Callable[[], None]] = {}
+        # Reads of the root window state (and the name of the wm) served from memory and from the server
+        self._root_state_counters: Dict[str, int] = {"saved": 0, "round_trips": 0}
+
+        # Work postponed by `defer` (run before the loop blocks again) and `on_idle` (run when the loop is idle)
+        self._deferred: Deque[Callable[[], Any]] = deque()
+        self._idle: Deque[Callable[[], Any]] = deque()
+
+        # Thread pool of `run_in_executor`, created on first use, and the results waiting for the loop thread
+        self.executor_workers: int = 4
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_results: Deque[Tuple[Future, Optional[Callable[[Any], Any]]]] = deque()
+
+        # Processes started by `spawn` that haven't exited yet, their watchers must be kept alive
+        self._processes: Set[Any] = set()
 
         self._loop: ev.Loop = loop
-        self._xevent_watcher: ev.IOWatcher = ev.IOWatcher(
-            callback=self._xevent_cb, file_descriptor=xlib.lib.ConnectionNumber(self.dpy), flags=ev.lib.EV_READ
-        )
-        self._xevent_watcher.start(loop=self._loop)
+        self._init_loop(timer_slack=timer_slack)
 
         self.track_kbd_layout: bool = False
         self._startup: bool = False
 
+        # Properties read with the matcher properties of a new window before its on_create/on_manage handlers run
+        self.prefetch_hints: Set[str] = set()
+
+        # Maximum number of X events processed before yielding back to the loop, 0 means no limit
+        self._event_budget: int = 128
+
+        # Event loop stats, `None` unless enabled by `enable_stats`
+        self._stats: Optional[stats.Stats] = None
+        self._stats_watcher: Optional[ev.SignalWatcher] = None
+
         from . import actions
 
         self.actions: Actions = actions.Actions(window_manager=self)
 
+    def _init_loop(self, timer_slack: float) -> None:
+        """Creates the watchers used by orcsome on the event loop, `aio.AsyncioWM` replaces them"""
+        self._xevent_watcher: ev.IOWatcher = ev.IOWatcher(
+            callback=self._xevent_cb, file_descriptor=xlib.lib.ConnectionNumber(self.dpy), flags=ev.lib.EV_READ
+        )
+        self._xevent_watcher.start(loop=self._loop)
+        # Resumes the processing of the X events after the event budget was exhausted, as an idle
+        # watcher it only runs once the timers and signals that became pending were handled
+        self._xevent_resume_watcher: ev.IdleWatcher = ev.IdleWatcher(callback=self._xevent_cb)
+
+        # Every timer created by `on_timer` shares a single libev timer, timers expiring within
+        # `timer_slack` seconds of each other are fired on the same wakeup
+        self._timers: timers.TimerWheel = timers.TimerWheel(loop=self._loop, slack=timer_slack)
+
+        self._deferred_watcher: ev.PrepareWatcher = ev.PrepareWatcher(callback=self._deferred_cb)
+        self._idle_watcher: ev.IdleWatcher = ev.IdleWatcher(callback=self._idle_cb)
+
+        self._executor_watcher: ev.AsyncWatcher = ev.AsyncWatcher(callback=self._executor_cb)
+        self._executor_watcher.start(loop=self._loop)
+
+    def _new_timer(self, callback: Callable[[], Any], after: float, repeat: float = 0.0) -> timers.Timer:
+        return self._timers.timer(callback=callback, after=after, repeat=repeat)
+
+    def _new_signal_watcher(self, callback: Callable[..., Any], signum: int) -> ev.SignalWatcher:
+        return ev.SignalWatcher(callback=callback, signum=signum)
+
+    def _new_process(
+        self, argv: Sequence[str], on_exit: Callable[[Any], Any], capture: bool
+    ) -> process.Process:
+        return process.Process(loop=self._loop, argv=argv, on_exit=on_exit, capture=capture)
+
+    def _run_coroutine(self, coroutine: Coroutine[Any, Any, Any]) -> None:
+        logger.error(msg=f"Coroutine handlers need the asyncio loop (--loop-backend asyncio), {coroutine} ignored")
+        coroutine.close()
+
     def init(self) -> None:
-        # Report all events within the root window
-        xlib.lib.XSelectInput(self.dpy, self.root, xlib.lib.SubstructureNotifyMask)
+        # Report all events within the root window and the changes of its properties
+        xlib.lib.XSelectInput(self.dpy, self.root, xlib.lib.SubstructureNotifyMask | xlib.lib.PropertyChangeMask)
+
+        self._root_property_hooks = {
+            self.atom["_NET_CLIENT_LIST"]: self._update_client_list,
+            self.atom["_NET_CLIENT_LIST_STACKING"]: self._update_stacking,
+        }
+        self._client_list.update_clients(clients=self._read_root_windows(property="_NET_CLIENT_LIST"))
+        self._client_list.update_stacking(stacking=self._read_root_windows(property="_NET_CLIENT_LIST_STACKING"))
+        self._client_list.valid = True
+
+        # The state of the root window and the name of the wm are kept in the property store
+        self.store.track(window=self.root)
+        self.fetch_properties(windows=[self.root], properties=ROOT_PROPERTIES)
+        self.wm_name  # Starts listening to the wm check window
 
         for handler in self._init_handlers:
             handler()
 
         self._startup = True
-        for window in self.get_clients():
+        existing: List[wrappers.Window] = self.get_clients()
+        for window in existing:
+            self._watch_window(window=window)
+        # The desktops fill the rings of `next_client`, read along with the properties of the handlers
+        prefetch: List[str] = list(dict.fromkeys(["_NET_WM_DESKTOP"] + self._create_prefetch()))
+        values: Dict[xlib.Window, Dict[str, Optional[xlib.PropertyValue]]] = self.fetch_properties(
+            windows=existing, properties=prefetch
+        )
+        for window in existing:
+            self._desktop_rings.add(
+                window=window, desktop=wrappers.decode_desktop(value=values[window]["_NET_WM_DESKTOP"])
+            )
+        self._desktop_rings.valid = True
+        for window in existing:
             self._process_create_window(window=window)
 
+        # Grabs the keys bound by the config and the handlers, ungrabs the ones it no longer binds
+        self._sync_keys()
         xlib.lib.XSync(self.dpy, False)
         xlib.lib.XSetErrorHandler(xlib.lib.error_handler)
 
@@ -153,20 +301,30 @@ class WM:
         xlib.lib.MagickWandGenesis()
 
     def stop(self, is_exit: bool = False) -> None:
-        self._key_handlers.clear()
+        self._abort_key_sequence()
+        self._keys.clear()  # The keys stay grabbed, `init` ungrabs the ones no longer bound
+        self._key_sync_pending = False
         self._property_handlers.clear()
-        self._create_handlers[:] = []
+        self._coalesced_property_handlers.clear()
+        self._pending_properties.clear()
+        self.store.clear()
+        self._windows.clear()
+        self._recent_windows.clear()
+        self._deferred.clear()
+        self._idle.clear()
+        self._executor_results.clear()
+        if is_exit and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._create_index.clear()
+        self.prefetch_hints.clear()
         self._destroy_handlers.clear()
-        self.focus_history[:] = []
+        self._window_cleanups.clear()
+        self.focus_history.clear()
 
-        if not is_exit:
-            xlib.lib.XUngrabKey(self.dpy, xlib.lib.AnyKey, xlib.lib.AnyModifier, self.root)
-            for window in self.get_clients():
-                xlib.lib.XUngrabKey(self.dpy, xlib.lib.AnyKey, xlib.lib.AnyModifier, window)
-
-        for handler in self._timer_handlers:
-            getattr(handler, "stop")
-        self._timer_handlers[:] = []
+        for handler in self._timer_handlers.values():
+            getattr(handler, "stop")()
+        self._timer_handlers.clear()
 
         for handler in self._deinit_handlers:
             try:
@@ -176,23 +334,303 @@ class WM:
 
         self._init_handlers[:] = []
         self._deinit_handlers[:] = []
+        self._clients_changed_handlers[:] = []
+        self._root_property_hooks.clear()
+        self._client_list.invalidate()
+        self._desktop_rings.clear()
 
         # Ends MagickWand
         xlib.lib.MagickWandTerminus()
 
+    def enable_stats(self) -> None:
+        """
+        Starts recording event loop stats (see :meth:`stats`), they are also dumped to the log
+        whenever orcsome3 receives SIGUSR1
+        """
+        if self._stats is not None:
+            return
+        self._stats = stats.Stats()
+        self._stats.event_budget = self._event_budget
+        self._stats.sources["properties"] = self.store.counters
+        self._stats.sources["root_state"] = self._root_state_counters.copy
+        self._stats.sources["window_handlers"] = self._window_handler_counters
+
+        def dump_stats(loop: Any, watcher: Any, events: int) -> None:
+            logger.info(msg=cast(stats.Stats, self._stats).format())
+
+        self._stats_watcher = self._new_signal_watcher(callback=dump_stats, signum=signal.SIGUSR1)
+        self._stats_watcher.start(loop=self._loop)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the event loop stats recorded since :meth:`enable_stats` was called:
+
+        * ``handlers``: calls, wall and cpu time (p50/p99/max in seconds) per handler
+        * ``events``: number of dispatched X events per type
+        * ``iterations``: time spent processing every batch of X events
+        * ``budget``: the event budget and how many times it was exhausted
+
+        An empty dict is returned if the stats are not enabled
+        """
+        if self._stats is None:
+            return {}
+        return self._stats.summary()
+
+    @property
+    def event_budget(self) -> int:
+        """
+        Maximum number of X events processed in a row (128 by default), when a flood of events
+        exceeds it the loop handles the pending timers and signals before processing the rest.
+        0 disables the limit
+        """
+        return self._event_budget
+
+    @event_budget.setter
+    def event_budget(self, budget: int) -> None:
+        if budget < 0:
+            raise ValueError("The event budget can't be negative")
+        self._event_budget = budget
+        if self._stats is not None:
+            self._stats.event_budget = budget
+
+    def _call_handler(self, kind: str, handler: Callable[[], Any]) -> Any:
+        if self._stats is None:
+            result: Any = handler()
+        else:
+            result = self._stats.call(kind=kind, handler=handler)
+        if result is not None and inspect.iscoroutine(result):
+            self._run_coroutine(coroutine=result)
+            return None
+        return result
+
+    def _call_handler_safely(self, kind: str, handler: Callable[[], Any]) -> None:
+        try:
+            self._call_handler(kind=kind, handler=handler)
+        except RestartException:
+            if self._restart_handler:
+                self._restart_handler()
+        except Exception as e:
+            logger.exception(msg=e)
+
+    def defer(self, function: Callable[..., Any], *args: Any) -> None:
+        """
+        Calls ``function(*args)`` once all the events of the current loop iteration were dispatched,
+        useful to take non-urgent work out of a handler::
+
+            @wm.on_key(keydef='Mod+n')
+            def new_terminal() -> None:
+                wm.defer(subprocess.Popen, ['urxvt'])
+
+        `wm.event` and `wm.event_window` may refer to other event when the function is called,
+        the needed values must be passed as arguments. A function deferred by a deferred function
+        is called on the next iteration.
+        """
+        self._deferred.append(partial(function, *args) if args else function)
+        if not self._deferred_watcher.active:
+            self._deferred_watcher.start(loop=self._loop)
+
+    def on_idle(self, func: Callable[[], Any]) -> Callable[[], Any]:
+        """
+        Adds a function to be called once, when the event loop has no other events to process
+        and would otherwise sleep
+        """
+        self._idle.append(func)
+        if not self._idle_watcher.active:
+            self._idle_watcher.start(loop=self._loop)
+        return func
+
+    def run_in_executor(
+        self, function: Callable[..., Any], *args: Any, callback: Optional[Callable[[Any], Any]] = None
+    ) -> Future:
+        """
+        Calls ``function(*args)`` on a thread pool of ``wm.executor_workers`` threads (4 by default)
+        so blocking work (subprocesses, file or network I/O) doesn't stop the event loop.
+
+        ``callback`` is called with the result on the loop thread, so it can use the rest of the
+        wm API; exceptions raised by ``function`` are logged. Xlib must not be used by ``function``::
+
+            @wm.on_key(keydef='Mod+w')
+            def show_weather() -> None:
+                wm.run_in_executor(fetch_weather, 'London', callback=lambda text: notify('Weather', text))
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.executor_workers, thread_name_prefix="orcsome3")
+        future: Future = self._executor.submit(function, *args)
+        future.add_done_callback(partial(self._executor_done, callback))
+        return future
+
+    def spawn(
+        self,
+        argv: Sequence[str],
+        on_exit: Optional[Callable[[int, Optional[bytes], Optional[bytes]], Any]] = None,
+        capture: bool = False,
+    ) -> process.Process:
+        """
+        Starts ``argv`` without waiting for it, the process is reaped by the event loop.
+
+        ``on_exit`` is called with the return code (negative if killed by a signal) and the
+        stdout and stderr of the process, they are only captured with ``capture=True``::
+
+            @wm.on_key(keydef='Mod+Return')
+            def terminal() -> None:
+                wm.spawn(argv=['urxvt'])
+
+            @wm.on_key(keydef='Mod+b')
+            def battery() -> None:
+                wm.spawn(
+                    argv=['acpi', '-b'],
+                    capture=True,
+                    on_exit=lambda code, out, err: notify('Battery', out.decode()),
+                )
+        """
+
+        def exited(proc: Any) -> None:
+            self._processes.discard(proc)
+            if on_exit is not None:
+                self._call_handler_safely(
+                    kind="spawn", handler=partial(on_exit, proc.returncode, proc.stdout, proc.stderr)
+                )
+
+        proc: process.Process = self._new_process(argv=argv, on_exit=exited, capture=capture)
+        self._processes.add(proc)
+        return proc
+
+    def _executor_done(self, callback: Optional[Callable[[Any], Any]], future: Future) -> None:
+        # Called on the worker thread, the loop thread is woken up to call `callback`
+        self._executor_results.append((future, callback))
+        self._executor_watcher.send(loop=self._loop)
+
+    def _executor_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        while self._executor_results:
+            future, callback = self._executor_results.popleft()
+            if future.cancelled():
+                continue
+            error: Optional[BaseException] = future.exception()
+            if error is not None:
+                logger.exception(msg=error, exc_info=error)
+            elif callback is not None:
+                self._call_handler_safely(kind="executor", handler=partial(callback, future.result()))
+
+    def _deferred_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        # Only the functions queued so far, the ones they defer run on the next iteration
+        for _ in range(len(self._deferred)):
+            self._call_handler_safely(kind="defer", handler=self._deferred.popleft())
+        if not self._deferred:
+            self._deferred_watcher.stop(loop=self._loop)
+        elif not self._idle_watcher.active:
+            # The loop doesn't block while the idle watcher is active, the next iteration comes right away
+            self._idle_watcher.start(loop=self._loop)
+
+    def _idle_cb(self, loop: Any, watcher: Any, events: int) -> None:
+        # Only one function per iteration so new events don't wait for all the idle work
+        if self._idle:
+            self._call_handler_safely(kind="idle", handler=self._idle.popleft())
+        if not self._idle:
+            self._idle_watcher.stop(loop=self._loop)
+
     def create_window(self, window_id: int) -> wrappers.Window:
+        """Returns the `Window` of ``window_id``, the same object is returned as long as the window is known"""
+        window: Optional[wrappers.Window] = self._windows.get(window_id)
+        if window is not None:
+            return window
+
+        recent: "OrderedDict[int, wrappers.Window]" = self._recent_windows
+        window = recent.get(window_id)
+        if window is not None:
+            recent.move_to_end(window_id)
+            return window
+
         window = wrappers.Window(window_id)
         window.wm = self
+        recent[window_id] = window
+        if len(recent) > WINDOW_CACHE_SIZE:
+            recent.popitem(last=False)
         return window
 
+    def fetch_properties(
+        self, windows: Sequence[xlib.Window], properties: Sequence[str]
+    ) -> Dict[xlib.Window, Dict[str, Optional[xlib.PropertyValue]]]:
+        """
+        Reads ``properties`` of every window in a single round trip instead of one per property
+        and window. The values are decoded like :meth:`wrappers.Window.get_property` does, with
+        the types in ``wrappers.PROPERTIES`` (other properties are read with any type), and shared
+        with it through the property store: stored values aren't requested again and the values
+        read are stored for the tracked windows::
+
+            values = wm.fetch_properties(windows=wm.get_clients(), properties=['WM_CLASS', '_NET_WM_DESKTOP'])
+            for window, props in values.items():
+                print(window, props['WM_CLASS'], props['_NET_WM_DESKTOP'])
+        """
+        result: Dict[xlib.Window, Dict[str, Optional[xlib.PropertyValue]]] = {}
+        requests: List[xlib.PropertyRequest] = []
+        missing: List[Tuple[xlib.Window, str, xlib.Atom, Tuple[Optional[str], bool]]] = []
+        specs: List[PropertySpec] = self._property_specs(properties=properties)
+        for window in windows:
+            values: Dict[str, Optional[xlib.PropertyValue]] = result.setdefault(window, {})
+            for name, atom, variant, type_atom, decoder in specs:
+                value: Any = self.store.lookup(window=window, atom=atom, variant=variant)
+                if value is store.MISSING:
+                    requests.append((window, atom, type_atom, decoder, variant[1]))
+                    missing.append((window, name, atom, variant))
+                else:
+                    values[name] = value
+
+        if requests:
+            self.store.misses += len(requests)
+            for (window, name, atom, variant), value in zip(
+                missing, xlib.fetch_properties(display=self.dpy, requests=requests)
+            ):
+                result[window][name] = value
+                self.store.put(window=window, atom=atom, value=value, variant=variant)
+        return result
+
+    def _property_specs(self, properties: Sequence[str]) -> List[PropertySpec]:
+        specs: List[PropertySpec] = []
+        for name in properties:
+            variant: Tuple[Optional[str], bool] = wrappers.PROPERTIES.get(name, (None, False))
+            type: Optional[str] = variant[0]
+            specs.append(
+                (
+                    name,
+                    self.atom[name],
+                    variant,
+                    self.atom[type] if type else xlib.lib.AnyPropertyType,
+                    xlib.DECODERS.get(type) if type else None,
+                )
+            )
+        return specs
+
+    def _prefetch_window(self, window: wrappers.Window, properties: Sequence[str]) -> bool:
+        """
+        Stores ``properties`` of a new window like :meth:`fetch_properties`, checking in the same round
+        trip that the window still exists. Returns False if it doesn't
+        """
+        requests: List[xlib.PropertyRequest] = []
+        missing: List[Tuple[xlib.Atom, Tuple[Optional[str], bool]]] = []
+        for _, atom, variant, type_atom, decoder in self._property_specs(properties=properties):
+            if self.store.lookup(window=window, atom=atom, variant=variant) is store.MISSING:
+                requests.append((window, atom, type_atom, decoder, variant[1]))
+                missing.append((atom, variant))
+
+        values: Optional[List[Optional[xlib.PropertyValue]]] = xlib.fetch_window_properties(
+            display=self.dpy, window=window, requests=requests
+        )
+        if values is None:
+            return False
+        self.store.misses += len(requests)
+        for (atom, variant), value in zip(missing, values):
+            self.store.put(window=window, atom=atom, value=value, variant=variant)
+        return True
+
     def get_keycode_from_string(self, key: str) -> Optional[int]:
-        keysym: int = xlib.lib.XStringToKeysym(str.encode(KEY_ALIASES.get(key, key)))
-        if keysym is xlib.lib.NoSymbol:
+        keysym: Optional[int] = self._keys.keymap.keysym(name=key)
+        if keysym is None:
             return None
-        return int(xlib.lib.XKeysymToKeycode(self.dpy, keysym))
+        return self._keys.keymap.keycode(keysym=keysym)
 
-    def parse_keydef(self, keydef: str) -> Optional[List[Tuple[int, int]]]:
-        keys: List[str] = [r.strip() for r in "".join(keydef.split()).split()]
+    def _parse_keysyms(self, keydef: str) -> Optional[List[Tuple[int, int]]]:
+        """Like `parse_keydef` with keysyms instead of keycodes, they don't change with the keyboard mapping"""
+        keys: List[str] = re.sub(pattern=r"\s*\+\s*", repl="+", string=keydef.strip()).split()
         result: List[Tuple[int, int]] = []
         for k in keys:
             parts = k.split(sep="+")
@@ -204,13 +642,38 @@ class WM:
                 except KeyError:
                     return None
 
-            code = self.get_keycode_from_string(key=key)
+            keysym: Optional[int] = self._keys.keymap.keysym(name=key)
+            if keysym is None:
+                return None
+            result.append((keysym, modmask))
+
+        return result
+
+    def parse_keydef(self, keydef: str) -> Optional[List[Tuple[int, int]]]:
+        keysyms: Optional[List[Tuple[int, int]]] = self._parse_keysyms(keydef=keydef)
+        if keysyms is None:
+            return None
+        result: List[Tuple[int, int]] = []
+        for keysym, modmask in keysyms:
+            code: Optional[int] = self._keys.keymap.keycode(keysym=keysym)
             if not code:
                 return None
             result.append((code, modmask))
 
         return result
 
+    def _sync_keys(self, wait: bool = False) -> None:
+        self._key_sync_pending = False
+        grabbed, ungrabbed = self._keys.sync(display=self.dpy, wait=wait)
+        if grabbed or ungrabbed:
+            logger.info(msg=f"Keys grabbed: {grabbed}, ungrabbed: {ungrabbed}")
+
+    def _schedule_key_sync(self) -> None:
+        """The grabs are sent once the current handler (or the config) finished binding keys"""
+        if not self._key_sync_pending:
+            self._key_sync_pending = True
+            self.defer(self._sync_keys)
+
     def on_key(
         self, keydef: str, window: Optional[wrappers.Window] = None
     ) -> Callable[[Callable[[], None]], Callable[[], None]]:
@@ -224,7 +687,9 @@ class WM:
 
         Key defenition is a string in format ``[mod + ... +]keysym`` where ``mod`` is
         one of modificators [Alt, Shift, Control(Ctrl), Mod(Win)] and
-        ``keysym`` is a key name.
+        ``keysym`` is a key name. Several keys separated by spaces define a key
+        sequence, the next key must be pressed within ``wm.key_sequence_timeout``
+        seconds (2 by default).
 
         You can define global hotkeys as follows::
 
@@ -234,6 +699,10 @@ class WM:
 
             wm.on_key(keydef='Control+b')(lambda: print('hotkey Control + b pressed'))
 
+            @wm.on_key(keydef='Mod+x Mod+c')
+            def quit() -> None:
+                print('Mod + x then Mod + c pressed')
+
         Or keybinded to a specific window::
 
             @wm.on_create(cls='URxvt')
@@ -246,32 +715,34 @@ class WM:
             @wraps(function)
             def inner() -> Callable[[], None]:
                 window_ = window or self.root
-                code_mmask_list = self.parse_keydef(keydef=keydef)
-                if not code_mmask_list or not len(code_mmask_list) == 1:
+                keysym_mmask_list = self._parse_keysyms(keydef=keydef)
+                if not keysym_mmask_list:
                     logger.error(msg=f"Invalid key definition [{keydef}]")
-                else:
-                    code, modmask = code_mmask_list[0]
-                    keys: List[Tuple[int, int]] = []
-                    for imask in IGNORED_MOD_MASKS:
-                        mask = modmask | imask
-                        xlib.lib.XGrabKey(
-                            self.dpy, code, mask, window_, False, xlib.lib.GrabModeAsync, xlib.lib.GrabModeAsync
-                        )
-                        self._key_handlers.setdefault(window_, {})[(mask, code)] = function
-                        keys.append((mask, code))
-
-                    def remove() -> None:
-                        for key in keys:
-                            del self._key_handlers[window_][key]
-
-                    setattr(function, "remove", remove)
+                    return function
+                sequence: List[Tuple[int, int]] = [(modmask, keysym) for keysym, modmask in keysym_mmask_list]
+                try:
+                    resolved: bool = self._keys.add(window=window_, sequence=sequence, handler=function)
+                except ValueError as e:
+                    logger.error(msg=f"Invalid key definition [{keydef}]: {e}")
+                    return function
+                if not resolved:
+                    logger.error(msg=f"No key of the keyboard produces [{keydef}]")
+                self._schedule_key_sync()
+
+                def remove() -> None:
+                    self._keys.remove(window=window_, sequence=sequence, handler=function)
+                    self._schedule_key_sync()
+
+                setattr(function, "remove", remove)
                 return function
 
             return inner()
 
         return decorator
 
-    def on_create(self, **matchers: Any) -> Callable[[Callable[[], None]], Callable[[], None]]:
+    def on_create(
+        self, prefetch: Sequence[str] = (), **matchers: Any
+    ) -> Callable[[Callable[[], None]], Callable[[], None]]:
         """Signal decorator to handle window creation
 
         Signature of decorated function should be::
@@ -296,19 +767,30 @@ class WM:
         Also, orcsome calls on_create handlers on its startup.
         You can check ``wm.startup`` attribute to denote such event.
 
+        The properties compared by the matchers of every handler are read in a single round trip
+        before the handlers run, ``prefetch`` adds the properties the handler reads itself::
+
+           @wm.on_create(cls='mpv', prefetch=['_NET_WM_PID'])
+           def log_pid() -> None:
+               print(wm.event_window.get_property(property='_NET_WM_PID', type='CARDINAL'))
+
         See :meth:`orcsome3.orcsome.wrappers.Window.matches` for ``**matchers`` argument description.
         """
 
         def decorator(function: Callable[[], None]) -> Callable[[], None]:
             @wraps(function)
             def inner() -> Callable[[], None]:
-                return self._on_create_manage(callback=function, ignore_startup=False, **matchers)
+                return self._on_create_manage(
+                    callback=function, ignore_startup=False, prefetch=prefetch, **matchers
+                )
 
             return inner()
 
         return decorator
 
-    def on_manage(self, **matchers: Any) -> Callable[[Callable[[], None]], Callable[[], None]]:
+    def on_manage(
+        self, prefetch: Sequence[str] = (), **matchers: Any
+    ) -> Callable[[Callable[[], None]], Callable[[], None]]:
         """Signal decorator to handle window creation (ignoring orcsome's startup)
 
         Signature of decorated function should be::
@@ -334,41 +816,29 @@ class WM:
                 wm.close_window(window=wm.event_window)
                 subprocess.Popen(cmd=['firefox'])
 
+        ``prefetch`` works like in :meth:`on_create`.
+
         See :meth:`orcsome3.orcsome.wrappers.Window.matches` for ``**matchers`` argument description.
         """
 
         def decorator(function: Callable[[], None]) -> Callable[[], None]:
             @wraps(function)
             def inner() -> Callable[[], None]:
-                return self._on_create_manage(callback=function, ignore_startup=True, **matchers)
+                return self._on_create_manage(
+                    callback=function, ignore_startup=True, prefetch=prefetch, **matchers
+                )
 
             return inner()
 
         return decorator
 
     def _on_create_manage(
-        self, callback: Callable[[], None], ignore_startup: bool, **matchers: Any
+        self, callback: Callable[[], None], ignore_startup: bool, prefetch: Sequence[str], **window_matchers: Any
     ) -> Callable[[], None]:
-        if matchers:
-            old_function = callback
-
-            def new_callback() -> None:
-                if self.event_window.matches(**matchers):
-                    old_function()
-
-            callback = new_callback
-
-        if ignore_startup:
-            old_old_function = callback
-
-            def new_callback() -> None:
-                if not self._startup:
-                    old_old_function()
-
-            callback = new_callback
-
-        self._create_handlers.append(callback)
-        setattr(callback, "remove", lambda: self._create_handlers.remove(callback))
+        rule: matchers.Rule = self._create_index.add(
+            callback=callback, matchers=window_matchers, ignore_startup=ignore_startup, prefetch=prefetch
+        )
+        setattr(callback, "remove", lambda: self._create_index.remove(rule=rule))
         return callback
 
     def on_destroy(
@@ -404,12 +874,12 @@ class WM:
         def decorator(function: Callable[[], None]) -> Callable[[], None]:
             @wraps(function)
             def inner() -> Callable[[], None]:
-                self._destroy_handlers.setdefault(window, []).append(function)
+                handle: int = self._add_handler(handlers=self._destroy_handlers, window=window, handler=function)
 
                 def remove() -> None:
-                    self._destroy_handlers[window].remove(function)
+                    self._remove_handler(handlers=self._destroy_handlers, window=window, handle=handle)
 
-                setattr(function, "remove", remove)
+                setattr(function, "remove", self._tie_to_window(window=window, remove=remove))
                 return function
 
             return inner()
@@ -417,7 +887,7 @@ class WM:
         return decorator
 
     def on_property_change(
-        self, properties: List[str], window: Optional[wrappers.Window] = None
+        self, properties: List[str], window: Optional[wrappers.Window] = None, coalesce: bool = False
     ) -> Callable[[Callable[[], None]], Callable[[], None]]:
         """Signal decorator to handle window property change
 
@@ -447,19 +917,35 @@ class WM:
                             wm.actions.activate_window_desktop(window=wm.event_window)
                             getattr('property_was_set', 'remove') # removes the callback
 
+        With ``coalesce=True`` bursts of changes are collapsed: the callback is called once per
+        window and property with the latest event after all the pending X events were processed,
+        useful for properties updated very often like ``_NET_WM_NAME``::
+
+            @wm.on_property_change(properties=['_NET_WM_NAME'], coalesce=True)
+            def title_changed() -> None:
+                print(wm.event_window.title)
+
         """
 
+        registry = self._coalesced_property_handlers if coalesce else self._property_handlers
+
         def decorator(function: Callable[[], None]) -> Callable[[], None]:
             @wraps(function)
             def inner() -> Callable[[], None]:
-                for prop in properties:
-                    self._property_handlers.setdefault(self.atom[prop], {}).setdefault(window, []).append(function)
+                handles: List[Tuple[xlib.Atom, int]] = [
+                    (atom, self._add_handler(handlers=registry.setdefault(atom, {}), window=window, handler=function))
+                    for atom in (self.atom[prop] for prop in properties)
+                ]
 
                 def remove() -> None:
-                    for prop in properties:
-                        self._property_handlers[self.atom[prop]][window].remove(function)
-
-                setattr(function, "remove", remove)
+                    for atom, handle in handles:
+                        handlers: Optional[WindowHandlers] = registry.get(atom)
+                        if handlers is not None:
+                            self._remove_handler(handlers=handlers, window=window, handle=handle)
+                            if not handlers:
+                                del registry[atom]
+
+                setattr(function, "remove", self._tie_to_window(window=window, remove=remove))
                 return function
 
             return inner()
@@ -467,41 +953,117 @@ class WM:
         return decorator
 
     def on_timer(
-        self, timeout: float, start: bool = True, first_timeout: Optional[float] = None
+        self,
+        timeout: float,
+        start: bool = True,
+        first_timeout: Optional[float] = None,
+        window: Optional[wrappers.Window] = None,
     ) -> Callable[[Callable[[], None]], Callable[[], None]]:
+        """Signal decorator to call a function every ``timeout`` seconds
+
+        Signature of decorated function should be::
+
+            function_cb() -> Optional[bool]:
+                # ... function's body
+                pass
+
+        The timer stops when the function returns a true value. ``first_timeout`` is the delay
+        of the first call (``timeout`` by default), with ``start=False`` the timer is started later.
+        The decorated function gets the methods ``start()``, ``stop()``, ``again()``,
+        ``remaining()``, ``overdue(timeout)`` and ``remove()`` to control the timer::
+
+            @wm.on_timer(timeout=60)
+            def check_mail() -> None:
+                print('Checking mail')
+
+            check_mail.again() # restarts the countdown
+
+        Timers are fired together when their deadlines are within the timer slack of the loop
+        (10ms by default).
+
+        A timer tied to a ``window`` is removed when the window is destroyed::
+
+            @wm.on_manage(cls='Firefox')
+            def watch_firefox() -> None:
+                @wm.on_timer(timeout=5, window=wm.event_window)
+                def log_title() -> None:
+                    print(wm.event_window.title)
+        """
+
         def decorator(function: Callable[[], None]) -> Callable[[], None]:
             @wraps(function)
             def inner() -> Callable[[], None]:
-                def callback_of_timer(loop: Any, watcher: Any, events: int) -> None:
-                    timer.stop(loop=self._loop) if function() else timer.update_next_stop()
-
-                self._timer_handlers.append(function)
-                timer = ev.TimerWatcher(callback=callback_of_timer, after=first_timeout or timeout, repeat=timeout)
-                setattr(function, "start", lambda: timer.start(loop=self._loop))
-                setattr(function, "stop", lambda: timer.stop(loop=self._loop))
-                setattr(function, "again", lambda: timer.again(loop=self._loop))
-                setattr(function, "remaining", lambda: timer.remaining(loop=self._loop))
-                setattr(function, "overdue", lambda timeout: timer.overdue(timeout=timeout))
+                def callback_of_timer() -> None:
+                    if self._call_handler(kind="timer", handler=function):
+                        timer.stop()
+
+                handle: int = next(self._handles)
+                self._timer_handlers[handle] = function
+                timer = self._new_timer(callback=callback_of_timer, after=first_timeout or timeout, repeat=timeout)
+                setattr(function, "start", timer.start)
+                setattr(function, "stop", timer.stop)
+                setattr(function, "again", timer.again)
+                setattr(function, "remaining", timer.remaining)
+                setattr(function, "overdue", timer.overdue)
 
                 if start:
-                    getattr(function, "start")
+                    timer.start()
 
                 def remove() -> None:
-                    try:
-                        getattr(function, "stop")
-                        self._timer_handlers.remove(function)
-                    except:
-                        pass
+                    timer.stop()
+                    self._timer_handlers.pop(handle, None)
 
-                setattr(function, "remove", remove)
+                setattr(function, "remove", self._tie_to_window(window=window, remove=remove))
                 return function
 
             return inner()
 
         return decorator
 
+    def on_clients_changed(
+        self, func: Callable[[List[wrappers.Window], List[wrappers.Window]], None]
+    ) -> Callable[[List[wrappers.Window], List[wrappers.Window]], None]:
+        """
+        Adds a handler of the changes of the client list (``_NET_CLIENT_LIST``), it's called with the
+        windows added to and removed from the list::
+
+            @wm.on_clients_changed
+            def clients_changed(added: List[Window], removed: List[Window]) -> None:
+                print(f'{len(added)} new clients, {len(removed)} clients gone')
+        """
+        self._clients_changed_handlers.append(func)
+        return func
+
+    def _read_root_windows(self, property: str) -> List[int]:
+        result = xlib.get_window_property(
+            display=self.dpy, window=self.root, property=self.atom[property], type=self.atom["WINDOW"]
+        )
+        return [] if not result else cast(List[int], result)
+
+    def _update_client_list(self) -> None:
+        added, removed = self._client_list.update_clients(clients=self._read_root_windows(property="_NET_CLIENT_LIST"))
+        if not (added or removed):
+            return
+        for window in removed:
+            self._desktop_rings.discard(window=window)
+        if added:
+            for window, values in self.fetch_properties(windows=added, properties=["_NET_WM_DESKTOP"]).items():
+                self._desktop_rings.add(window=window, desktop=wrappers.decode_desktop(value=values["_NET_WM_DESKTOP"]))
+
+        if not self._clients_changed_handlers:
+            return
+        added_windows: List[wrappers.Window] = [self.create_window(window_id=window) for window in added]
+        removed_windows: List[wrappers.Window] = [self.create_window(window_id=window) for window in removed]
+        for handler in list(self._clients_changed_handlers):
+            self._call_handler(kind="clients", handler=partial(handler, added_windows, removed_windows))
+
+    def _update_stacking(self) -> None:
+        self._client_list.update_stacking(stacking=self._read_root_windows(property="_NET_CLIENT_LIST_STACKING"))
+
     def get_clients(self) -> List[wrappers.Window]:
         """Return wm client list"""
+        if self._client_list.valid:
+            return [self.create_window(window_id=window) for window in self._client_list.clients]
         result = xlib.get_window_property(
             display=self.dpy, window=self.root, property=self.atom["_NET_CLIENT_LIST"], type=self.atom["WINDOW"] or 0
         )
@@ -512,6 +1074,8 @@ class WM:
 
         Most top window will be last in list. Can be useful to determine window visibility.
         """
+        if self._client_list.valid:
+            return [self.create_window(window_id=window) for window in self._client_list.stacking]
         result = xlib.get_window_property(
             display=self.dpy,
             window=self.root,
@@ -520,12 +1084,43 @@ class WM:
         )
         return [] if not result else [self.create_window(window_id=r) for r in cast(List[int], result)]
 
+    def next_client(self, window: xlib.Window, direction: int = 1) -> Optional[wrappers.Window]:
+        """Return the client ``direction`` places after ``window`` (before it if negative) among the
+        clients of its desktop, in client list order and wrapping around.
+
+        Read from memory, None if ``window`` is not a client.
+        """
+        result: Optional[xlib.Window] = self._desktop_rings.step(window=window, direction=direction)
+        return None if result is None else self.create_window(window_id=result)
+
+    def mru(self, desktop: Optional[int] = None) -> List[wrappers.Window]:
+        """Return the windows that had the focus, most recent first, only the ones on ``desktop`` (and the
+        sticky windows) if given.
+
+        Read from memory, it makes no request to the X server::
+
+            @wm.on_key('Alt+Tab')
+            def switch() -> None:
+                windows = wm.mru(desktop=wm.current_desktop)
+                if len(windows) > 1:
+                    wm.focus_window(window=windows[1])
+        """
+        return [self.create_window(window_id=window) for window in self.focus_history.mru(desktop=desktop)]
+
+    def _get_state_property(self, window: xlib.Window, property: str) -> Optional[xlib.PropertyValue]:
+        """Reads a property of the root window (or the wm check window) through the property store"""
+        atom: xlib.Atom = self.atom[property]
+        type, split = wrappers.PROPERTIES[property]
+        if self.store.lookup(window=window, atom=atom, variant=(type, split)) is store.MISSING:
+            self._root_state_counters["round_trips"] += 1
+        else:
+            self._root_state_counters["saved"] += 1
+        return self.create_window(window_id=window).get_property(property=property, type=type, split=split)
+
     @property
     def current_window(self) -> Optional[wrappers.Window]:
         """Returns currently active (with input focus) window"""
-        result = xlib.get_window_property(
-            display=self.dpy, window=self.root, property=self.atom["_NET_ACTIVE_WINDOW"], type=self.atom["WINDOW"]
-        )
+        result = self._get_state_property(window=self.root, property="_NET_ACTIVE_WINDOW")
         return None if not result else self.create_window(window_id=cast(List[xlib.Window], result)[0])
 
     @property
@@ -534,11 +1129,15 @@ class WM:
 
         The index of the current desktop. This is always an integer between 0 and _NET_NUMBER_OF_DESKTOPS - 1
         """
-        result = xlib.get_window_property(
-            display=self.dpy, window=self.root, property=self.atom["_NET_CURRENT_DESKTOP"]
-        )
+        result = self._get_state_property(window=self.root, property="_NET_CURRENT_DESKTOP")
         return cast(List[int], result)[0]
 
+    @property
+    def number_of_desktops(self) -> int:
+        """Return the number of desktops (_NET_NUMBER_OF_DESKTOPS), 0 if the wm doesn't set it"""
+        result = self._get_state_property(window=self.root, property="_NET_NUMBER_OF_DESKTOPS")
+        return 0 if not result else cast(List[int], result)[0]
+
     @property
     def wm_name(self) -> Optional[str]:
         """
@@ -548,17 +1147,21 @@ class WM:
         If the property exists but does not contain the ID of an existing window, then a ICCCM2.0-compliant window manager exited without proper cleanup.\n
         If the property does not exist, then no ICCCM2.0-compliant window manager is running.
         """
-        result = xlib.get_window_property(
-            display=self.dpy, window=self.root, property=self.atom["_NET_SUPPORTING_WM_CHECK"], type=self.atom["WINDOW"]
-        )
+        result = self._get_state_property(window=self.root, property="_NET_SUPPORTING_WM_CHECK")
         if not result:
             return None
-        result = xlib.get_window_property(
-            display=self.dpy,
-            window=cast(List[int], result)[0],
-            property=self.atom["_NET_WM_NAME"],
-            type=self.atom["UTF8_STRING"],
-        )
+        check: xlib.Window = cast(List[int], result)[0]
+        global ignore_logger
+        if self.store.tracked(window=self.root) and not self.store.tracked(window=check):
+            # Listens to the check window too so its name is kept in the store until it's destroyed,
+            # the window may not exist if the wm exited without cleaning up
+            ignore_logger = True
+            xlib.lib.XSelectInput(self.dpy, check, xlib.lib.PropertyChangeMask | xlib.lib.StructureNotifyMask)
+            self.store.track(window=check)
+        try:
+            result = self._get_state_property(window=check, property="_NET_WM_NAME")
+        finally:
+            ignore_logger = False
         return None if not result else cast(List[str], result)[0]
 
     @property
@@ -570,7 +1173,8 @@ class WM:
     def event(self) -> Union[xlib.XKeyEvent, xlib.XCreateWindowEvent, xlib.XDestroyWindowEvent, xlib.XPropertyEvent]:
         """Returns the event associated"""
         return cast(
-            Union[xlib.XKeyEvent, xlib.XCreateWindowEvent, xlib.XDestroyWindowEvent, xlib.XPropertyEvent], self._event
+            Union[xlib.XKeyEvent, xlib.XCreateWindowEvent, xlib.XDestroyWindowEvent, xlib.XPropertyEvent],
+            self._event.materialize() if self._event is not None else None,
         )
 
     def activate_desktop(self, num: int) -> None:
@@ -606,6 +1210,15 @@ class WM:
         :param clients: window list returned by :meth:`get_clients` or :meth:`get_stacked_clients`.
         :param **matchers: keyword arguments defined in :meth:`orcsome3.orcsome.wrappers.Window.matches`
         """
+        # The properties compared by the matchers are read for every client in a single round trip
+        properties: Set[str] = {
+            wrappers.MATCHER_PROPERTIES[matcher]
+            for matcher, value in matchers.items()
+            if value is not None and matcher in wrappers.MATCHER_PROPERTIES
+        }
+        tracked: List[wrappers.Window] = [client for client in clients if self.store.tracked(window=client)]
+        if properties and len(tracked) > 1:
+            self.fetch_properties(windows=tracked, properties=sorted(properties))
         return [r for r in clients if r.matches(**matchers)]
 
     def find_client(self, clients: List[wrappers.Window], **matchers: Any) -> Optional[wrappers.Window]:
@@ -620,104 +1233,190 @@ class WM:
         except IndexError:
             return None
 
-    def _process_create_window(self, window: wrappers.Window) -> None:
+    def _watch_window(self, window: wrappers.Window) -> None:
         xlib.lib.XSelectInput(
             self.dpy, window, xlib.lib.StructureNotifyMask | xlib.lib.PropertyChangeMask | xlib.lib.FocusChangeMask
         )
-        self._event_window = window
-        for handler in self._create_handlers:
-            handler()
-
-    def _handle_keypress(self, event: xlib.XEvent) -> None:
-        xkeyevent: xlib.XKeyEvent = xlib.XKeyEvent(event=event)
-        logger.info(msg=f"Keypress {xkeyevent.state} {xkeyevent.keycode}")
-        try:
-            handler = self._key_handlers[xkeyevent.window][(xkeyevent.state, xkeyevent.keycode)]
-        except KeyError:
-            pass
-        else:
-            self._event = xkeyevent
-            self._event_window = self.create_window(window_id=xkeyevent.window)
-            handler()
+        # Every change of its properties is reported from now on, they can be stored
+        self.store.track(window=window)
+        self._windows[window] = window
+        self._recent_windows.pop(window, None)
+
+    def _unwatch_window(self, window: wrappers.Window) -> None:
+        self.store.forget(window=window)
+        self._windows.pop(window, None)
+
+    def _create_prefetch(self) -> List[str]:
+        """Properties read before the on_create/on_manage handlers run: the matchers' ones and the hints"""
+        properties: Dict[str, None] = dict.fromkeys(
+            wrappers.MATCHER_PROPERTIES[field] for field in self._create_index.fields()
+        )
+        properties.update(dict.fromkeys(self._create_index.prefetch()))
+        properties.update(dict.fromkeys(sorted(self.prefetch_hints)))
+        return list(properties)
 
-    def _handle_keyrelease(self, event: xlib.XEvent) -> None:
-        keyevent: xlib.XKeyEvent = xlib.XKeyEvent(event=event)
-        logger.info(msg=f"KeyRelease {keyevent.state} {keyevent.keycode}")
+    def _process_create_window(self, window: wrappers.Window) -> None:
+        """Runs the on_create/on_manage handlers of a window already watched by `_watch_window`"""
+        self._event_window = window
+        for handler in self._create_index.match(window=window, startup=self._startup):
+            self._call_handler(kind="create", handler=handler)
+
+    def _handle_keypress(self, event: xlib.XKeyEventView) -> None:
+        window: xlib.Window = event.window
+        state: int = event.state
+        keycode: int = event.keycode
+        logger.info(msg=f"Keypress {state} {keycode}")
+        binding: Optional[keymap.Binding] = None
+        if self._key_sequence is not None:
+            sequence_window, bindings, _ = self._key_sequence
+            if window == sequence_window:
+                binding = bindings.get((keymap.normalize_state(state=state), keycode))
+            # Any other key aborts the sequence and is handled as usual
+            self._abort_key_sequence()
+        if binding is None:
+            binding = self._keys.lookup(window=window, state=state, keycode=keycode)
+        if binding is None:
+            return
+        if isinstance(binding, keymap.KeyNode):
+            self._enter_key_sequence(window=window, node=binding)
+            return
+        self._event = event.detach()
+        self._event_window = self.create_window(window_id=window)
+        self._call_handler(kind="key", handler=binding)
+
+    def _enter_key_sequence(self, window: xlib.Window, node: keymap.KeyNode) -> None:
+        """A key sequence prefix was pressed, grabs the keys that can follow it until the next key or the timeout"""
+        bindings: Dict[keymap.Key, keymap.Binding] = node.resolve(keymap=self._keys.keymap)
+        grabbed: List[keymap.Key] = self._keys.grab_level(display=self.dpy, window=window, keys=bindings)
+        self._key_sequence = (window, bindings, grabbed)
+        if self._key_sequence_timer is None:
+            self._key_sequence_timer = self._new_timer(
+                callback=self._abort_key_sequence, after=self.key_sequence_timeout
+            )
+        self._key_sequence_timer.start(after=self.key_sequence_timeout)
 
-    def _handle_create(self, event: xlib.XEvent) -> None:
-        xcreatewindowevent: xlib.XCreateWindowEvent = xlib.XCreateWindowEvent(event=event)
+    def _abort_key_sequence(self) -> None:
+        if self._key_sequence is None:
+            return
+        window, _, grabbed = self._key_sequence
+        self._key_sequence = None
+        cast(timers.Timer, self._key_sequence_timer).stop()
+        self._keys.ungrab_level(display=self.dpy, window=window, keys=grabbed)
+
+    def _handle_keyrelease(self, event: xlib.XKeyEventView) -> None:
+        logger.info(msg=f"KeyRelease {event.state} {event.keycode}")
+
+    def _handle_mapping(self, event: xlib.XMappingEventView) -> None:
+        event.refresh()
+        if event.request in (xlib.lib.MappingKeyboard, xlib.lib.MappingModifier):
+            logger.info(msg="Keyboard mapping changed")
+            self._abort_key_sequence()
+            self._keys.refresh()
+            self._sync_keys()
+
+    def _handle_create(self, event: xlib.XCreateWindowEventView) -> None:
         self._startup = False
-        window: wrappers.Window = self.create_window(window_id=xcreatewindowevent.window)
-        global ignore_logger
+        window: wrappers.Window = self.create_window(window_id=event.window)
+        prefetch: List[str] = self._create_prefetch()
+        global ignore_logger, ignored_errors_serial
         ignore_logger = True
-        if not xlib.get_window_attributes(display=self.dpy, window=window):
-            ignore_logger = False
-            return
+        if prefetch:
+            # Watched before reading, a change made meanwhile invalidates the value read. The existence is
+            # checked with XCB, Xlib reads the error of XSelectInput on a destroyed window later
+            self._watch_window(window=window)
+            ignored_errors_serial = xlib.lib.XNextRequest(self.dpy) - 1
+            exists: bool = self._prefetch_window(window=window, properties=prefetch)
+            if not exists:
+                self._unwatch_window(window=window)
+        else:
+            exists = xlib.get_window_attributes(display=self.dpy, window=window) is not None
+            if exists:
+                self._watch_window(window=window)
         ignore_logger = False
-        self._event = xcreatewindowevent
+        if not exists:
+            return
+        self._event = event.detach()
         self._process_create_window(window=window)
 
-    def _handle_destroy(self, event: xlib.XEvent) -> None:
-        xdestroywindowevent: xlib.XDestroyWindowEvent = xlib.XDestroyWindowEvent(event=event)
-        if xdestroywindowevent.window == self._recently_destroyed_window:
+    def _handle_destroy(self, event: xlib.XDestroyWindowEventView) -> None:
+        destroyed: xlib.Window = event.window
+        if destroyed == self._recently_destroyed_window:
             return
-        self._recently_destroyed_window = xdestroywindowevent.window
+        self._recently_destroyed_window = destroyed
 
         handlers: List[Callable[[], None]] = []
-        if None in self._destroy_handlers.keys():
-            handlers.extend(self._destroy_handlers[None])
-        if xdestroywindowevent.window in self._destroy_handlers.keys():
-            handlers.extend(self._destroy_handlers[xdestroywindowevent.window])
-
-        self._event = xdestroywindowevent
-        self._event_window = self.create_window(window_id=xdestroywindowevent.window)
-        for handler in handlers:
-            handler()
-        self._clean_window_data(window=xdestroywindowevent.window)
+        if None in self._destroy_handlers:
+            handlers.extend(self._destroy_handlers[None].values())
+        if destroyed in self._destroy_handlers:
+            handlers.extend(self._destroy_handlers[destroyed].values())
+
+        if handlers:
+            self._event = event.detach()
+            self._event_window = self.create_window(window_id=destroyed)
+            for handler in handlers:
+                self._call_handler(kind="destroy", handler=handler)
+        self._clean_window_data(window=destroyed)
+
+    def _handle_property(self, event: xlib.XPropertyEventView) -> None:
+        atom: xlib.Atom = event.atom
+        self.store.invalidate(window=event.window, atom=atom)
+        if event.window == self.root:
+            hook: Optional[Callable[[], None]] = self._root_property_hooks.get(atom)
+            if hook is not None:
+                hook()
+        elif atom == self.atom["_NET_WM_DESKTOP"] and (
+            event.window in self.focus_history or event.window in self._desktop_rings
+        ):
+            self._desktop_changed(window=event.window)
+        if event.state != xlib.lib.PropertyNewValue:
+            return
 
-    def _handle_property(self, event: xlib.XEvent) -> None:
-        xpropertyevent: xlib.XPropertyEvent = xlib.XPropertyEvent(event=event)
-        atom: xlib.Atom = xpropertyevent.atom
-        if xpropertyevent.state.value == xlib.lib.PropertyNewValue and atom in self._property_handlers:
-            wphandlers = self._property_handlers[atom]
-            self._event = xpropertyevent
-            self._event_window = self.create_window(window_id=xpropertyevent.window)
-            if xpropertyevent.window in wphandlers:
-                for handler in wphandlers[xpropertyevent.window]:
-                    handler()
+        if atom in self._coalesced_property_handlers:
+            cphandlers = self._coalesced_property_handlers[atom]
+            window: xlib.Window = event.window
+            if window in cphandlers or None in cphandlers:
+                # Only the latest event is kept, the handlers are called by `_dispatch_coalesced_properties`
+                key: Tuple[xlib.Window, xlib.Atom] = (window, atom)
+                self._pending_properties.pop(key, None)
+                self._pending_properties[key] = cast(xlib.XPropertyEventView, event.detach())
 
+        if atom in self._property_handlers:
+            wphandlers = self._property_handlers[atom]
+            window = event.window
+            handlers: List[Callable[[], None]] = []
+            if window in wphandlers:
+                handlers.extend(wphandlers[window].values())
             if None in wphandlers:
-                for handler in wphandlers[None]:
-                    handler()
-
-    def _handle_focus(self, event: xlib.XEvent) -> None:
-        xfocuschangeevent: xlib.XFocusChangeEvent = xlib.XFocusChangeEvent(event=event)
-        if xfocuschangeevent.type == xlib.lib.FocusIn:
-            try:
-                self.focus_history.remove(xfocuschangeevent.window)
-            except ValueError:
-                pass
-
-            self.focus_history.append(xfocuschangeevent.window)
-            if (
-                xfocuschangeevent.mode.value in (xlib.lib.NotifyNormal, xlib.lib.NotifyWhileGrabbed)
-                and self.track_kbd_layout
-            ):
+                handlers.extend(wphandlers[None].values())
+
+            if handlers:
+                self._event = event.detach()
+                self._event_window = self.create_window(window_id=window)
+                for handler in handlers:
+                    self._call_handler(kind="property", handler=handler)
+
+    def _desktop_changed(self, window: xlib.Window) -> None:
+        desktop: Optional[int] = self.create_window(window_id=window).desktop
+        self.focus_history.move(window=window, desktop=desktop)
+        self._desktop_rings.move(window=window, desktop=desktop)
+
+    def _handle_focus(self, event: xlib.XFocusChangeEventView) -> None:
+        window: xlib.Window = event.window
+        if event.type == xlib.lib.FocusIn:
+            self.focus_history.touch(window=window, desktop=self.create_window(window_id=window).desktop)
+            if event.mode in (xlib.lib.NotifyNormal, xlib.lib.NotifyWhileGrabbed) and self.track_kbd_layout:
                 prop = xlib.get_window_property(
-                    display=self.dpy, window=xfocuschangeevent.window, property=self.atom["_ORCSOME_KBD_GROUP"]
+                    display=self.dpy, window=window, property=self.atom["_ORCSOME_KBD_GROUP"]
                 )
                 if prop:
                     xlib.set_kbd_group(display=self.dpy, group=int(prop[0]))
                 else:
                     xlib.set_kbd_group(display=self.dpy, group=0)
         else:
-            if (
-                xfocuschangeevent.mode.value in (xlib.lib.NotifyNormal, xlib.lib.NotifyWhileGrabbed)
-                and self.track_kbd_layout
-            ):
+            if event.mode in (xlib.lib.NotifyNormal, xlib.lib.NotifyWhileGrabbed) and self.track_kbd_layout:
                 xlib.set_window_property(
                     display=self.dpy,
-                    window=xfocuschangeevent.window,
+                    window=window,
                     property=self.atom["_ORCSOME_KBD_GROUP"],
                     type=self.atom["CARDINAL"],
                     format=32,
@@ -726,22 +1425,33 @@ class WM:
 
     def _xevent_cb(self, loop: Any, watcher: Any, events: int) -> None:
         event = self._native_event
-        while True:
+        stats_ = self._stats
+        started: float = time.perf_counter() if stats_ is not None else 0.0
+        budget: int = self._event_budget or -1
+        exhausted: bool = False
+        while not exhausted:
             pending_events: int = xlib.lib.XPending(self.dpy)
             if not pending_events:
                 break
 
             while pending_events > 0:
+                if budget == 0:
+                    exhausted = True
+                    break
                 xlib.lib.XNextEvent(self.dpy, event)
                 pending_events -= 1
+                budget -= 1
+
+                if stats_ is not None:
+                    stats_.count_event(type=event.type)
 
                 try:
-                    handler = self._handlers[event.type]
+                    handler, view = self._handlers[event.type]
                 except KeyError:
                     continue
 
                 try:
-                    handler(event)
+                    handler(view)
                 except RestartException:
                     if self._restart_handler:
                         self._restart_handler()
@@ -749,24 +1459,118 @@ class WM:
                 except Exception as e:
                     logger.exception(msg=e)
 
-    def _clean_window_data(self, window: xlib.Window) -> None:
-        if window in self._key_handlers:
-            del self._key_handlers[window]
+        if self._pending_properties:
+            self._dispatch_coalesced_properties()
+
+        # The events already read by Xlib don't wake up the IO watcher, an idle watcher resumes
+        if exhausted:
+            if not self._xevent_resume_watcher.active:
+                self._xevent_resume_watcher.start(loop=self._loop)
+        elif self._xevent_resume_watcher.active:
+            self._xevent_resume_watcher.stop(loop=self._loop)
+
+        if stats_ is not None:
+            stats_.add_iteration(duration=time.perf_counter() - started)
+            if exhausted:
+                stats_.budget_yields += 1
+
+    def _dispatch_coalesced_properties(self) -> None:
+        pending = self._pending_properties
+        self._pending_properties = {}
+        for (window, atom), xpropertyevent in pending.items():
+            wphandlers = self._coalesced_property_handlers.get(atom)
+            if not wphandlers:
+                continue
+
+            handlers: List[Callable[[], None]] = []
+            if window in wphandlers:
+                handlers.extend(wphandlers[window].values())
+            if None in wphandlers:
+                handlers.extend(wphandlers[None].values())
 
-        if window in self._destroy_handlers:
-            del self._destroy_handlers[window]
+            self._event = xpropertyevent
+            self._event_window = self.create_window(window_id=window)
+            for handler in handlers:
+                try:
+                    self._call_handler(kind="property", handler=handler)
+                except RestartException:
+                    if self._restart_handler:
+                        self._restart_handler()
+                        return
+                except Exception as e:
+                    logger.exception(msg=e)
 
+    def _clean_window_data(self, window: xlib.Window) -> None:
+        self._keys.forget_window(window=window)
+        if self._key_sequence is not None and self._key_sequence[0] == window:
+            # The temporary grabs went with the window
+            self._key_sequence = None
+            cast(timers.Timer, self._key_sequence_timer).stop()
+
+        # Destroy, property and timer handlers registered for the window
+        for remove in list(self._window_cleanups.pop(window, {}).values()):
+            remove()
+
+        self.focus_history.discard(window=window)
+        self._desktop_rings.discard(window=window)
+
+        for key in [key for key in self._pending_properties if key[0] == window]:
+            del self._pending_properties[key]
+
+        self.store.forget(window=window)
+        self._windows.pop(window, None)
+        self._recent_windows.pop(window, None)
+
+    def _add_handler(self, handlers: WindowHandlers, window: Optional[xlib.Window], handler: Callable[[], None]) -> int:
+        handle: int = next(self._handles)
+        handlers.setdefault(window, {})[handle] = handler
+        return handle
+
+    def _remove_handler(self, handlers: WindowHandlers, window: Optional[xlib.Window], handle: int) -> None:
+        window_handlers: Optional[Dict[int, Callable[[], None]]] = handlers.get(window)
+        if window_handlers is not None and window_handlers.pop(handle, None) is not None and not window_handlers:
+            del handlers[window]
+
+    def _tie_to_window(self, window: Optional[xlib.Window], remove: Callable[[], None]) -> Callable[[], None]:
+        """Runs `remove` when `window` is destroyed, returns the `remove` given to the user"""
+        if window is None:
+            return remove
+        handle: int = next(self._handles)
+        self._window_cleanups.setdefault(window, {})[handle] = remove
+
+        def untie_and_remove() -> None:
+            cleanups: Optional[Dict[int, Callable[[], None]]] = self._window_cleanups.get(window)
+            if cleanups is not None:
+                cleanups.pop(handle, None)
+                if not cleanups:
+                    del self._window_cleanups[window]
+            remove()
+
+        return untie_and_remove
+
+    def _window_handler_counters(self) -> Dict[str, int]:
+        """
+        Registrations tied to windows, `leaked` counts the windows that no longer exist but still
+        have handlers (their DestroyNotify was missed)
+        """
+        windows: Set[xlib.Window] = set(self._window_cleanups) | set(self._keys.windows())
+        windows.discard(self.root)
+        global ignore_logger
+        ignore_logger = True
         try:
-            self.focus_history.remove(window)
-        except ValueError:
-            pass
-
-        for atom, whandlers in list(self._property_handlers.items()):
-            if window in whandlers:
-                del whandlers[window]
-
-            if not len(self._property_handlers[atom]):
-                del self._property_handlers[atom]
+            leaked: int = sum(
+                1
+                for window in windows
+                if window not in self._windows and xlib.get_window_attributes(display=self.dpy, window=window) is None
+            )
+        finally:
+            ignore_logger = False
+        return {
+            "windows": len(windows),
+            "registrations": sum(len(cleanups) for cleanups in self._window_cleanups.values())
+            + sum(len(keys) for window, keys in self._keys.handlers.items() if window != self.root),
+            "leaked": leaked,
+        }
 
     def focus_window(self, window: xlib.Window) -> None:
         """Activate window"""
@@ -840,7 +1644,7 @@ class WM:
                     display=self.dpy, window=window, property=self.atom["_MOTIF_WM_HINTS"]
                 )
                 if motif_hints is not None and len(motif_hints) == 5:
-                    params = cast(List[int], motif_hints)
+                    params = list(cast(Sequence[int], motif_hints))
                     params[2] = int(decorate)
                 else:
                     # "0x2, 0x0, 0x0, 0x0, 0x0" to undecorate and "0x2, 0x0, 0x1, 0x0, 0x0" to redecorate
@@ -901,14 +1705,12 @@ class WM:
         """Get workarea geometery
 
         :param desktop: Desktop for working area receiving. If None then current_desktop is used"""
-        result = xlib.get_window_property(
-            display=self.dpy, window=self.root, property=self.atom["_NET_WORKAREA"], type=self.atom["CARDINAL"]
-        )
+        result = self._get_state_property(window=self.root, property="_NET_WORKAREA")
         if desktop is None:
             desktop = self.current_desktop
             if not desktop:
                 return []
-        return cast(List[int], result)[4 * desktop : 4 * desktop + 4]
+        return list(cast(Sequence[int], result)[4 * desktop : 4 * desktop + 4])
 
     def moveresize_window(
         self,
@@ -999,9 +1801,9 @@ class WM:
 
     def get_atom_name(self, atom: xlib.Atom) -> str:
         """
-        Return the name associated with an atom
+        Return the name associated with an atom, the names are cached by ``wm.atom``
         """
-        return xlib.get_atom_name(display=self.dpy, atom=atom)
+        return self.atom.name(atom=atom)
 
     def _set_window_icon(self, window: xlib.Window, icon: str) -> None:
         xlib.lib.set_window_icon(self.dpy, window, xlib.ffi.new("char[]", icon.encode()))  # char[] is char*
@@ -1043,6 +1845,19 @@ class ImmediateWM(WM):
 
         self.root: xlib.Window = xlib.lib.DefaultRootWindow(self.dpy)
         self.atom: xlib.AtomCache = xlib.AtomCache(dpy=self.dpy)
+        self.store: store.PropertyStore = store.PropertyStore()
+        self._windows: Dict[int, wrappers.Window] = {}
+        self._recent_windows: "OrderedDict[int, wrappers.Window]" = OrderedDict()
+        self._client_list: clients.ClientList = clients.ClientList()
+        self._root_state_counters: Dict[str, int] = {"saved": 0, "round_trips": 0}
+        self._keys: keymap.KeyBindings = keymap.KeyBindings(keymap=keymap.Keymap(display=self.dpy))
+        self._key_sequence: Optional[Tuple[xlib.Window, Dict[keymap.Key, keymap.Binding], List[keymap.Key]]] = None
+        self._desktop_rings: clients.DesktopRings = clients.DesktopRings()
+        self.focus_history: history.FocusHistory = history.FocusHistory()
+
+    def _schedule_key_sync(self) -> None:
+        """There's no loop to run deferred work, the keys are grabbed right away"""
+        self._sync_keys()
 
 
 @xlib.ffi.def_extern()  # type: ignore
@@ -1050,5 +1865,5 @@ def error_handler(_display: xlib.Display, error: xlib.XErrorEvent) -> int:
     err: xlib.XErrorEvent_ = xlib.XErrorEvent_(error=error)
     logger.error(
         msg=f"{err.get_message()} ({err.request_code}:{err.minor_code}) ({'0x%0.2X' % int(err.resourceid)}:{int(err.resourceid)})"
-    ) if not ignore_logger else None
+    ) if not ignore_logger and err.serial > ignored_errors_serial else None
     return 0
@@ -1,12 +1,48 @@
 from __future__ import annotations
 
 from enum import Enum
-from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Tuple, Union, cast
+from typing import Dict, List, Optional, Tuple, Union, cast
 
 from . import utils, wm, xlib
 
+# Type and split flag of the properties read by `Window`, `WM.fetch_properties` uses them to
+# request and decode the properties like `Window.get_property` does
+PROPERTIES: Dict[str, Tuple[Optional[str], bool]] = {
+    "_NET_WM_DESKTOP": ("CARDINAL", False),
+    "WM_WINDOW_ROLE": ("STRING", False),
+    "_NET_WM_NAME": ("UTF8_STRING", False),
+    "WM_CLASS": ("STRING", True),
+    "_NET_WM_STATE": ("ATOM", False),
+    "_NET_WM_PID": ("CARDINAL", False),
+    "_MOTIF_WM_HINTS": ("_MOTIF_WM_HINTS", False),
+    # Root window
+    "_NET_CURRENT_DESKTOP": ("CARDINAL", False),
+    "_NET_NUMBER_OF_DESKTOPS": ("CARDINAL", False),
+    "_NET_ACTIVE_WINDOW": ("WINDOW", False),
+    "_NET_WORKAREA": ("CARDINAL", False),
+    "_NET_SUPPORTING_WM_CHECK": ("WINDOW", False),
+}
+
+# Property compared by every matcher of `Window.matches`
+MATCHER_PROPERTIES: Dict[str, str] = {
+    "name": "WM_CLASS",
+    "cls": "WM_CLASS",
+    "role": "WM_WINDOW_ROLE",
+    "title": "_NET_WM_NAME",
+    "desktop": "_NET_WM_DESKTOP",
+}
+
+
+def decode_desktop(value: Optional[xlib.PropertyValue]) -> Optional[int]:
+    """Decodes a `_NET_WM_DESKTOP` value like :attr:`Window.desktop`"""
+    if not value:
+        return None
+    desktop = cast(List[int], value)[0]
+    if desktop == 0xFFFFFFFF or desktop == 0xFFFFFFFFFFFFFFFF:
+        desktop = -1
+    return desktop
+
 
 class WindowTree:
     def __init__(self, window: Window, root: Window, parent: Window, children: List[Window]) -> None:
@@ -55,9 +91,14 @@ class XScreenSaverInfo:
 
 
 class Window(int):
+    """
+    Window of the X server. The properties are read through the property store of the wm, for the
+    windows orcsome listens to they are read once and shared until a PropertyNotify changes them
+    """
+
     wm: wm.WM
 
-    @cached_property
+    @property
     def desktop(self) -> Optional[int]:
         """Return window desktop.
 
@@ -68,15 +109,9 @@ class Window(int):
         * None if window does not have desktop property
 
         """
-        result = self.get_property(property="_NET_WM_DESKTOP", type="CARDINAL")
-        if not result:
-            return None
-        desktop = cast(List[int], result)[0]
-        if desktop == 0xFFFFFFF or desktop == 0xFFFFFFFFFFFFFFFF:
-            desktop = -1
-        return desktop
+        return decode_desktop(value=self.get_property(property="_NET_WM_DESKTOP", type="CARDINAL"))
 
-    @cached_property
+    @property
     def role(self) -> Optional[str]:
         """Return WM_WINDOW_ROLE property"""
         result = self.get_property(property="WM_WINDOW_ROLE", type="STRING")
@@ -84,23 +119,19 @@ class Window(int):
             return None
         return str(result[0])
 
-    @cached_property
+    @property
     def cls(self) -> Optional[str]:
         """Return second part from WM_CLASS property"""
-        name, _class = self.get_name_and_class()
-        if name:
-            setattr(self, "name", name)
+        _class = self.get_name_and_class()[1]
         return _class if _class else None
 
-    @cached_property
+    @property
     def name(self) -> Optional[str]:
         """Return first part from WM_CLASS property"""
-        name, _class = self.get_name_and_class()
-        if _class:
-            setattr(self, "cls", _class)
+        name = self.get_name_and_class()[0]
         return name if name else None
 
-    @cached_property
+    @property
     def title(self) -> Optional[str]:
         """Return _NET_WM_NAME property"""
         result = self.get_property(property="_NET_WM_NAME", type="UTF8_STRING")
@@ -164,16 +195,26 @@ class Window(int):
 
     def get_property(
         self, property: str, type: Optional[str] = None, split: bool = False
-    ) -> Optional[Union[List[int], List[str]]]:
+    ) -> Optional[xlib.PropertyValue]:
         """
-        This function is a wrapper for `XGetWindowProperty`. Returns a property for the window, the result can be `None` if no property was found, a `List[int]`or a `List[str]`.
+        This function is a wrapper for `XGetWindowProperty`. Returns a property for the window, the result can be `None` if no property was found,
+        an `array` of integers or a `List[str]`. The value is decoded with the decoder registered for `type` in `xlib.DECODERS`.
+
+        The value is shared through the property store, it must not be modified.
         """
-        return xlib.get_window_property(
-            display=self.wm.dpy,
+        atom: xlib.Atom = self.wm.atom[property]
+        return self.wm.store.get(
             window=self,
-            property=self.wm.atom[property],
-            type=self.wm.atom[type] if type else xlib.lib.AnyPropertyType,
-            split=split,
+            atom=atom,
+            variant=(type, split),
+            fetch=lambda: xlib.get_window_property(
+                display=self.wm.dpy,
+                window=self,
+                property=atom,
+                type=self.wm.atom[type] if type else xlib.lib.AnyPropertyType,
+                split=split,
+                decoder=xlib.DECODERS.get(type) if type else None,
+            ),
         )
 
     def set_property(
@@ -207,8 +248,11 @@ class Window(int):
         )
         if not window_tree or not len(window_tree[2]) or not self.pid:
             return windows_associated
+        # The pid of every child is read in a single round trip
+        pids = self.wm.fetch_properties(windows=window_tree[2], properties=["_NET_WM_PID"])
         for window in window_tree[2]:
-            if window.pid == self.pid:
+            pid = pids[window]["_NET_WM_PID"]
+            if pid and pid[0] == self.pid:
                 windows_associated.append(window)
         return windows_associated
 
@@ -236,7 +280,7 @@ class Window(int):
             return
         self.wm._set_window_icon(window=self, icon=str(icon))
 
-    @cached_property
+    @property
     def attributes(self) -> XWindowAttributes:
         """
         This function is a wrapper for `XGetWindowAttributes`. Returns the current attributes for the window
@@ -244,24 +288,24 @@ class Window(int):
         attrs = xlib.get_window_attributes(display=self.wm.dpy, window=self)
         return XWindowAttributes(attributes=attrs)
 
-    @cached_property
+    @property
     def state(self) -> List[str]:
         """Return _NET_WM_STATE"""
         states = self.get_property(property="_NET_WM_STATE", type="ATOM")
         if not states:
             return []
-        states = cast(List[xlib.Atom], states)
-        return [self.wm.get_atom_name(atom=state) for state in states if self.wm.get_atom_name(atom=state)]
+        names: List[str] = [self.wm.atom.name(atom=state) for state in cast(List[xlib.Atom], states)]
+        return [name for name in names if name]
 
-    @cached_property
+    @property
     def maximized_vert(self) -> bool:
         return "_NET_WM_STATE_MAXIMIZED_VERT" in self.state
 
-    @cached_property
+    @property
     def maximized_horz(self) -> bool:
         return "_NET_WM_STATE_MAXIMIZED_HORZ" in self.state
 
-    @cached_property
+    @property
     def decorated(self) -> bool:
         """
         Returns False if the window is not decorated otherwise True
@@ -304,15 +348,15 @@ class Window(int):
             decorated = False
         return decorated
 
-    @cached_property
+    @property
     def urgent(self) -> bool:
         return "_NET_WM_STATE_DEMANDS_ATTENTION" in self.state
 
-    @cached_property
+    @property
     def fullscreen(self) -> bool:
         return "_NET_WM_STATE_FULLSCREEN" in self.state
 
-    @cached_property
+    @property
     def pid(self) -> Optional[int]:
         result = self.get_property(property="_NET_WM_PID", type="CARDINAL")
         if not result:
@@ -1,7 +1,7 @@
 import math
 from array import array
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union, cast
 
 try:
     from ._xlib import ffi, lib  # type: ignore
@@ -39,25 +39,115 @@ class EVENTS(Enum):
     FocusIn = int(lib.FocusIn)
     FocusOut = int(lib.FocusOut)
     PropertyNotify = int(lib.PropertyNotify)
+    MappingNotify = int(lib.MappingNotify)
     # Unimplemented
     MapNotify = int(lib.MapNotify)
     UnmapNotify = int(lib.UnmapNotify)
 
 
+# ICCCM, EWMH and orcsome atoms interned by `AtomCache` in a single request
+KNOWN_ATOMS: Tuple[str, ...] = (
+    # Types
+    "ATOM",
+    "CARDINAL",
+    "STRING",
+    "UTF8_STRING",
+    "WINDOW",
+    # ICCCM
+    "WM_CLASS",
+    "WM_CLIENT_LEADER",
+    "WM_DELETE_WINDOW",
+    "WM_NAME",
+    "WM_PROTOCOLS",
+    "WM_STATE",
+    "WM_TRANSIENT_FOR",
+    "WM_WINDOW_ROLE",
+    # EWMH, root window
+    "_NET_ACTIVE_WINDOW",
+    "_NET_CLIENT_LIST",
+    "_NET_CLIENT_LIST_STACKING",
+    "_NET_CLOSE_WINDOW",
+    "_NET_CURRENT_DESKTOP",
+    "_NET_MOVERESIZE_WINDOW",
+    "_NET_NUMBER_OF_DESKTOPS",
+    "_NET_SUPPORTED",
+    "_NET_SUPPORTING_WM_CHECK",
+    "_NET_WORKAREA",
+    # EWMH, application windows
+    "_NET_WM_DESKTOP",
+    "_NET_WM_ICON",
+    "_NET_WM_NAME",
+    "_NET_WM_PID",
+    "_NET_WM_WINDOW_TYPE",
+    "_NET_WM_STATE",
+    "_NET_WM_STATE_ABOVE",
+    "_NET_WM_STATE_BELOW",
+    "_NET_WM_STATE_DEMANDS_ATTENTION",
+    "_NET_WM_STATE_FOCUSED",
+    "_NET_WM_STATE_FULLSCREEN",
+    "_NET_WM_STATE_HIDDEN",
+    "_NET_WM_STATE_MAXIMIZED_HORZ",
+    "_NET_WM_STATE_MAXIMIZED_VERT",
+    "_NET_WM_STATE_MODAL",
+    "_NET_WM_STATE_SHADED",
+    "_NET_WM_STATE_SKIP_PAGER",
+    "_NET_WM_STATE_SKIP_TASKBAR",
+    "_NET_WM_STATE_STICKY",
+    # Others
+    "_MOTIF_WM_HINTS",
+    "_OB_WM_STATE_UNDECORATED",
+    "_ORCSOME_KBD_GROUP",
+    "_ORCSOME_SKIP_TASKBAR",
+    "_ORCSOME_STATE",
+)
+
+
 class AtomCache(object):
-    def __init__(self, dpy: Display):
+    """
+    Atoms by name and names by atom. The `preload` atoms are interned in a single request, other
+    atoms take a round trip the first time they are used
+    """
+
+    def __init__(self, dpy: Display, preload: Sequence[str] = KNOWN_ATOMS):
         self.dpy: Display = dpy
         self._cache: Dict[str, Atom] = {}
+        self._names: Dict[Atom, str] = {}
+        if preload:
+            self.intern_all(names=preload)
 
     def __getitem__(self, name: str) -> Atom:
         try:
             return self._cache[name]
         except KeyError:
             pass
-        finally:
-            atom: Atom = lib.XInternAtom(self.dpy, str.encode(name), False)
+        atom: Atom = lib.XInternAtom(self.dpy, str.encode(name), False)
+        self._cache[name] = atom
+        self._names[atom] = name
+        return atom
+
+    def intern_all(self, names: Sequence[str]) -> None:
+        """Interns every atom not cached yet with a single `XInternAtoms` request"""
+        missing: List[str] = [name for name in dict.fromkeys(names) if name not in self._cache]
+        if not missing:
+            return
+        c_names: List[Any] = [ffi.new("char[]", str.encode(name)) for name in missing]
+        atoms_ = ffi.new("Atom[]", len(missing))
+        lib.XInternAtoms(self.dpy, ffi.new("char *[]", c_names), len(missing), False, atoms_)
+        for name, atom in zip(missing, atoms_):
             self._cache[name] = atom
-            return atom
+            self._names[atom] = name
+
+    def name(self, atom: Atom) -> str:
+        """Returns the name of `atom`, an empty string if the atom doesn't exist"""
+        try:
+            return self._names[atom]
+        except KeyError:
+            pass
+        name: str = get_atom_name(display=self.dpy, atom=atom)
+        if name:
+            self._cache[name] = atom
+            self._names[atom] = name
+        return name
 
 
 class XEvent_:
@@ -86,6 +176,8 @@ class XEvent_:
         MapNotify = int(lib.MapNotify)
         # Types for XUnmapEvent
         UnmapNotify = int(lib.UnmapNotify)
+        # Types for XMappingEvent
+        MappingNotify = int(lib.MappingNotify)
 
     def __init__(self, xevent: XEvent, specific_event: Any) -> None:
         self._xevent: XEvent = xevent
@@ -170,6 +262,122 @@ class XFocusChangeEvent(XEvent_):
         self.detail: XFocusChangeEvent.Detail = self.Detail(self._xfocuschangeevent.detail)
 
 
+class XMappingEvent(XEvent_):
+    def __init__(self, event: XEvent) -> None:
+        self._xmappingevent: lib.XMappingEvent = event.xmapping
+        super().__init__(xevent=event, specific_event=self._xmappingevent)
+        self.request: int = self._xmappingevent.request  # MappingModifier, MappingKeyboard or MappingPointer
+        self.first_keycode: int = self._xmappingevent.first_keycode
+        self.count: int = self._xmappingevent.count  # Number of keycodes changed from first_keycode
+
+
+class XEventView:
+    """
+    Lightweight view over a native `XEvent` buffer used on the hot path of the event dispatching.
+
+    Fields are read from the buffer when accessed and returned as plain ints, the full `XEvent_`
+    wrapper (with its enums) is only built by `materialize`. A view is only valid until the
+    buffer is filled again by `XNextEvent`, `detach` returns a view over a private copy.
+    """
+
+    __slots__ = ("_event", "_full")
+    _wrapper: Type[XEvent_] = XEvent_
+
+    def __init__(self, event: XEvent) -> None:
+        self._event: XEvent = event
+        self._full: Optional[XEvent_] = None
+
+    @property
+    def type(self) -> int:
+        return int(self._event.type)
+
+    def detach(self) -> "XEventView":
+        return type(self)(event=ffi.new("XEvent *", self._event[0]))
+
+    def materialize(self) -> XEvent_:
+        if self._full is None:
+            self._full = self._wrapper(event=self._event)  # type: ignore
+        return self._full
+
+
+class XKeyEventView(XEventView):
+    __slots__ = ()
+    _wrapper = XKeyEvent
+
+    @property
+    def window(self) -> Window:
+        return int(self._event.xkey.window)
+
+    @property
+    def state(self) -> int:
+        return int(self._event.xkey.state)
+
+    @property
+    def keycode(self) -> int:
+        return int(self._event.xkey.keycode)
+
+
+class XCreateWindowEventView(XEventView):
+    __slots__ = ()
+    _wrapper = XCreateWindowEvent
+
+    @property
+    def window(self) -> Window:
+        return int(self._event.xcreatewindow.window)
+
+
+class XDestroyWindowEventView(XEventView):
+    __slots__ = ()
+    _wrapper = XDestroyWindowEvent
+
+    @property
+    def window(self) -> Window:
+        return int(self._event.xdestroywindow.window)
+
+
+class XPropertyEventView(XEventView):
+    __slots__ = ()
+    _wrapper = XPropertyEvent
+
+    @property
+    def window(self) -> Window:
+        return int(self._event.xproperty.window)
+
+    @property
+    def atom(self) -> Atom:
+        return int(self._event.xproperty.atom)
+
+    @property
+    def state(self) -> int:
+        return int(self._event.xproperty.state)
+
+
+class XFocusChangeEventView(XEventView):
+    __slots__ = ()
+    _wrapper = XFocusChangeEvent
+
+    @property
+    def window(self) -> Window:
+        return int(self._event.xfocus.window)
+
+    @property
+    def mode(self) -> int:
+        return int(self._event.xfocus.mode)
+
+
+class XMappingEventView(XEventView):
+    __slots__ = ()
+    _wrapper = XMappingEvent
+
+    @property
+    def request(self) -> int:
+        return int(self._event.xmapping.request)
+
+    def refresh(self) -> None:
+        """Updates the keyboard mapping cached by Xlib (`XKeysymToKeycode` and friends)"""
+        lib.XRefreshKeyboardMapping(ffi.addressof(self._event[0], "xmapping"))
+
+
 class XErrorEvent_:
     def __init__(self, error: XErrorEvent) -> None:
         self.type: int = error.type
@@ -187,15 +395,59 @@ class XErrorEvent_:
         return pymsg.decode()
 
 
-def get_window_property(
-    display: Display, window: Window, property: Atom, type: Atom = 0, split: bool = False
-) -> Optional[Union[List[int], List[str]]]:
-    # Default values
-    # Specifies the offset in the specified property (in 32-bit quantities) where the data is to be retrieved.
-    long_offset: int = 0
-    long_length: int = 50  # Specifies the length in 32-bit multiples of the data to be retrieved.
-    delete: bool = False  # Specifies a Boolean value that determines whether the property is deleted.
+# Typecodes of the arrays holding every property format, Xlib returns format 32 items as C longs
+PROPERTY_TYPECODES: Dict[int, str] = {8: "B", 16: "H", 32: "L"}
+
+# Length (in 32-bit multiples) of the first request for a property, it grows for every property
+# that doesn't fit so the next reads of the property take a single round trip
+DEFAULT_PROPERTY_LENGTH: int = 1024
+_property_length_hints: Dict[Atom, int] = {}
+
+PropertyValue = Union[List[str], "array[int]"]
+PropertyDecoder = Callable[["array[int]", int, bool], PropertyValue]
+
+
+def decode_text(encoding: str) -> PropertyDecoder:
+    """Returns a decoder of format 8 properties, `split` returns every NULL separated string"""
+
+    def decode(data: "array[int]", format: int, split: bool) -> List[str]:
+        raw: bytes = data.tobytes()
+        if split:
+            return [part.decode(encoding, "replace") for part in raw.split(b"\x00") if part]
+        return [raw.rstrip(b"\x00").decode(encoding, "replace")]
 
+    return decode
+
+
+def decode_numbers(data: "array[int]", format: int, split: bool) -> "array[int]":
+    """Returns format 16 and 32 properties as they are, an array of unsigned integers"""
+    return data
+
+
+# Decoders per property type name, used by `Window.get_property`. Properties of other types are
+# decoded as UTF-8 text (format 8) or as an array of unsigned integers (formats 16 and 32)
+DECODERS: Dict[str, PropertyDecoder] = {
+    "UTF8_STRING": decode_text(encoding="utf-8"),
+    "STRING": decode_text(encoding="latin-1"),
+    "ATOM": decode_numbers,
+    "WINDOW": decode_numbers,
+    "CARDINAL": decode_numbers,
+}
+
+
+def get_window_property(
+    display: Display,
+    window: Window,
+    property: Atom,
+    type: Atom = 0,
+    split: bool = False,
+    decoder: Optional[PropertyDecoder] = None,
+) -> Optional[PropertyValue]:
+    """
+    Reads a whole property into a single buffer. Returns None if the window doesn't have the property
+    or its type isn't `type` (unless `type` is `AnyPropertyType`), otherwise the value decoded by
+    `decoder`: by default a list of strings for format 8 and an array of integers for formats 16 and 32
+    """
     # Params to C function XGetWindowProperty
     type_return_ = ffi.new("Atom *")
     format_return_ = ffi.new("int *")
@@ -203,18 +455,20 @@ def get_window_property(
     bytes_after_ = ffi.new("unsigned long *")
     data_ = ffi.new("unsigned char **")
 
-    result: bytes = b""
-
-    offset: int = long_offset
-    length: int = long_length
+    result: Optional[array] = None
+    view: memoryview = memoryview(b"")
+    received: int = 0  # Items copied into `result`
+    format: int = 0
+    length: int = _property_length_hints.get(property, DEFAULT_PROPERTY_LENGTH)
     while True:
-        lib.XGetWindowProperty(
+        # `long_offset` is expressed in 32-bit multiples of the data on the wire
+        status: int = lib.XGetWindowProperty(
             display,
             window,
             property,
-            offset,
+            received * format // 32,
             length,
-            delete,
+            False,
             type,
             type_return_,
             format_return_,
@@ -222,40 +476,131 @@ def get_window_property(
             bytes_after_,
             data_,
         )
-        format: int = format_return_[0]
-        bytes_after_return: int = bytes_after_[0]
-        if format == 8:  # array of usigned char
-            result += ffi.buffer(data_[0], nitems_return_[0] * array("B").itemsize)
-        elif format == 16:  # array of unsigned short
-            result += ffi.buffer(data_[0], nitems_return_[0] * array("H").itemsize)
-        elif format == 32:  # array of unsigned long
-            result += ffi.buffer(data_[0], nitems_return_[0] * array("L").itemsize)
-        elif not format:
+        if status != 0:  # Success
             return None
-        else:
-            raise Exception(f"Unknown format: {format}")
-        if bytes_after_return:
-            lib.XFree(data_[0])
-            offset = long_length
-            length = math.ceil(bytes_after_return / 4 + 1)
-        else:
+        try:
+            format = format_return_[0]
+            if not format or (type and type_return_[0] != type):
+                return None
+            typecode: Optional[str] = PROPERTY_TYPECODES.get(format)
+            if typecode is None:
+                raise Exception(f"Unknown format: {format}")
+
+            nitems: int = nitems_return_[0]
+            bytes_after: int = bytes_after_[0]
+            if result is None:
+                # Allocated once with room for the whole property
+                result = array(typecode, bytes((nitems + bytes_after * 8 // format) * array(typecode).itemsize))
+                view = memoryview(result).cast("B")
+            start: int = received * result.itemsize
+            size: int = nitems * result.itemsize
+            view[start : start + size] = ffi.buffer(data_[0], size)
+            received += nitems
+        finally:
+            if data_[0] != ffi.NULL:
+                lib.XFree(data_[0])
+                data_[0] = ffi.NULL
+
+        if not bytes_after:
             break
+        length = math.ceil(bytes_after / 4)
+        _property_length_hints[property] = (received * format // 32) + length
+
+    view.release()
+    if decoder is None:
+        decoder = DECODERS["UTF8_STRING"] if format == 8 else decode_numbers
+    return decoder(cast("array[int]", result), format, split)
+
+
+# Window, property, type, decoder and split flag of every property read by `fetch_properties`
+PropertyRequest = Tuple[Window, Atom, Atom, Optional[PropertyDecoder], bool]
+
+
+def fetch_properties(display: Display, requests: Sequence[PropertyRequest]) -> List[Optional[PropertyValue]]:
+    """
+    Reads many properties in a single round trip: every request is sent through the XCB connection
+    shared with Xlib before waiting for the first reply. Returns the values in the order of `requests`,
+    None for missing properties or windows. Properties longer than their length hint are completed
+    with `get_window_property`
+    """
+    lib.XFlush(display)  # The requests queued by Xlib must reach the server before ours
+    connection = lib.XGetXCBConnection(display)
+    cookies: List[Any] = _request_properties(connection=connection, requests=requests)
+    return _property_replies(display=display, connection=connection, requests=requests, cookies=cookies)
 
-    format = format_return_[0]
-    final_result: Optional[Union[List[int], List[str]]] = None
-    if format == 8:
-        final_result = [result.rstrip(b"\x00").decode()]
-        if split:
-            final_result = [x.decode() for x in result.split(b"\x00") if len(x.decode())]
-    elif format == 16:
-        final_result = array("H", result).tolist()
-    elif format == 32:
-        final_result = array("L", result).tolist()
-    else:
-        raise Exception(f"Unknown format: {format}")
 
-    lib.XFree(data_[0])
-    return final_result
+def fetch_window_properties(
+    display: Display, window: Window, requests: Sequence[PropertyRequest]
+) -> Optional[List[Optional[PropertyValue]]]:
+    """
+    Like `fetch_properties`, also checks in the same round trip that `window` exists (what
+    `get_window_attributes` tells). Returns None if it doesn't
+    """
+    lib.XFlush(display)
+    connection = lib.XGetXCBConnection(display)
+    attributes_cookie = lib.xcb_get_window_attributes(connection, window)
+    cookies: List[Any] = _request_properties(connection=connection, requests=requests)
+
+    error_ = ffi.new("xcb_generic_error_t **")
+    attributes = lib.xcb_get_window_attributes_reply(connection, attributes_cookie, error_)
+    if error_[0] != ffi.NULL:
+        lib.free(error_[0])
+    exists: bool = attributes != ffi.NULL
+    lib.free(attributes)
+
+    # The replies are read even if the window doesn't exist, XCB would keep them otherwise
+    results: List[Optional[PropertyValue]] = _property_replies(
+        display=display, connection=connection, requests=requests, cookies=cookies
+    )
+    return results if exists else None
+
+
+def _request_properties(connection: Any, requests: Sequence[PropertyRequest]) -> List[Any]:
+    return [
+        lib.xcb_get_property(
+            connection, 0, window, property, type, 0, _property_length_hints.get(property, DEFAULT_PROPERTY_LENGTH)
+        )
+        for window, property, type, _, _ in requests
+    ]
+
+
+def _property_replies(
+    display: Display, connection: Any, requests: Sequence[PropertyRequest], cookies: Sequence[Any]
+) -> List[Optional[PropertyValue]]:
+    error_ = ffi.new("xcb_generic_error_t **")
+    results: List[Optional[PropertyValue]] = []
+    for (window, property, type, decoder, split), cookie in zip(requests, cookies):
+        error_[0] = ffi.NULL
+        reply = lib.xcb_get_property_reply(connection, cookie, error_)
+        if error_[0] != ffi.NULL:  # BadWindow, the window was destroyed in the meantime
+            lib.free(error_[0])
+        if reply == ffi.NULL:
+            results.append(None)
+            continue
+
+        try:
+            format: int = reply.format
+            if not format or (type and reply.type != type):
+                results.append(None)
+            elif reply.bytes_after:
+                results.append(
+                    get_window_property(
+                        display=display, window=window, property=property, type=type, split=split, decoder=decoder
+                    )
+                )
+            else:
+                typecode: Optional[str] = PROPERTY_TYPECODES.get(format)
+                if typecode is None:
+                    raise Exception(f"Unknown format: {format}")
+                raw = ffi.buffer(lib.xcb_get_property_value(reply), lib.xcb_get_property_value_length(reply))
+                # XCB returns format 32 items as 32-bit integers, Xlib as C longs
+                value: array = array(typecode, memoryview(raw).cast("I")) if format == 32 else array(typecode, raw[:])
+                if decoder is None:
+                    decoder = DECODERS["UTF8_STRING"] if format == 8 else decode_numbers
+                results.append(decoder(cast("array[int]", value), format, split))
+        finally:
+            lib.free(reply)
+    return results
 
 
 def get_window_attributes(display: Display, window: Window) -> Optional[XWindowAttributes]:
@@ -275,21 +620,40 @@ def get_screen_saver_info(display: Display, drawable: Window) -> Optional[Screen
 
 
 def set_window_property(
-    display: Display, window: Window, property: Atom, type: Atom, format: int, values: Union[List[int], List[str]]
+    display: Display, window: Window, property: Atom, type: Atom, format: int, values: Union[Sequence[int], List[str]]
 ) -> None:
     data: Any = None
     if format == 8:  # array of usigned char
         data = cast(List[str], values)
     elif format == 16:  # array of unsigned short
-        data = ffi.cast("unsigned char *", ffi.new("unsigned short[]", cast(List[int], values)))
+        data = ffi.cast("unsigned char *", ffi.new("unsigned short[]", list(cast(Sequence[int], values))))
     elif format == 32:  # array of unsigned long
-        data = ffi.cast("unsigned char *", ffi.new("unsigned long[]", cast(List[int], values)))
+        data = ffi.cast("unsigned char *", ffi.new("unsigned long[]", list(cast(Sequence[int], values))))
     else:
         raise Exception(f"Unknown format {format}")
 
     lib.XChangeProperty(display, window, property, type, format, lib.PropModeReplace, data, len(values))
 
 
+def get_keyboard_mapping(display: Display) -> Tuple[int, int, List[int]]:
+    """
+    Reads the keysyms of every keycode in one request. Returns the first keycode, the number of
+    keysyms per keycode and the keysyms, keycode after keycode
+    """
+    min_keycode_ = ffi.new("int *")
+    max_keycode_ = ffi.new("int *")
+    lib.XDisplayKeycodes(display, min_keycode_, max_keycode_)
+    count: int = max_keycode_[0] - min_keycode_[0] + 1
+    keysyms_per_keycode_ = ffi.new("int *")
+    keysyms_ = lib.XGetKeyboardMapping(display, min_keycode_[0], count, keysyms_per_keycode_)
+    if keysyms_ == ffi.NULL:
+        return min_keycode_[0], 0, []
+    try:
+        return min_keycode_[0], keysyms_per_keycode_[0], list(keysyms_[0 : count * keysyms_per_keycode_[0]])
+    finally:
+        lib.XFree(keysyms_)
+
+
 def get_kbd_group(display: Display) -> str:
     state = ffi.new("XkbStateRec *")
     lib.XkbGetState(display, lib.XkbUseCoreKbd, state)
@@ -308,4 +672,7 @@ def get_atom_name(display: Display, atom: Atom) -> str:
     atom_name = lib.XGetAtomName(display, atom)
     if not atom_name:
         return ""
-    return bytes(ffi.string(atom_name)).decode()
+    try:
+        return bytes(ffi.string(atom_name)).decode()
+    finally:
+        lib.XFree(atom_name)
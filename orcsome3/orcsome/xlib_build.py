@@ -7,6 +7,8 @@ from orcsome3.orcsome import utils
 
 source: str = """
 #include <X11/Xlib.h>
+#include <X11/Xlib-xcb.h>
+#include <xcb/xcb.h>
 #include <X11/XKBlib.h>
 #include <X11/extensions/scrnsaver.h>
 #include <X11/extensions/dpms.h>
@@ -262,6 +264,11 @@ static const int FocusIn;
 static const int FocusOut;
 static const int PropertyNotify;
 static const int ClientMessage;
+static const int MappingNotify;
+
+static const int MappingModifier;
+static const int MappingKeyboard;
+static const int MappingPointer;
 
 static const int CWX;
 static const int CWY;
@@ -434,6 +441,17 @@ typedef struct {
     int state;              /* NewValue, Deleted */
 } XPropertyEvent;
 
+typedef struct {
+    int type;
+    unsigned long serial;   /* # of last request processed by server */
+    Bool send_event;        /* true if this came from a SendEvent request */
+    Display *display;       /* Display the event was read from */
+    Window window;          /* unused */
+    int request;            /* one of MappingModifier, MappingKeyboard, MappingPointer */
+    int first_keycode;      /* first keycode */
+    int count;              /* defines range of change w. first_keycode*/
+} XMappingEvent;
+
 typedef struct {
     int type;
     Display *display;           /* Display the event was read from */
@@ -456,6 +474,7 @@ typedef union {
     XDestroyWindowEvent xdestroywindow;
     XFocusChangeEvent xfocus;
     XPropertyEvent xproperty;
+    XMappingEvent xmapping;
     ...;
 } XEvent;
 
@@ -483,17 +502,23 @@ Display* XOpenDisplay(char *display_name);
 int XCloseDisplay(Display *display);
 int XFree(void *data);
 Atom XInternAtom(Display *display, char *atom_name, Bool only_if_exists);
+Status XInternAtoms(Display *display, char **names, int count, Bool only_if_exists, Atom *atoms_return);
 char* XGetAtomName(Display *display, Atom atom);
 
 int XPending(Display *display);
 int XNextEvent(Display *display, XEvent *event_return);
 int XSelectInput(Display *display, Window w, long event_mask);
+unsigned long XNextRequest(Display *display);
 int XFlush(Display *display);
 int XSync(Display *display, Bool discard);
 Status XSendEvent(Display *display, Window w, Bool propagate, long event_mask, XEvent *event_send);
 
 KeySym XStringToKeysym(char *string);
 KeyCode XKeysymToKeycode(Display *display, KeySym keysym);
+int XDisplayKeycodes(Display *display, int *min_keycodes_return, int *max_keycodes_return);
+KeySym *XGetKeyboardMapping(Display *display, KeyCode first_keycode, int keycode_count,
+    int *keysyms_per_keycode_return);
+int XRefreshKeyboardMapping(XMappingEvent *event_map);
 
 int XGrabKey(Display *display, int keycode, unsigned int modifiers,
     Window grab_window, Bool owner_events, int pointer_mode, int keyboard_mode);
@@ -581,9 +606,34 @@ Status XQueryTree(
     Window **children_return,
     unsigned int *nchildren_return
 );
+
+// XCB, shares the connection of Xlib to pipeline requests
+typedef ... xcb_connection_t;
+typedef struct { ...; } xcb_generic_error_t;
+typedef struct { ...; } xcb_get_property_cookie_t;
+typedef struct {
+    uint8_t format;
+    uint32_t type;
+    uint32_t bytes_after;
+    uint32_t value_len;
+    ...;
+} xcb_get_property_reply_t;
+xcb_connection_t *XGetXCBConnection(Display *dpy);
+xcb_get_property_cookie_t xcb_get_property(xcb_connection_t *c, uint8_t _delete, uint32_t window,
+    uint32_t property, uint32_t type, uint32_t long_offset, uint32_t long_length);
+xcb_get_property_reply_t *xcb_get_property_reply(xcb_connection_t *c, xcb_get_property_cookie_t cookie,
+    xcb_generic_error_t **e);
+typedef struct { ...; } xcb_get_window_attributes_cookie_t;
+typedef struct { ...; } xcb_get_window_attributes_reply_t;
+xcb_get_window_attributes_cookie_t xcb_get_window_attributes(xcb_connection_t *c, uint32_t window);
+xcb_get_window_attributes_reply_t *xcb_get_window_attributes_reply(xcb_connection_t *c,
+    xcb_get_window_attributes_cookie_t cookie, xcb_generic_error_t **e);
+void *xcb_get_property_value(const xcb_get_property_reply_t *R);
+int xcb_get_property_value_length(const xcb_get_property_reply_t *R);
+void free(void *ptr);
 """
 
-LIBRARIES: List[str] = ["x11", "xscrnsaver", "xext", "MagickWand", "gdlib"]
+LIBRARIES: List[str] = ["x11", "x11-xcb", "xcb", "xscrnsaver", "xext", "MagickWand", "gdlib"]
 compiler_args: Tuple[List[str], List[str]] = utils.get_compiler_args(*LIBRARIES)
 
 ffibuilder: FFI = cffi.FFI()
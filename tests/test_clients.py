@@ -0,0 +1,55 @@
+import random
+from typing import Dict, List, Optional
+
+from orcsome3.orcsome import clients
+
+
+def test_moved_window_keeps_its_client_list_position() -> None:
+    rings: clients.DesktopRings = clients.DesktopRings()
+    rings.valid = True
+    for window, desktop in ((1, 0), (2, 1), (3, 0), (4, 0)):
+        rings.add(window=window, desktop=desktop)
+    assert rings.desktop(desktop=0) == [1, 3, 4]
+
+    rings.move(window=2, desktop=0)
+    assert rings.desktop(desktop=0) == [1, 2, 3, 4]
+    assert rings.desktop(desktop=1) == []
+    assert rings.step(window=1, direction=1) == 2
+    assert rings.step(window=1, direction=-1) == 4
+
+    rings.move(window=1, desktop=1)
+    rings.move(window=1, desktop=0)
+    assert rings.desktop(desktop=0) == [1, 2, 3, 4]
+    assert rings.step(window=4, direction=1) == 1
+
+
+def test_rings_follow_the_client_list() -> None:
+    rng: random.Random = random.Random(0)
+    rings: clients.DesktopRings = clients.DesktopRings()
+    rings.valid = True
+    client_list: List[int] = []
+    desktops: Dict[int, Optional[int]] = {}
+    next_window: int = 1
+    for _ in range(2000):
+        action: int = rng.randrange(3)
+        if action == 0 or not client_list:
+            desktops[next_window] = rng.choice([0, 1, 2, None])
+            client_list.append(next_window)
+            rings.add(window=next_window, desktop=desktops[next_window])
+            next_window += 1
+        elif action == 1:
+            window: int = rng.choice(client_list)
+            client_list.remove(window)
+            del desktops[window]
+            rings.discard(window=window)
+        else:
+            window = rng.choice(client_list)
+            desktops[window] = rng.choice([0, 1, 2, None])
+            rings.move(window=window, desktop=desktops[window])
+
+        for desktop in (0, 1, 2, None):
+            expected: List[int] = [window for window in client_list if desktops[window] == desktop]
+            assert rings.desktop(desktop=desktop) == expected
+            for index, window in enumerate(expected):
+                assert rings.step(window=window, direction=1) == expected[(index + 1) % len(expected)]
+                assert rings.step(window=window, direction=-1) == expected[index - 1]
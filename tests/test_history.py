@@ -0,0 +1,35 @@
+from orcsome3.orcsome import history
+
+
+def test_mru_per_desktop() -> None:
+    focus: history.FocusHistory = history.FocusHistory()
+    focus.touch(window=1, desktop=0)
+    focus.touch(window=2, desktop=1)
+    focus.touch(window=3, desktop=0)
+    focus.touch(window=1, desktop=0)
+
+    assert focus.mru() == [1, 3, 2]
+    assert focus.mru(desktop=0) == [1, 3]
+    assert focus.mru(desktop=1) == [2]
+    assert list(focus) == [2, 3, 1]
+
+
+def test_mru_includes_sticky_windows() -> None:
+    focus: history.FocusHistory = history.FocusHistory()
+    focus.touch(window=1, desktop=0)
+    focus.touch(window=10, desktop=history.STICKY_DESKTOP)
+    focus.touch(window=2, desktop=1)
+    focus.touch(window=3, desktop=0)
+
+    assert focus.mru(desktop=0) == [3, 10, 1]
+    assert focus.mru(desktop=1) == [2, 10]
+    assert focus.mru(desktop=2) == [10]
+    assert focus.mru(desktop=history.STICKY_DESKTOP) == [10]
+
+    # A window made sticky becomes the most recent window of the sticky ones
+    focus.move(window=1, desktop=history.STICKY_DESKTOP)
+    assert focus.mru(desktop=0) == [1, 3, 10]
+    assert focus.mru(desktop=1) == [1, 2, 10]
+
+    focus.discard(window=10)
+    assert focus.mru(desktop=1) == [1, 2]
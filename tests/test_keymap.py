@@ -0,0 +1,226 @@
+from typing import Any, List, Tuple
+
+import pytest
+
+from orcsome3.orcsome import keymap
+
+WINDOW: int = 0x100
+SHIFT: int = 1
+
+# Keycodes of the fake keyboard
+KEYCODES: List[Tuple[int, str]] = [(10, "a"), (11, "b"), (12, "c")]
+
+
+class FakeLib(object):
+    """Records the key grabs instead of sending them"""
+
+    NoSymbol: int = 0
+    GrabModeAsync: int = 1
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[Any, ...]] = []
+
+    def XStringToKeysym(self, name: bytes) -> int:
+        return ord(name) if len(name) == 1 else self.NoSymbol
+
+    def XGrabKey(self, display: Any, keycode: int, modmask: int, window: int, *args: Any) -> None:
+        self.calls.append(("grab", keycode, modmask, window))
+
+    def XUngrabKey(self, display: Any, keycode: int, modmask: int, window: int) -> None:
+        self.calls.append(("ungrab", keycode, modmask, window))
+
+    def XSync(self, display: Any, discard: bool) -> None:
+        self.calls.append(("sync",))
+
+    def XFlush(self, display: Any) -> None:
+        self.calls.append(("flush",))
+
+
+def get_keyboard_mapping(display: Any) -> Tuple[int, int, List[int]]:
+    first_keycode: int = KEYCODES[0][0]
+    keysyms: List[int] = []
+    for _, char in KEYCODES:
+        keysyms += [ord(char), ord(char.upper())]
+    return first_keycode, 2, keysyms
+
+
+@pytest.fixture
+def lib(monkeypatch: Any) -> FakeLib:
+    lib_: FakeLib = FakeLib()
+    monkeypatch.setattr(keymap.xlib, "lib", lib_)
+    monkeypatch.setattr(keymap.xlib, "get_keyboard_mapping", get_keyboard_mapping)
+    return lib_
+
+
+@pytest.fixture
+def bindings(lib: FakeLib) -> keymap.KeyBindings:
+    return keymap.KeyBindings(keymap=keymap.Keymap(display=None))
+
+
+def key(char: str, modmask: int = 0) -> Tuple[int, int]:
+    return modmask, ord(char)
+
+
+def test_single_keys_are_looked_up_by_keycode(bindings: keymap.KeyBindings) -> None:
+    def handler() -> None:
+        pass
+
+    assert bindings.add(window=WINDOW, sequence=[key("b", SHIFT)], handler=handler)
+    assert bindings.lookup(window=WINDOW, state=SHIFT, keycode=11) is handler
+    # The lock modifiers don't change the binding
+    assert bindings.lookup(window=WINDOW, state=SHIFT | keymap.IGNORED_MOD_MASKS[3], keycode=11) is handler
+    assert bindings.lookup(window=WINDOW, state=0, keycode=11) is None
+
+
+def test_sequences_share_their_prefix(bindings: keymap.KeyBindings) -> None:
+    def first() -> None:
+        pass
+
+    def second() -> None:
+        pass
+
+    bindings.add(window=WINDOW, sequence=[key("a"), key("b")], handler=first)
+    bindings.add(window=WINDOW, sequence=[key("a"), key("c")], handler=second)
+
+    node = bindings.lookup(window=WINDOW, state=0, keycode=10)
+    assert isinstance(node, keymap.KeyNode)
+    assert node.resolve(keymap=bindings.keymap) == {(0, 11): first, (0, 12): second}
+
+
+def test_keys_missing_in_the_mapping_are_kept_unresolved(bindings: keymap.KeyBindings) -> None:
+    assert not bindings.add(window=WINDOW, sequence=[key("z")], handler=lambda: None)
+    assert WINDOW not in bindings.handlers
+    assert bindings.windows() == [WINDOW]
+
+
+def test_a_prefix_of_other_sequences_cant_be_bound(bindings: keymap.KeyBindings) -> None:
+    bindings.add(window=WINDOW, sequence=[key("a"), key("b")], handler=lambda: None)
+    with pytest.raises(ValueError, match="beginning of other key sequences"):
+        bindings.add(window=WINDOW, sequence=[key("a")], handler=lambda: None)
+
+
+def test_a_bound_key_cant_start_a_sequence(bindings: keymap.KeyBindings) -> None:
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=lambda: None)
+    with pytest.raises(ValueError, match="already bound"):
+        bindings.add(window=WINDOW, sequence=[key("a"), key("b")], handler=lambda: None)
+
+
+def test_a_failed_add_leaves_the_bindings_unchanged(bindings: keymap.KeyBindings) -> None:
+    def handler() -> None:
+        pass
+
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=handler)
+    with pytest.raises(ValueError):
+        bindings.add(window=WINDOW, sequence=[key("a"), key("b"), key("c")], handler=lambda: None)
+    assert bindings.lookup(window=WINDOW, state=0, keycode=10) is handler
+
+
+def test_removing_the_last_sequence_drops_its_prefixes(bindings: keymap.KeyBindings) -> None:
+    def first() -> None:
+        pass
+
+    def second() -> None:
+        pass
+
+    bindings.add(window=WINDOW, sequence=[key("a"), key("b"), key("c")], handler=first)
+    bindings.add(window=WINDOW, sequence=[key("a"), key("c")], handler=second)
+
+    bindings.remove(window=WINDOW, sequence=[key("a"), key("b"), key("c")], handler=first)
+    node = bindings.lookup(window=WINDOW, state=0, keycode=10)
+    assert isinstance(node, keymap.KeyNode)
+    assert node.resolve(keymap=bindings.keymap) == {(0, 12): second}
+
+    bindings.remove(window=WINDOW, sequence=[key("a"), key("c")], handler=second)
+    assert bindings.lookup(window=WINDOW, state=0, keycode=10) is None
+    assert bindings.windows() == []
+
+
+def test_removing_a_replaced_binding_keeps_the_new_one(bindings: keymap.KeyBindings) -> None:
+    def old() -> None:
+        pass
+
+    def new() -> None:
+        pass
+
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=old)
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=new)
+    bindings.remove(window=WINDOW, sequence=[key("a")], handler=old)
+    assert bindings.lookup(window=WINDOW, state=0, keycode=10) is new
+
+
+def test_levels_grab_only_the_keys_not_grabbed_already(bindings: keymap.KeyBindings, lib: FakeLib) -> None:
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=lambda: None)
+    bindings.sync(display=None)
+    lib.calls.clear()
+
+    new = bindings.grab_level(display=None, window=WINDOW, keys=[(0, 10), (0, 11)])
+    assert new == [(0, 11)]
+    assert [call for call in lib.calls if call[0] == "grab"] == [
+        ("grab", 11, mask, WINDOW) for mask in keymap.IGNORED_MOD_MASKS
+    ]
+
+    lib.calls.clear()
+    bindings.ungrab_level(display=None, window=WINDOW, keys=new)
+    assert [call for call in lib.calls if call[0] == "ungrab"] == [
+        ("ungrab", 11, mask, WINDOW) for mask in keymap.IGNORED_MOD_MASKS
+    ]
+    assert bindings.lookup(window=WINDOW, state=0, keycode=10) is not None
+
+
+def grabs(lib: FakeLib, kind: str) -> List[Tuple[int, int]]:
+    """(keycode, modmask) of the grabs or ungrabs sent, the lock modifiers aside"""
+    return [(call[1], call[2]) for call in lib.calls if call[0] == kind and not call[2] & keymap.IGNORED_MOD_MASKS[3]]
+
+
+def test_sync_grabs_every_key_with_the_lock_modifiers(bindings: keymap.KeyBindings, lib: FakeLib) -> None:
+    bindings.add(window=WINDOW, sequence=[key("a", SHIFT)], handler=lambda: None)
+    bindings.add(window=WINDOW, sequence=[key("b"), key("c")], handler=lambda: None)
+
+    assert bindings.sync(display=None) == (2, 0)
+    assert sorted(call for call in lib.calls if call[0] == "grab") == sorted(
+        ("grab", keycode, modmask | mask, WINDOW)
+        for keycode, modmask in ((10, SHIFT), (11, 0))
+        for mask in keymap.IGNORED_MOD_MASKS
+    )
+    assert lib.calls[-1] == ("flush",)
+
+
+def test_sync_sends_only_the_difference(bindings: keymap.KeyBindings, lib: FakeLib) -> None:
+    def handler() -> None:
+        pass
+
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=handler)
+    bindings.add(window=WINDOW, sequence=[key("b")], handler=lambda: None)
+    bindings.sync(display=None)
+    lib.calls.clear()
+
+    bindings.remove(window=WINDOW, sequence=[key("a")], handler=handler)
+    bindings.add(window=WINDOW, sequence=[key("c")], handler=lambda: None)
+    assert bindings.sync(display=None) == (1, 1)
+    assert grabs(lib=lib, kind="ungrab") == [(10, 0)]
+    assert grabs(lib=lib, kind="grab") == [(12, 0)]
+
+    lib.calls.clear()
+    assert bindings.sync(display=None) == (0, 0)
+    assert lib.calls == []
+
+
+def test_clear_keeps_the_grabs_of_the_keys_bound_again(bindings: keymap.KeyBindings, lib: FakeLib) -> None:
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=lambda: None)
+    bindings.add(window=WINDOW, sequence=[key("b")], handler=lambda: None)
+    bindings.sync(display=None)
+    lib.calls.clear()
+
+    bindings.clear()
+    assert lib.calls == []
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=lambda: None)
+    assert bindings.sync(display=None) == (0, 1)
+    assert grabs(lib=lib, kind="ungrab") == [(11, 0)]
+    assert grabs(lib=lib, kind="grab") == []
+
+
+def test_sync_waits_only_when_asked(bindings: keymap.KeyBindings, lib: FakeLib) -> None:
+    bindings.add(window=WINDOW, sequence=[key("a")], handler=lambda: None)
+    bindings.sync(display=None, wait=True)
+    assert lib.calls[-1] == ("sync",)
+    assert ("flush",) not in lib.calls
@@ -0,0 +1,44 @@
+from typing import Any, List, Optional
+
+from orcsome3.orcsome import matchers
+
+
+class FakeWindow(object):
+    def __init__(
+        self,
+        name: str = "",
+        cls: str = "",
+        role: str = "",
+        title: str = "",
+        desktop: Optional[int] = None,
+    ) -> None:
+        self.name: str = name
+        self.cls: str = cls
+        self.role: str = role
+        self.title: str = title
+        self.desktop: Optional[int] = desktop
+
+
+def matched(index: matchers.MatcherIndex, window: Any) -> List[str]:
+    return [callback() for callback in index.match(window=window)]
+
+
+def test_secondary_pattern_without_bucket() -> None:
+    # "z" is only a secondary condition of the first rule, the rules of `name` are indexed by "y"
+    index: matchers.MatcherIndex = matchers.MatcherIndex()
+    index.add(callback=lambda: "cls-and-name", matchers={"cls": "X", "name": "z"})
+    index.add(callback=lambda: "name", matchers={"name": "y"})
+
+    assert matched(index=index, window=FakeWindow(name="z")) == []
+    assert matched(index=index, window=FakeWindow(name="z", cls="X")) == ["cls-and-name"]
+    assert matched(index=index, window=FakeWindow(name="yz", cls="X")) == ["cls-and-name", "name"]
+
+
+def test_registration_order() -> None:
+    index: matchers.MatcherIndex = matchers.MatcherIndex()
+    index.add(callback=lambda: "title", matchers={"title": "vim"})
+    index.add(callback=lambda: "any", matchers={})
+    index.add(callback=lambda: "exact", matchers={"cls": "^URxvt$"})
+
+    assert matched(index=index, window=FakeWindow(cls="URxvt", title="vim")) == ["title", "any", "exact"]
+    assert matched(index=index, window=FakeWindow(cls="URxvt-256")) == ["any"]
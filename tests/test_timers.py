@@ -0,0 +1,87 @@
+from typing import Any, List
+
+import pytest
+
+from orcsome3.orcsome import ev, timers
+
+
+class Clock(object):
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: Any) -> Clock:
+    clock_: Clock = Clock()
+    monkeypatch.setattr(timers.time, "monotonic", clock_)
+    return clock_
+
+
+@pytest.fixture
+def wheel(clock: Clock) -> timers.TimerWheel:
+    return timers.TimerWheel(loop=ev.Loop(), slack=0.01)
+
+
+def expire(wheel: timers.TimerWheel, clock: Clock) -> None:
+    """Wakes up the wheel at the deadline of its first slot"""
+    clock.now = wheel._ticks[0] * wheel.slack
+    wheel._expire_cb(None, None, 0)
+
+
+def test_restarts_keep_one_heap_entry_per_slot(wheel: timers.TimerWheel, clock: Clock) -> None:
+    other: timers.Timer = wheel.timer(callback=lambda: None, after=5.0)
+    other.start()
+    timer: timers.Timer = wheel.timer(callback=lambda: None, after=60.0)
+    for _ in range(10000):
+        clock.now += 0.05
+        timer.start()
+
+    assert len(wheel._slots) == 2
+    assert len(wheel._ticks) <= 2 * len(wheel._slots) + 1
+    assert wheel._armed == other._tick
+
+
+def test_removing_the_armed_slot_arms_the_next_one(wheel: timers.TimerWheel) -> None:
+    first: timers.Timer = wheel.timer(callback=lambda: None, after=1.0)
+    second: timers.Timer = wheel.timer(callback=lambda: None, after=2.0)
+    first.start()
+    second.start()
+    assert wheel._armed == first._tick
+
+    first.stop()
+    assert wheel._armed == second._tick
+    second.stop()
+    assert wheel._armed is None
+    assert not wheel._slots
+
+
+def test_timers_of_a_slot_expire_together(wheel: timers.TimerWheel, clock: Clock) -> None:
+    fired: List[str] = []
+    wheel.timer(callback=lambda: fired.append("a"), after=1.002).start()
+    wheel.timer(callback=lambda: fired.append("b"), after=1.007).start()
+    wheel.timer(callback=lambda: fired.append("c"), after=2.0).start()
+
+    expire(wheel=wheel, clock=clock)
+    assert fired == ["a", "b"]
+    expire(wheel=wheel, clock=clock)
+    assert fired == ["a", "b", "c"]
+    assert not wheel._ticks
+
+
+def test_repeat_timer_does_not_drift(wheel: timers.TimerWheel, clock: Clock) -> None:
+    start: float = clock.now
+    timer: timers.Timer = wheel.timer(callback=lambda: None, after=1.0, repeat=1.0)
+    timer.start()
+    for _ in range(100):
+        clock.now = wheel._ticks[0] * wheel.slack + 0.004  # Late wakeups
+        wheel._expire_cb(None, None, 0)
+
+    assert timer.next_stop == pytest.approx(start + 101.0)
+
+    # Missed periods aren't replayed
+    clock.now += 10.5
+    wheel._expire_cb(None, None, 0)
+    assert timer.next_stop == pytest.approx(clock.now)
@@ -0,0 +1,27 @@
+import itertools
+import re
+from typing import List
+
+import pytest
+
+from orcsome3.orcsome import utils
+
+
+def patterns() -> List[str]:
+    """Literal and regex patterns over a small alphabet, optionally anchored"""
+    bodies: List[str] = ["".join(letters) for size in range(3) for letters in itertools.product("ab", repeat=size)]
+    bodies += ["a.", "a*", "(a|b)", "a\\.b", "[ab]b"]
+    return [start + body + end for body in bodies for start in ("", "^") for end in ("", "$")]
+
+
+def strings() -> List[str]:
+    """Every string of up to 3 letters, alone or followed by a newline"""
+    letters: List[str] = ["".join(chars) for size in range(4) for chars in itertools.product("ab.", repeat=size)]
+    return letters + [string + "\n" for string in letters] + ["a\nb", "\na"]
+
+
+@pytest.mark.parametrize("pattern", patterns())
+def test_compile_matcher_is_equivalent_to_re_search(pattern: str) -> None:
+    matcher = utils.compile_matcher(pattern=pattern)
+    for string in strings():
+        assert bool(matcher(string)) == bool(re.search(pattern, string)), (pattern, string)